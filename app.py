@@ -7,6 +7,7 @@ Perfect for demonstrating compiler functionality and educational purposes.
 
 from flask import Flask, request, jsonify, render_template_string, send_from_directory
 from flask_cors import CORS
+import base64
 import os
 import tempfile
 import traceback
@@ -16,7 +17,7 @@ import sys
 # Add src to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
-from src.compiler import SimpleCompiler
+from src.compiler import SimpleCompiler, PhaseProfiler, DEFAULT_OPTIMIZATION_LEVEL, OPTIMIZATION_LEVELS
 from src.utils.preprocessor import SourcePreprocessor
 from src.lexer.token_analyzer import TokenAnalyzer
 
@@ -49,9 +50,14 @@ def compile_code():
     Expected JSON payload:
     {
         "code": "int x = 42;\nprint(x);",
-        "filename": "optional_filename"
+        "filename": "optional_filename",
+        "optimization_level": 2,
+        "trace_memory": false
     }
     
+    Query parameters:
+        profile=1: run the compilation under cProfile and add "profile" to the response
+    
     Returns:
     {
         "success": true/false,
@@ -59,7 +65,10 @@ def compile_code():
         "tokens": [...],
         "symbol_table": [...],
         "assembly": "...",
-        "preprocessed": "..."
+        "preprocessed": "...",
+        "optimization": {"level": 2, "passes": [...]},
+        "stats": {"phases": [...], "total": {...}, "counters": {...}},
+        "profile": {"functions": [...], "collapsed": "...", "pstats": "<base64>"}
     }
     """
     try:
@@ -72,6 +81,21 @@ def compile_code():
         
         source_code = data['code']
         filename = data.get('filename', 'user_code')
+        optimization_level = data.get('optimization_level', DEFAULT_OPTIMIZATION_LEVEL)
+        # bool is an int subclass and lists/dicts cannot be looked up, so check the type first
+        if type(optimization_level) is not int or optimization_level not in OPTIMIZATION_LEVELS:
+            return jsonify({
+                "success": False,
+                "error": f"Unknown optimization level {optimization_level!r} "
+                         f"(use one of {sorted(OPTIMIZATION_LEVELS)})"
+            }), 400
+        
+        trace_memory = data.get('trace_memory', False)
+        if not isinstance(trace_memory, bool):
+            return jsonify({
+                "success": False,
+                "error": "'trace_memory' must be true or false"
+            }), 400
         
         # Validate code length
         if len(source_code) > 10000:  # 10KB limit
@@ -86,17 +110,42 @@ def compile_code():
             f.write(source_code)
         
         # Compile the code
-        compiler = SimpleCompiler(temp_file)
+        profile = request.args.get('profile', '').lower() in ('1', 'true', 'yes')
+        compiler = SimpleCompiler(temp_file, optimization_level=optimization_level, trace_memory=trace_memory,
+                                  profiler=PhaseProfiler() if profile else None)
         success = compiler.compile()
         
         result = {
             "success": success,
             "message": "Compilation successful" if success else "Compilation failed",
-            "filename": filename
+            "filename": filename,
+            "stats": compiler.stats.to_dict()
         }
         
+        # Profile of the phases that ran: hottest functions, flamegraph stacks and the raw pstats file
+        if profile and compiler.profiler.profiles:
+            result["profile"] = {
+                "functions": compiler.profiler.top_functions(),
+                "collapsed": '\n'.join(compiler.profiler.collapsed_stacks()),
+                "pstats": base64.b64encode(compiler.profiler.pstats_bytes()).decode('ascii')
+            }
+        
         # Add compilation results if successful
         if success:
+            result["warnings"] = compiler.warnings
+            result["optimization"] = {
+                "level": optimization_level,
+                "passes": [
+                    {
+                        "name": record.name,
+                        "milliseconds": round(record.seconds * 1000, 3),
+                        "quadruples_before": record.size_before,
+                        "quadruples_after": record.size_after
+                    }
+                    for record in compiler.pass_manager.records
+                ]
+            }
+            
             # Read generated files
             try:
                 # Preprocessed code
@@ -222,7 +271,12 @@ def documentation():
             "content_type": "application/json",
             "payload": {
                 "code": "string (required) - The Automata code to compile",
-                "filename": "string (optional) - Custom filename"
+                "filename": "string (optional) - Custom filename",
+                "optimization_level": "integer (optional) - 0, 1 or 2 (default 2)",
+                "trace_memory": "boolean (optional) - Record peak memory per phase (slower)"
+            },
+            "query": {
+                "profile": "1 (optional) - Profile the compilation with cProfile"
             },
             "response": {
                 "success": "boolean - Compilation success",
@@ -230,7 +284,10 @@ def documentation():
                 "preprocessed": "string - Preprocessed code",
                 "assembly": "string - Generated assembly code",
                 "symbol_table": "array - Variable declarations",
-                "tokens": "array - Lexical tokens"
+                "tokens": "array - Lexical tokens",
+                "optimization": "object - Level and per-pass wall time and quadruple counts",
+                "stats": "object - Per-phase wall time, CPU time and peak memory, and size counters",
+                "profile": "object - With ?profile=1: top functions, collapsed stacks, base64 .pstats"
             }
         }
     })
@@ -255,7 +312,9 @@ def cleanup_temp_files(base_file, filename):
         base_file,
         f"{base_file}d",
         f"{filename}.asm",
-        f"{filename}_tokens.csv"
+        f"{filename}_tokens.csv",
+        f"{filename}_cost.txt",
+        f"{filename}_tiles.txt"
     ]
     
     for pattern in cleanup_patterns:
@@ -1626,6 +1685,14 @@ print(bio);`
                 }
             }
             
+            // Unused variable warnings
+            if (result.warnings && result.warnings.length > 0) {
+                html += `<div class="result-item" style="border-left-color: var(--warning-color);">
+                    <div class="result-label">Warnings</div>
+                    <div class="result-value">${result.warnings.join('<br>')}</div>
+                </div>`;
+            }
+            
             // Warning
             if (result.warning) {
                 html += `<div class="result-item" style="border-left-color: var(--warning-color);">
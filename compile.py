@@ -14,38 +14,116 @@ from pathlib import Path
 src_dir = Path(__file__).parent / "src"
 sys.path.insert(0, str(src_dir))
 
-from src.compiler import main
+from src.compiler import OPTION_HELP, parse_arguments, is_batch, run as run_compiler
 
-if __name__ == "__main__":
+# Daemon control commands, handled before the compiler sees the arguments
+DAEMON_HELP = [
+    "   --daemon       serve compilations from a warm process on a Unix socket",
+    "                  ($AUTOMATA_DAEMON_SOCKET); compile_client.py sends jobs to it",
+    "   --daemon-status / --stop-daemon",
+    "                  report on or stop the running daemon",
+]
+
+
+def run(arguments):
+    """
+    Run the compiler on command-line arguments.
+    
+    Args:
+        arguments: Arguments after the program name
+        
+    Returns:
+        Process exit code
+    """
+    try:
+        sources, options = parse_arguments(arguments)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    
     # Update help message for project root usage
-    if len(sys.argv) != 2:
+    if not sources:
         print("Automata Language Compiler")
         print("=========================")
         print()
-        print("Usage: python compile.py <source_file.af>")
+        print("Usage: python compile.py [options] <source.af | directory | pattern>...")
+        print()
+        for line in OPTION_HELP + [""] + DAEMON_HELP:
+            print(line)
         print()
         print("Examples:")
         print("   python compile.py examples/basic_program.af")
         print("   python compile.py examples/arithmetic.af") 
-        print("   python compile.py examples/control_flow.af")
+        print("   python compile.py -O1 examples/control_flow.af")
+        print("   python compile.py -j 4 -o build examples 'more/**/*.af'")
+        print("   python compile.py --watch examples")
         print()
         print("The compiler will generate:")
         print("   - <filename>.afd  (preprocessed source)")
         print("   - <filename>_tokens.csv  (lexical analysis)")
         print("   - <filename>.asm  (assembly output)")
+        print("   - <filename>_cost.txt  (static size and cycle report)")
+        print("   - <filename>_tiles.txt  (instruction selection listing)")
         print()
         print("For web API access, run: python app.py")
-        sys.exit(1)
+        return 1
     
-    # Verify file exists
-    source_file = sys.argv[1]
-    if not os.path.exists(source_file):
-        print(f"❌ Error: Source file '{source_file}' not found")
-        sys.exit(1)
-    
-    # Verify file extension
-    if not source_file.endswith('.af'):
-        print("⚠️  Warning: Source file should have .af extension")
+    if not options['watch'] and not is_batch(sources, options):
+        source_file = sources[0]
+        
+        # Verify file exists
+        if not os.path.exists(source_file):
+            print(f"❌ Error: Source file '{source_file}' not found")
+            return 1
+        
+        # Verify file extension
+        if not source_file.endswith('.af'):
+            print("⚠️  Warning: Source file should have .af extension")
     
     # Run the compiler
-    main() 
\ No newline at end of file
+    return run_compiler(arguments)
+
+
+def daemon_command(arguments):
+    """
+    Handle a daemon control command line.
+    
+    Args:
+        arguments: Arguments after the program name
+        
+    Returns:
+        Process exit code, or None if the arguments are not a daemon command
+    """
+    from compile_daemon import default_socket_path, daemon_running, serve, stop_daemon
+    
+    if arguments == ['--daemon']:
+        try:
+            serve(run, warm_up=_warm_up)
+        except RuntimeError as e:
+            print(f"❌ Error: {e}")
+            return 1
+        return 0
+    if arguments == ['--daemon-status']:
+        running = daemon_running()
+        print(f"Compile daemon {'running' if running else 'not running'} on {default_socket_path()}")
+        return 0 if running else 1
+    if arguments == ['--stop-daemon']:
+        if not stop_daemon():
+            print(f"No compile daemon running on {default_socket_path()}")
+            return 1
+        print("Compile daemon stopped")
+        return 0
+    return None
+
+
+def _warm_up():
+    """Load everything a compilation uses, so forked jobs start with it in memory."""
+    import batch_compiler  # noqa: F401
+    from codegen import assembly_generator  # noqa: F401
+    from utils.compile_cache import compiler_fingerprint
+    compiler_fingerprint()
+
+
+if __name__ == "__main__":
+    exit_code = daemon_command(sys.argv[1:])
+    sys.exit(run(sys.argv[1:]) if exit_code is None else exit_code)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Automata Compiler - Daemon Client
+
+This script takes the same command line as compile.py. When a compile
+daemon is running (python compile.py --daemon) it hands the job to the
+daemon's warm process and prints the result, which skips the compiler's
+startup and imports; otherwise it compiles in-process, exactly as
+compile.py would. A job the daemon does not finish within
+$AUTOMATA_DAEMON_TIMEOUT seconds exits with code 124 and a message.
+"""
+
+import os
+import sys
+
+# Only the standard-library daemon protocol is imported up front
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from compile_daemon import submit_job
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    result = None
+    # Daemon control and long-running watches always run here
+    if not any(argument in ('--daemon', '--daemon-status', '--stop-daemon', '--watch') for argument in arguments):
+        result = submit_job(arguments)
+    
+    if result is None:
+        # No daemon: fall back to the full compiler in this process
+        from compile import daemon_command, run
+        exit_code = daemon_command(arguments)
+        sys.exit(run(arguments) if exit_code is None else exit_code)
+    
+    exit_code, output, errors = result
+    sys.stderr.write(errors)
+    sys.stdout.write(output)
+    sys.stdout.flush()
+    sys.exit(exit_code)
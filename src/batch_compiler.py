@@ -0,0 +1,285 @@
+"""
+Automata Language Compiler - Batch Driver
+
+This module compiles many source files in parallel. Sources may be given
+as files, directories (searched recursively for .af files) or glob
+patterns. Jobs run on a process pool whose workers import the compiler once
+and then take job after job, and each job writes into its own output
+directory, so files with the same name in different directories never
+overwrite each other's .asm, token listing or reports.
+
+A worker that dies (killed, out of memory, a crash in native code) breaks
+the whole pool, and every job still queued on it fails with it. Those jobs
+are rerun one per fresh process, so only the job that kills its process is
+recorded as failed and the rest of the batch still compiles.
+"""
+
+import contextlib
+import glob
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+# Add src directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+
+SOURCE_SUFFIX = '.af'
+DEFAULT_OUTPUT_ROOT = 'build'
+
+# Compiler log lines that explain a failure
+FAILURE_MARKERS = ('❌', '💥')
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one compilation job."""
+    source: str
+    output_dir: str
+    success: bool
+    seconds: float
+    lines: int = 0
+    cache_hit: bool = False
+    error: Optional[str] = None
+    log: str = ''
+    stats: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class BatchSummary:
+    """Aggregate outcome of a batch."""
+    results: List[BatchResult] = field(default_factory=list)
+    seconds: float = 0.0
+    workers: int = 1
+    missing: List[str] = field(default_factory=list)
+
+    @property
+    def failures(self) -> List[BatchResult]:
+        """Jobs that did not compile."""
+        return [result for result in self.results if not result.success]
+
+    @property
+    def success(self) -> bool:
+        """Whether every source was found and compiled."""
+        return not self.failures and not self.missing
+
+    @property
+    def files_per_second(self) -> float:
+        """Throughput in files per second of wall time."""
+        return len(self.results) / self.seconds if self.seconds else 0.0
+
+    @property
+    def lines_per_second(self) -> float:
+        """Throughput in source lines per second of wall time."""
+        return sum(result.lines for result in self.results) / self.seconds if self.seconds else 0.0
+
+    def format(self) -> str:
+        """Render the throughput and failure summary."""
+        job_seconds = sum(result.seconds for result in self.results)
+        hits = sum(result.cache_hit for result in self.results)
+        throughput = f"Throughput: {self.files_per_second:.1f} files/s, {self.lines_per_second:.0f} lines/s"
+        if self.workers > 1 and self.seconds:
+            throughput += (f" (jobs took {job_seconds:.2f} s in total, "
+                           f"{job_seconds / self.seconds:.1f}x parallel speedup)")
+        out = [f"{len(self.results) - len(self.failures)}/{len(self.results)} files compiled "
+               f"in {self.seconds:.2f} s on {self.workers} workers", throughput]
+        if hits:
+            out.append(f"Cache hits: {hits}")
+        for path in self.missing:
+            out.append(f"Not found: {path}")
+        for result in self.failures:
+            out.append(f"Failed: {result.source}: {result.error or 'compilation failed'}")
+        return '\n'.join(out)
+
+
+def expand_sources(patterns: List[str]) -> Tuple[List[str], List[str]]:
+    """
+    Resolve files, directories and glob patterns to source files.
+
+    Args:
+        patterns: Paths or glob patterns (** matches across directories)
+
+    Returns:
+        (source files in first-seen order without duplicates, patterns that matched nothing)
+    """
+    sources: Dict[str, None] = {}
+    missing = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(str(path) for path in Path(pattern).rglob(f"*{SOURCE_SUFFIX}") if path.is_file())
+        elif os.path.isfile(pattern):
+            matches = [pattern]
+        else:
+            matches = sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+        if not matches:
+            missing.append(pattern)
+        for match in matches:
+            sources.setdefault(os.path.normpath(match), None)
+    return list(sources), missing
+
+
+def assign_output_dirs(sources: List[str], output_root: str = DEFAULT_OUTPUT_ROOT) -> Dict[str, str]:
+    """
+    Give every source its own output directory, <root>/<name>, numbered when names repeat.
+
+    Args:
+        sources: Source files
+        output_root: Directory holding the per-job directories
+
+    Returns:
+        Source file to its output directory
+    """
+    directories = {}
+    taken = set()
+    for source in sources:
+        name = Path(source).stem
+        candidate, number = name, 1
+        while candidate in taken:
+            number += 1
+            candidate = f"{name}-{number}"
+        taken.add(candidate)
+        directories[source] = os.path.join(output_root, candidate)
+    return directories
+
+
+def compile_job(source: str, output_dir: str, options: Dict[str, Any]) -> BatchResult:
+    """
+    Compile one source, capturing the compiler's log.
+
+    Args:
+        source: Source file
+        output_dir: Directory for this job's outputs
+        options: 'optimization_level', 'cache' (whether to use the default compilation cache)
+            and 'trace_memory' (whether to record peak memory per phase)
+
+    Returns:
+        BatchResult of the job
+    """
+    from compiler import SimpleCompiler
+    from utils.compile_cache import CompileCache
+
+    log = io.StringIO()
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(log):
+            compiler = SimpleCompiler(source, optimization_level=options.get('optimization_level', 2),
+                                      cache=CompileCache() if options.get('cache') else None,
+                                      output_dir=output_dir, trace_memory=options.get('trace_memory', False))
+            success = compiler.compile()
+    except Exception as e:
+        return BatchResult(source, output_dir, False, time.perf_counter() - start,
+                           error=str(e), log=log.getvalue())
+    seconds = time.perf_counter() - start
+
+    text = log.getvalue()
+    error = None
+    if not success:
+        reasons = [line.strip() for line in text.splitlines() if line.strip().startswith(FAILURE_MARKERS)]
+        error = reasons[-1].lstrip('❌💥 ') if reasons else None
+    return BatchResult(source, output_dir, success, seconds, _count_lines(source), compiler.cache_hit, error, text,
+                       compiler.stats.to_dict())
+
+
+def compile_batch(patterns: List[str], output_root: str = DEFAULT_OUTPUT_ROOT, jobs: Optional[int] = None,
+                  optimization_level: int = 2, cache: bool = False, verbose: bool = True,
+                  trace_memory: bool = False) -> BatchSummary:
+    """
+    Compile many sources in parallel.
+
+    Args:
+        patterns: Files, directories or glob patterns
+        output_root: Directory holding one output directory per source
+        jobs: Worker processes (defaults to the CPU count); 1 compiles in this process
+        optimization_level: Preset optimization pipeline (0, 1 or 2)
+        cache: Use the default compilation cache
+        verbose: Print a line per finished job
+        trace_memory: Record each job's peak memory per phase
+
+    Returns:
+        BatchSummary of the batch
+    """
+    sources, missing = expand_sources(patterns)
+    directories = assign_output_dirs(sources, output_root)
+    options = {'optimization_level': optimization_level, 'cache': cache, 'trace_memory': trace_memory}
+    workers = max(1, min(jobs or os.cpu_count() or 1, len(sources) or 1))
+    summary = BatchSummary(workers=workers, missing=missing)
+
+    start = time.perf_counter()
+    if workers == 1:
+        for source in sources:
+            _record(summary, compile_job(source, directories[source], options), verbose)
+    else:
+        broken = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_warm_worker) as pool:
+            futures = {pool.submit(compile_job, source, directories[source], options): source for source in sources}
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    result = future.result()
+                except BrokenProcessPool:
+                    broken.append(source)
+                    continue
+                except Exception as e:
+                    result = BatchResult(source, directories[source], False, 0.0, error=str(e))
+                _record(summary, result, verbose)
+        for source in broken:
+            _record(summary, _compile_isolated(source, directories[source], options), verbose)
+    summary.seconds = time.perf_counter() - start
+
+    # Report in the order the sources were given
+    order = {source: index for index, source in enumerate(sources)}
+    summary.results.sort(key=lambda result: order[result.source])
+    return summary
+
+
+def _warm_worker():
+    """Import the compiler once per worker process, so every job starts warm."""
+    import compiler  # noqa: F401
+    from codegen import assembly_generator  # noqa: F401
+
+
+def _compile_isolated(source: str, output_dir: str, options: Dict[str, Any]) -> BatchResult:
+    """Run one job in its own worker process, failing only this job if the process dies."""
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            return pool.submit(compile_job, source, output_dir, options).result()
+    except BrokenProcessPool:
+        return BatchResult(source, output_dir, False, time.perf_counter() - start,
+                           error="the compiler process terminated abruptly")
+    except Exception as e:
+        return BatchResult(source, output_dir, False, time.perf_counter() - start, error=str(e))
+
+
+def _record(summary: BatchSummary, result: BatchResult, verbose: bool):
+    """Add a finished job to the summary and report it."""
+    summary.results.append(result)
+    if not verbose:
+        return
+    if result.success:
+        cached = ", cached" if result.cache_hit else ""
+        print(f"   ✓ {result.source} -> {result.output_dir} ({result.seconds * 1000:.0f} ms{cached})")
+    else:
+        print(f"   ✗ {result.source}: {result.error or 'compilation failed'}")
+
+
+def _count_lines(source: str) -> int:
+    """Number of lines in a source file, 0 if it cannot be read."""
+    try:
+        with open(source, 'r', encoding='utf-8') as f:
+            return sum(1 for _ in f)
+    except (OSError, UnicodeDecodeError):
+        return 0
+
+
+if __name__ == "__main__":
+    # Example usage
+    examples = os.path.join(os.path.dirname(__file__), '..', 'examples')
+    result = compile_batch([examples], output_root=os.path.join('build', 'examples'))
+    print(result.format())
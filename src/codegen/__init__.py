@@ -2,11 +2,28 @@
 Code Generation Module
 
 Contains code generators for the Simple Language Compiler:
-- AssemblyGenerator: x86 assembly code generation
+- AssemblyGenerator: x86 assembly code generation (file or streaming output)
+- PythonGenerator: Python code-object backend for native execution
+- cost_model: Static 8086 cycle and size estimates for emitted instructions
+- cost_report: Per-line and per-statement-kind size/cycle reports
+- data_layout: Storage assignment by type (byte booleans, packed flags, word alignment)
+- instruction_selection: Expression trees and the tiles that cover them
+- outlining: Procedural abstraction of repeated instruction sequences
+- runtime_library: Shared _printstr/_todec/_readint/_readstr routines
 - Templates: Assembly code templates
 """
 
-# Code generation components will be implemented here
-# from .assembly_generator import AssemblyGenerator
+from .assembly_generator import AssemblyGenerator, generate_assembly, stream_assembly
+from .python_generator import PythonGenerator, PythonProgram, PythonBackendError, run_python
+from .cost_model import instruction_cycles, estimate_cycles, instruction_size, estimate_size
+from .cost_report import CostReport
+from .data_layout import DataLayout, Storage, layout_variables
+from .outlining import OutlinedRoutine, OutliningResult, outline_program
+from .instruction_selection import Tile, TILES, ExpressionNode, TileSelection, find_foldable_temporaries
 
-__all__ = [] 
\ No newline at end of file
+__all__ = ['AssemblyGenerator', 'generate_assembly', 'stream_assembly',
+           'PythonGenerator', 'PythonProgram', 'PythonBackendError', 'run_python',
+           'instruction_cycles', 'estimate_cycles', 'instruction_size', 'estimate_size', 'CostReport',
+           'DataLayout', 'Storage', 'layout_variables',
+           'OutlinedRoutine', 'OutliningResult', 'outline_program',
+           'Tile', 'TILES', 'ExpressionNode', 'TileSelection', 'find_foldable_temporaries']
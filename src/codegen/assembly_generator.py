@@ -6,8 +6,84 @@ This module generates x86 assembly code from intermediate representations
 """
 
 import os
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import re
+import heapq
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Set, TextIO, Tuple
+from dataclasses import dataclass, replace
+
+from .cost_model import (
+    DIRECTIVES, FIXED_SIZES, REGISTERS, SEGMENT_REGISTERS, estimate_cycles, estimate_size, instruction_size
+)
+from .cost_report import CostReport
+from .data_layout import DataLayout, is_word_declaration
+from .outlining import OutliningResult, outline_program
+from .instruction_selection import (
+    ARITHMETIC_OPERATORS, COMMUTATIVE_OPERATORS, TILES, ExpressionNode, TileSelection,
+    find_foldable_temporaries, format_tile_listing
+)
+from .runtime_library import iter_runtime_data, resolve_routines
+
+
+# Template comments that are replaced by generated sections
+DATA_PLACEHOLDERS = ("; Variables will be inserted here", "; String literals will be inserted here")
+CODE_PLACEHOLDER = "; Generated code will be inserted here"
+RUNTIME_PLACEHOLDER = "; Runtime routines will be inserted here"
+
+# Data words that hold temporaries are named <prefix><slot>
+SLOT_PREFIX = '_t'
+
+# Unsigned branches for the relational jump quadruples, matching the arithmetic
+CONDITIONAL_JUMPS = {'j<': 'jb', 'j<=': 'jbe', 'j>': 'ja', 'j>=': 'jae', 'j==': 'je', 'j!=': 'jne'}
+JUMP_OPERATORS = set(CONDITIONAL_JUMPS) | {'goto'}
+
+# Relation that holds with the operands exchanged
+SWAPPED_RELATIONS = {'j<': 'j>', 'j<=': 'j>=', 'j>': 'j<', 'j>=': 'j<=', 'j==': 'j==', 'j!=': 'j!='}
+
+# Branch taken in exactly the cases the key branch falls through
+INVERTED_BRANCHES = {'jb': 'jae', 'jae': 'jb', 'jbe': 'ja', 'ja': 'jbe', 'je': 'jne', 'jne': 'je'}
+
+# Displacements reachable by a conditional jump (signed byte)
+SHORT_BRANCH_RANGE = range(-128, 128)
+
+# Characters per DB line of a string literal, well below the assembler's line limit
+LITERAL_CHUNK_SIZE = 64
+
+# Order in which operands of commutative operators are moved to the right:
+# immediates and memory words fold into the instruction, subexpressions are evaluated first
+OPERAND_RANK = {'tree': 0, 'reg': 1, 'mem': 2, 'imm': 3}
+
+# Register tile for each arithmetic operator
+REGISTER_TILES = {'+': 'add-reg', '-': 'sub-reg', '*': 'mul-reg', '/': 'div-reg'}
+
+# (tile names, assembly lines) produced by instruction selection
+Candidate = Tuple[List[str], List[str]]
+
+# Prefix that keeps IR labels (L1, L2, ...) apart from program variables
+LABEL_PREFIX = '_'
+
+# Prefix of the labels the generator creates itself (_B1, _B2, ...)
+LOCAL_LABEL_PREFIX = '_B'
+
+# Prefix of the pooled string literal labels (_S1, _S2, ...)
+LITERAL_PREFIX = '_S'
+
+# 8086 instruction mnemonics, which MASM reserves like the registers and directives
+MNEMONICS = frozenset('''
+    aaa aad aam aas adc add and call cbw clc cld cli cmc cmp cmpsb cmpsw cwd daa das dec div esc hlt
+    idiv imul in inc int into iret ja jae jb jbe jc jcxz je jg jge jl jle jmp jna jnae jnb jnbe jnc
+    jne jng jnge jnl jnle jno jnp jns jnz jo jp jpe jpo js jz lahf lds lea les lock lodsb lodsw loop
+    loope loopne loopnz loopz mov movsb movsw mul neg nop not or out pop popf push pushf rcl rcr rep
+    repe repne repnz repz ret retf rol ror sahf sal sar sbb scasb scasw shl shr stc std sti stosb
+    stosw sub test wait xchg xlat xor
+'''.split())
+
+# Names the assembler reserves or the template defines; a variable named like
+# one of them (MASM ignores case) is renamed with RENAMED_PREFIX in the output
+RESERVED_NAMES = MNEMONICS | REGISTERS | SEGMENT_REGISTERS | DIRECTIVES | {
+    'offset', 'ptr', 'byte', 'word', 'dup', 'near', 'far', 'short', 'seg', 'type', 'length', 'size', 'mod',
+    'high', 'low', 'para', 'stack', 'pila', 'extra', 'datos', 'codigo', 'p0'
+}
+RENAMED_PREFIX = '_v'
 
 
 @dataclass
@@ -25,27 +101,74 @@ class AssemblyGenerator:
     
     Features:
     - Variable declarations in data segment
-    - Arithmetic operations
+    - Arithmetic by tree-pattern instruction selection (maximal munch over a cost table)
+    - Labels, jumps and compare-and-branch for if/while
+    - Generator-local labels and relaxation of out-of-range branches
     - I/O operations (print, read)
-    - String literal handling
-    - Temporary variable management
+    - String literal pooling (identical literals share one label)
+    - Variables named after registers, mnemonics or directives renamed apart
+    - Temporary slot reuse driven by liveness analysis
+    - Strength reduction of multiply/divide by constants, chosen by estimated cycles
+    - Shared runtime routines emitted once, only when referenced
+    - Storage only for variables and input buffers the code references
+    - Byte-sized booleans (optionally packed into flag words), words laid out first
+    - Static size and cycle reports per source line and statement kind
+    - Optional outlining of repeated instruction sequences into subroutines
     """
     
-    def __init__(self, template_file: str = "src/codegen/templates/assembly_template.asm"):
+    def __init__(self, template_file: str = "src/codegen/templates/assembly_template.asm",
+                 pack_booleans: bool = False, outline: bool = False):
         """
         Initialize the assembly generator.
         
         Args:
             template_file: Path to the assembly template file
+            pack_booleans: Store booleans as bits of shared flag words instead of bytes
+            outline: Factor repeated instruction sequences into subroutines (smaller, slower)
         """
         self.template_file = template_file
+        self.pack_booleans = pack_booleans
+        self.outline = outline
+        self.outlining: Optional[OutliningResult] = None
+        self.cost_report: Optional[CostReport] = None
+        self.layout = DataLayout(pack_booleans)
         self.string_counter = 0
         self.temp_variables = []
+        self.temp_slots: Dict[str, str] = {}
+        self.temporaries = set()
         self.string_literals = []
+        self.literal_labels: Dict[str, str] = {}
+        self.runtime_routines = set()
         self.variables = []
+        self.referenced_symbols = set()
+        self.label_counter = 0
+        self.folded_temps: Dict[str, int] = {}
+        self.tile_selections: List[TileSelection] = []
+    
+    def reset(self):
+        """Reset the per-program state so the generator can be reused."""
+        self.string_counter = 0
+        self.temp_variables = []
+        self.temp_slots = {}
+        self.temporaries = set()
+        self.string_literals = []
+        self.literal_labels = {}
+        self.runtime_routines = set()
+        self.variables = []
+        self.referenced_symbols = set()
+        self.layout = DataLayout(self.pack_booleans)
+        self.label_counter = 0
+        self.folded_temps = {}
+        self.tile_selections = []
+    
+    def new_label(self) -> str:
+        """Create a generator-local label that cannot collide with IR labels."""
+        self.label_counter += 1
+        return f"{LOCAL_LABEL_PREFIX}{self.label_counter}"
         
     def generate_program(self, output_file: str, symbol_table: List[Any], 
-                        quadruples: List[Any] = None, number_table: List[Any] = None) -> bool:
+                        quadruples: List[Any] = None, number_table: List[Any] = None,
+                        report_name: Optional[str] = None) -> bool:
         """
         Generate complete assembly program.
         
@@ -54,6 +177,8 @@ class AssemblyGenerator:
             symbol_table: Symbol table from lexical analyzer
             quadruples: Quadruples from intermediate code generation
             number_table: Number table for constants
+            report_name: Also collect the static cost report of the emitted code into
+                `cost_report`, headed by this name
             
         Returns:
             True if generation successful
@@ -64,16 +189,9 @@ class AssemblyGenerator:
             if not template_content:
                 return False
             
-            # Generate assembly sections
-            data_section = self._generate_data_section(symbol_table)
-            code_section = self._generate_code_section(quadruples or [])
-            
-            # Combine template with generated code
-            assembly_code = self._combine_template(template_content, data_section, code_section)
-            
-            # Write output file
+            # Stream the program straight into the output file
             with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(assembly_code)
+                self._write_program(f, template_content, symbol_table, quadruples or [], report_name)
             
             print(f"Assembly code generated successfully: {output_file}")
             return True
@@ -82,6 +200,177 @@ class AssemblyGenerator:
             print(f"Error generating assembly: {e}")
             return False
     
+    def emit_program(self, stream: TextIO, symbol_table: List[Any], 
+                     quadruples: List[Any] = None, number_table: List[Any] = None,
+                     report_name: Optional[str] = None) -> bool:
+        """
+        Stream a complete assembly program to any writable object.
+        
+        Template segments and generated lines are written as soon as they are
+        produced, so the whole program is never held in memory (unless
+        outlining is enabled, which needs the whole procedure). Sockets can be
+        used through ``socket.makefile('w')``.
+        
+        Args:
+            stream: Object with a ``write(str)`` method
+            symbol_table: Symbol table from lexical analyzer
+            quadruples: Quadruples from intermediate code generation
+            number_table: Number table for constants
+            report_name: Also collect the static cost report of the emitted code into
+                `cost_report`, headed by this name
+            
+        Returns:
+            True if generation successful
+        """
+        try:
+            template_content = self._read_template()
+            if not template_content:
+                return False
+            
+            self._write_program(stream, template_content, symbol_table, quadruples or [], report_name)
+            return True
+            
+        except Exception as e:
+            print(f"Error generating assembly: {e}")
+            return False
+    
+    def generate_cost_report(self, symbol_table: List[Any], quadruples: List[Any] = None,
+                             number_table: List[Any] = None, name: str = "") -> Optional[CostReport]:
+        """
+        Build a static size and cycle report of the program this generator emits, without writing it.
+        
+        To report on a program that is being written, pass report_name to
+        generate_program or emit_program instead, which collects the report
+        from the emitted code rather than generating it again.
+        
+        Args:
+            symbol_table: Symbol table from lexical analyzer
+            quadruples: Quadruples from intermediate code generation
+            number_table: Number table for constants
+            name: Program name shown in the report header
+            
+        Returns:
+            CostReport, or None if the template cannot be read
+        """
+        template = self._read_template()
+        if not template:
+            return None
+        
+        self.reset()
+        symbol_table, quadruples = self._rename_reserved(symbol_table, quadruples or [])
+        self._collect_storage(quadruples, symbol_table)
+        
+        report = CostReport(name)
+        for _ in self._iter_program_lines(template, symbol_table, quadruples, report):
+            pass
+        return report
+    
+    def write_cost_report(self, report_file: str, symbol_table: List[Any], quadruples: List[Any] = None,
+                          number_table: List[Any] = None, name: str = "") -> bool:
+        """
+        Build the static cost report of a program and write it to a text file.
+        
+        Args:
+            report_file: Output report file name
+            symbol_table: Symbol table from lexical analyzer
+            quadruples: Quadruples from intermediate code generation
+            number_table: Number table for constants
+            name: Program name shown in the report header
+            
+        Returns:
+            True if the report was written
+        """
+        try:
+            report = self.generate_cost_report(symbol_table, quadruples, number_table, name)
+            return report is not None and self.save_cost_report(report_file, report)
+            
+        except Exception as e:
+            print(f"Error generating cost report: {e}")
+            return False
+    
+    def save_cost_report(self, report_file: str, report: Optional[CostReport] = None) -> bool:
+        """
+        Write a cost report to a text file.
+        
+        The report describes the code before outlining; when the last
+        program this generator wrote was outlined, a summary of the
+        outlined routines and the bytes saved is appended.
+        
+        Args:
+            report_file: Output report file name
+            report: Report to write (defaults to `cost_report`, collected by the last
+                generate_program or emit_program given a report_name)
+            
+        Returns:
+            True if the report was written
+        """
+        report = report or self.cost_report
+        if report is None:
+            return False
+        try:
+            with open(report_file, 'w', encoding='utf-8') as f:
+                f.write(report.format())
+                if self.outlining is not None:
+                    f.write('\n' + self.outlining.format() + '\n')
+            return True
+            
+        except Exception as e:
+            print(f"Error writing cost report: {e}")
+            return False
+    
+    def _write_program(self, stream: TextIO, template: str, symbol_table: List[Any], 
+                       quadruples: List[Any], report_name: Optional[str] = None):
+        """Write the template and the generated sections to a stream line by line."""
+        # The data segment precedes the code, so storage is collected first
+        self.reset()
+        symbol_table, quadruples = self._rename_reserved(symbol_table, quadruples)
+        self._collect_storage(quadruples, symbol_table)
+        
+        self.cost_report = CostReport(report_name) if report_name is not None else None
+        lines = self._iter_program_lines(template, symbol_table, quadruples, self.cost_report)
+        self.outlining = None
+        if self.outline:
+            self.outlining = outline_program(list(lines))
+            lines = self.outlining.lines
+        for line in lines:
+            stream.write(line)
+            stream.write('\n')
+    
+    def _iter_program_lines(self, template: str, symbol_table: List[Any], quadruples: List[Any],
+                            report: Optional[CostReport] = None) -> Iterator[str]:
+        """
+        Yield template lines, expanding placeholder comments into generated code.
+        
+        Args:
+            report: Cost report that records every line as it is yielded
+        """
+        data_inserted = False
+        
+        for line in template.splitlines():
+            marker = line.strip()
+            if not data_inserted and marker in DATA_PLACEHOLDERS:
+                for data_line in self._iter_data_lines():
+                    if report:
+                        report.add_data_lines([data_line])
+                    yield data_line
+                data_inserted = True
+            elif marker == CODE_PLACEHOLDER:
+                for quad, lines in self._iter_quadruple_code(quadruples, symbol_table):
+                    if report:
+                        report.add_statement_code(getattr(quad, 'line', None), self._unpack_quadruple(quad)[0], lines)
+                    yield from lines
+            elif marker == RUNTIME_PLACEHOLDER:
+                for routine in resolve_routines(self.runtime_routines):
+                    code = routine.code.splitlines()
+                    if report:
+                        report.add_routine(routine.name, code)
+                    yield from code
+                    yield ''
+            else:
+                if report:
+                    report.add_program_lines([line])
+                yield line
+    
     def _read_template(self) -> Optional[str]:
         """Read the assembly template file."""
         try:
@@ -105,7 +394,6 @@ extra segment para public 'data'
 extra ends
 
 datos segment para public 'data'
-        numeroLectura db 6,?,6 dup(?)
         ; Variables will be inserted here
         ; String literals will be inserted here
 datos ends
@@ -128,179 +416,640 @@ p0      proc far
         ret
 p0      endp
 
-; Utility procedure to convert and print decimal numbers
-todec proc near
-        push BP
-        mov BP,SP
-        push AX
-        push BX
-        push DX
-        push CX
-
-        mov cx,0
-        mov dx,0
-        
-label1:
-        cmp ax,0
-        je print1
-        mov bx,10
-        div bx
-        push dx
-        inc cx
-        xor dx,dx
-        jmp label1
-
-print1:
-        cmp cx,0
-        je exit
-        pop dx
-        add dx,48
-        mov ah,02h
-        int 21h
-        dec cx
-        jmp print1
-
-exit:
-        pop CX
-        pop DX
-        pop BX
-        pop AX
-        pop BP
-        ret
-todec endp
+; Runtime routines will be inserted here
 
 codigo ends
         end p0
 """
     
-    def _generate_data_section(self, symbol_table: List[Any]) -> str:
+    def _iter_data_lines(self) -> Iterator[str]:
         """
-        Generate the data segment with variable declarations.
+        Generate the data segment from the collected storage.
         
-        Args:
-            symbol_table: List of symbol table entries
+        Word declarations come first so that every word starts at an even
+        offset, followed by the byte data: booleans, strings, input buffers
+        and string literals.
+        
+        Yields:
+            Data section assembly lines
+        """
+        runtime_data = list(iter_runtime_data(self.runtime_routines))
+        
+        yield from self.layout.iter_word_lines()
+        for temp_var in self.temp_variables:
+            yield f"        {temp_var} DW ?"
+        yield from (line for line in runtime_data if is_word_declaration(line))
+        
+        yield from self.layout.iter_byte_lines()
+        for literal in self.string_literals:
+            yield from self._iter_literal_lines(self.literal_labels[literal], literal)
+        yield from (line for line in runtime_data if not is_word_declaration(line))
+    
+    def _iter_literal_lines(self, label: str, literal: str) -> Iterator[str]:
+        """Declare a '$'-terminated literal, continuing long text on unlabeled DB lines."""
+        chunks = [literal[i:i + LITERAL_CHUNK_SIZE]
+                  for i in range(0, len(literal), LITERAL_CHUNK_SIZE)] or ['']
+        for index, chunk in enumerate(chunks):
+            prefix = f"{label} DB" if index == 0 else "DB"
+            items = [f'"{chunk}"'] if chunk else []
+            if index == len(chunks) - 1:
+                items.append('"$"')
+            yield f"        {prefix} {', '.join(items)}"
+    
+    def _iter_quadruple_code(self, quadruples: List[Any], 
+                             symbol_table: List[Any]) -> Iterator[Tuple[Any, List[str]]]:
+        """
+        Yield each quadruple together with the assembly lines generated for it.
+        
+        Straight-line programs are generated once. Programs with jumps are
+        generated twice: a sizing pass that keeps only the offsets of labels
+        and conditional branches decides which branches to lengthen, and the
+        second pass streams the code with those branches relaxed. Neither
+        pass holds the program's lines.
+        """
+        if not any(self._unpack_quadruple(quad)[0] in JUMP_OPERATORS for quad in quadruples):
+            yield from self._generate_quadruple_code(quadruples, symbol_table)
+            return
+        
+        far = self._far_branches(quadruples, symbol_table)
+        branch = 0
+        for quad, lines in self._generate_quadruple_code(quadruples, symbol_table):
+            relaxed = []
+            for line in lines:
+                parts = line.split()
+                if len(parts) == 2 and parts[0] in INVERTED_BRANCHES:
+                    if branch in far:
+                        skip = self.new_label()
+                        relaxed += [f'        {INVERTED_BRANCHES[parts[0]]} {skip}', f'        jmp {parts[1]}', f'{skip}:']
+                        branch += 1
+                        continue
+                    branch += 1
+                relaxed.append(line)
+            yield quad, relaxed
+    
+    def _generate_quadruple_code(self, quadruples: List[Any], 
+                                 symbol_table: List[Any]) -> Iterator[Tuple[Any, List[str]]]:
+        """
+        Generate the assembly lines of each quadruple.
+        
+        A folded temporary produces no code of its own: its expression tree
+        is kept, keyed by the temporary's name in the quadruples (slot names
+        may coincide with those), and covered by tiles where it is used.
+        """
+        trees: Dict[str, ExpressionNode] = {}
+        for quad in quadruples:
+            operator, raw_operand1, raw_operand2, raw_result = self._unpack_quadruple(quad)
+            operand1 = self.temp_slots.get(raw_operand1, raw_operand1)
+            operand2 = self.temp_slots.get(raw_operand2, raw_operand2)
+            result = self.temp_slots.get(raw_result, raw_result)
+            
+            # Generate assembly for each operation
+            if operator in ARITHMETIC_OPERATORS:
+                node = ExpressionNode(operator, left=self._expression(raw_operand1, trees),
+                                      right=self._expression(raw_operand2, trees))
+                if raw_result in self.folded_temps:
+                    trees[raw_result] = node
+                    lines = []
+                else:
+                    lines = self._select_statement(quad, result, node)
+            elif operator == '=':
+                if raw_operand1 in trees or not self._is_narrow(result):
+                    lines = self._select_statement(quad, result, self._expression(raw_operand1, trees))
+                else:
+                    lines = self._generate_assignment(operand1, result)
+            elif operator == 'print':
+                lines = self._generate_print_element(operand1, symbol_table)
+            elif operator == 'read':
+                lines = self.generate_read_code(result, symbol_table).splitlines() + ['']
+            elif operator == 'label':
+                lines = [f'{LABEL_PREFIX}{result}:']
+            elif operator == 'goto':
+                lines = [f'        jmp {LABEL_PREFIX}{result}', '']
+            elif operator in CONDITIONAL_JUMPS:
+                lines = self._generate_conditional_jump(operator, operand1, operand2, result)
+            else:
+                lines = []
+            yield quad, lines
+    
+    def _far_branches(self, quadruples: List[Any], symbol_table: List[Any]) -> Set[int]:
+        """
+        Find the conditional jumps that cannot reach their target.
+        
+        8086 conditional jumps only reach -128..+127 bytes. A branch that
+        cannot reach its label is replaced by the inverted branch over a near
+        jmp, through a generator-local label. Offsets come from the cost
+        model's instruction sizes; lengthening a branch moves the code after
+        it, so the layout is repeated until every branch fits.
+        
+        Returns:
+            Positions, in program order, of the conditional jumps to lengthen
             
+        Raises:
+            ValueError: If a jump targets an undefined label or a label is defined twice
+        """
+        # The sizing pass must not record its tile selections twice
+        selections = len(self.tile_selections)
+        labels, branches = self._layout(self._generate_quadruple_code(quadruples, symbol_table))
+        del self.tile_selections[selections:]
+        
+        growth = FIXED_SIZES['jmp']
+        far: Set[int] = set()
+        while True:
+            # Lengthened branches before each position, so shifted[k] bytes precede branch k
+            shifted = [0]
+            for index in range(len(branches)):
+                shifted.append(shifted[-1] + (growth if index in far else 0))
+            lengthen = {index for index, (end, target) in enumerate(branches) if index not in far and
+                        labels[target][0] + shifted[labels[target][1]] - (end + shifted[index])
+                        not in SHORT_BRANCH_RANGE}
+            if not lengthen:
+                return far
+            far |= lengthen
+    
+    def _layout(self, generated: Iterable[Tuple[Any, List[str]]]) -> Tuple[Dict[str, Tuple[int, int]], List[Tuple[int, str]]]:
+        """
+        Compute code offsets of the generated lines without keeping them.
+        
         Returns:
-            Data section assembly code
+            (label -> (offset, conditional branches before it),
+             (end offset, target) per conditional branch in program order)
         """
-        data_lines = []
+        labels: Dict[str, Tuple[int, int]] = {}
+        branches = []
+        targets = set()
+        offset = 0
+        for _, lines in generated:
+            for line in lines:
+                text = line.strip()
+                if text.endswith(':'):
+                    if text[:-1] in labels:
+                        raise ValueError(f"Label '{text[:-1]}' defined twice")
+                    labels[text[:-1]] = (offset, len(branches))
+                    continue
+                
+                offset += instruction_size(line)
+                parts = text.split()
+                if len(parts) == 2 and (parts[0] in INVERTED_BRANCHES or parts[0] == 'jmp'):
+                    targets.add(parts[1])
+                    if parts[0] != 'jmp':
+                        branches.append((offset, parts[1]))
+        
+        undefined = targets - set(labels)
+        if undefined:
+            raise ValueError(f"Jump to undefined label '{sorted(undefined)[0]}'")
+        return labels, branches
+    
+    def _unpack_symbol(self, symbol: Any) -> Tuple[str, str, Any]:
+        """Return (name, data type, value) for either symbol format."""
+        if hasattr(symbol, 'name') and hasattr(symbol, 'data_type'):
+            # Modern symbol entry (SymbolEntry dataclass)
+            data_type = symbol.data_type.value if hasattr(symbol.data_type, 'value') else symbol.data_type
+            return symbol.name, data_type, symbol.value
         
-        # Process symbol table entries
+        # Legacy symbol entry (list format)
+        return symbol[0], symbol[1], symbol[2]
+    
+    def _unpack_quadruple(self, quad: Any) -> Tuple[str, str, str, str]:
+        """Return (operator, operand1, operand2, result) for either quadruple format."""
+        if hasattr(quad, 'operator'):
+            # Modern quadruple (Quadruple dataclass)
+            return quad.operator, quad.operand1, quad.operand2, quad.result
+        
+        # Legacy quadruple (list format)
+        operator = quad[0]
+        operand1 = quad[1] if len(quad) > 1 else ""
+        operand2 = quad[2] if len(quad) > 2 else ""
+        result = quad[3] if len(quad) > 3 else ""
+        return operator, operand1, operand2, result
+    
+    def _rename_reserved(self, symbol_table: List[Any], quadruples: List[Any]) -> Tuple[List[Any], List[Any]]:
+        """
+        Rename the variables that share a name with a register, mnemonic or directive.
+        
+        MASM would read `ax DW 5` and `mov ax, bx` as register operations, so
+        such a variable is called _v<name> in the output. The tables are only
+        copied when the program has one.
+        
+        Returns:
+            (symbol table, quadruples) with the renamed variables
+        """
+        renamed = {}
         for symbol in symbol_table:
-            if hasattr(symbol, 'name') and hasattr(symbol, 'data_type'):
-                # Modern symbol entry (SymbolEntry dataclass)
-                name = symbol.name
-                data_type = symbol.data_type.value if hasattr(symbol.data_type, 'value') else symbol.data_type
-                value = symbol.value
+            name = self._unpack_symbol(symbol)[0]
+            if name.lower() in RESERVED_NAMES:
+                renamed[name] = f"{RENAMED_PREFIX}{name}"
+        if not renamed:
+            return symbol_table, quadruples
+        
+        symbols = [replace(symbol, name=renamed.get(symbol.name, symbol.name)) if hasattr(symbol, 'name')
+                   else [renamed.get(symbol[0], symbol[0]), *symbol[1:]] for symbol in symbol_table]
+        renamed_quadruples = []
+        for quad in quadruples:
+            operator, *operands = self._unpack_quadruple(quad)
+            operand1, operand2, result = (renamed.get(operand, operand) for operand in operands)
+            if hasattr(quad, 'operator'):
+                renamed_quadruples.append(replace(quad, operand1=operand1, operand2=operand2, result=result))
             else:
-                # Legacy symbol entry (list format)
-                name = symbol[0]
-                data_type = symbol[1]
-                value = symbol[2]
-            
-            if data_type == "int":
-                data_lines.append(f"        {name} DW {int(value)}")
-            elif data_type == "str":
-                if value and len(str(value)) > 0:
-                    # Remove quotes if present
-                    clean_value = str(value).strip('"')
-                    data_lines.append(f'        {name} DB "{clean_value}", "$"')
+                renamed_quadruples.append([operator, operand1, operand2, result])
+        return symbols, renamed_quadruples
+    
+    def _collect_storage(self, quadruples: List[Any], symbol_table: List[Any]):
+        """Register the temporary slots, string literals, runtime routines and variables the quadruples need."""
+        self._allocate_temporaries(quadruples, symbol_table)
+        
+        for quad in quadruples:
+            operator, operand1, operand2, result = self._unpack_quadruple(quad)
+            self.referenced_symbols.update((operand1, operand2, result))
+            if operator == 'print':
+                if self._is_literal(operand1):
+                    self.intern_literal(operand1[1:-1])
+                    self.runtime_routines.add('_printstr')
                 else:
-                    # Empty string
-                    data_lines.append(f"        {name} db 20,?,20 dup(?)")
-            elif data_type == "boolean":
-                int_value = 1 if value else 0
-                data_lines.append(f"        {name} DW {int_value}")
+                    routine = self._print_routine(self._symbol_type(operand1, symbol_table))
+                    if routine:
+                        self.runtime_routines.add(routine)
+            elif operator == 'read':
+                routine = self._read_routine(self._symbol_type(result, symbol_table))
+                if routine:
+                    self.runtime_routines.add(routine)
         
-        # Add temporary variables
-        for temp_var in self.temp_variables:
-            data_lines.append(f"        {temp_var} DW ?")
+        # Variables no quadruple references need no storage
+        for symbol in symbol_table:
+            name, data_type, value = self._unpack_symbol(symbol)
+            if name in self.referenced_symbols:
+                self.layout.add_variable(name, data_type, value)
+    
+    def _allocate_temporaries(self, quadruples: List[Any], symbol_table: List[Any]):
+        """
+        Map temporaries onto the minimum number of data words.
+        
+        The temporaries are the names the quadruples compute into that the
+        symbol table does not declare; a declared variable is never moved
+        into a slot, whatever its name, and slot names avoid every declared
+        name.
         
-        # Add string literals
-        for i, literal in enumerate(self.string_literals, 1):
-            data_lines.append(f'        str{i} DB "{literal}", "$"')
+        Each temporary is live from its definition to its last use. Scanning
+        the quadruples in order, a slot is released when the temporary dies
+        and handed to the next temporary that is defined, so temporaries with
+        non-overlapping lifetimes share storage. Operands are loaded into
+        registers before the result is stored, which lets a result reuse the
+        slot of an operand that dies in the same quadruple. A temporary that
+        is defined before a loop and read inside it (a hoisted invariant)
+        stays live until the loop's back edge.
         
-        return '\n'.join(data_lines)
+        Temporaries folded into the expression of their use need no slot;
+        the operands of their quadruples are read where that expression is
+        evaluated, so they live until then.
+        """
+        declared = {self._unpack_symbol(symbol)[0] for symbol in symbol_table}
+        for quad in quadruples:
+            operator, _, _, result = self._unpack_quadruple(quad)
+            if (operator in ARITHMETIC_OPERATORS or operator == '=') and result not in declared:
+                self.temporaries.add(result)
+        
+        prefix = SLOT_PREFIX
+        while any(re.fullmatch(re.escape(prefix) + r'\d+', name) for name in declared):
+            prefix = '_' + prefix
+        
+        self.folded_temps = find_foldable_temporaries(quadruples, self.temporaries)
+        last_use: Dict[str, int] = {}
+        first_definition: Dict[str, int] = {}
+        label_index: Dict[str, int] = {}
+        for index, quad in enumerate(quadruples):
+            operator, operand1, operand2, result = self._unpack_quadruple(quad)
+            evaluation = self.folded_temps.get(result, index)
+            for operand in (operand1, operand2):
+                if self._is_temp(operand):
+                    last_use[operand] = max(last_use.get(operand, index), evaluation)
+            if operator == 'label':
+                label_index[result] = index
+            elif self._is_temp(result) and result not in self.folded_temps:
+                first_definition.setdefault(result, index)
+        
+        # Back edges are visited in order, so an inner loop's extension is seen by the outer loop
+        for index, quad in enumerate(quadruples):
+            operator, _, _, result = self._unpack_quadruple(quad)
+            header = label_index.get(result)
+            if operator in JUMP_OPERATORS and header is not None and header < index:
+                for temp, end in last_use.items():
+                    if first_definition.get(temp, -1) < header <= end < index:
+                        last_use[temp] = index
+        
+        dying: Dict[int, List[str]] = {}
+        for temp, end in last_use.items():
+            dying.setdefault(end, []).append(temp)
+        
+        slot_numbers: Dict[str, int] = {}
+        free_slots: List[int] = []
+        for index, quad in enumerate(quadruples):
+            _, _, _, result = self._unpack_quadruple(quad)
+            
+            # Release temporaries whose lifetime ends here
+            for temp in dying.get(index, []):
+                if temp in slot_numbers:
+                    heapq.heappush(free_slots, slot_numbers[temp])
+            
+            if self._is_temp(result) and result not in self.temp_slots and result not in self.folded_temps:
+                if free_slots:
+                    slot = heapq.heappop(free_slots)
+                else:
+                    slot = len(self.temp_variables) + 1
+                    self.temp_variables.append(f"{prefix}{slot}")
+                slot_numbers[result] = slot
+                self.temp_slots[result] = f"{prefix}{slot}"
+                
+                # A temporary that is never read dies immediately
+                if result not in last_use:
+                    heapq.heappush(free_slots, slot)
+    
+    def _constant_value(self, operand: str) -> Optional[int]:
+        """
+        Return the value of a numeric literal operand.
+        
+        Quadruples carry constants as literal digits; any other operand names
+        storage, even one that looks like a number table identifier.
+        """
+        if operand.isdigit():
+            return int(operand)
+        return None
+    
+    def _is_temp(self, name: str) -> bool:
+        """Check whether an operand names a temporary of the program being generated."""
+        return name in self.temporaries
     
-    def _generate_code_section(self, quadruples: List[Any]) -> str:
+    def intern_literal(self, literal: str) -> str:
         """
-        Generate the code segment from quadruples.
+        Return the data label for a string literal, allocating it on first use.
         
         Args:
-            quadruples: List of quadruple intermediate code
+            literal: Literal content without surrounding quotes
             
         Returns:
-            Code section assembly code
+            Label shared by every occurrence of the same content
         """
-        code_lines = []
+        label = self.literal_labels.get(literal)
+        if label is None:
+            self.string_literals.append(literal)
+            label = f"{LITERAL_PREFIX}{len(self.string_literals)}"
+            self.literal_labels[literal] = label
+        return label
+    
+    def _is_literal(self, element: str) -> bool:
+        """Quoted print operands are literals, anything else names a variable."""
+        return len(element) >= 2 and element[0] == '"' and element[-1] == '"'
+    
+    def tile_listing(self) -> str:
+        """Render the tile cost table and the tiles selected for the last program generated."""
+        return format_tile_listing(self.tile_selections)
+    
+    def _expression(self, operand: str, trees: Dict[str, ExpressionNode]) -> ExpressionNode:
+        """Return the pending tree of a folded temporary, or a leaf for any other operand."""
+        if operand in trees:
+            return trees.pop(operand)
+        return ExpressionNode(operand=self.temp_slots.get(operand, operand))
+    
+    def _select_statement(self, quad: Any, destination: str, node: ExpressionNode) -> List[str]:
+        """Cover a store of an expression tree with tiles and record the selection."""
+        tiles, code = self._munch_statement(destination, node)
+        self.tile_selections.append(
+            TileSelection(getattr(quad, 'line', None), f"{destination} = {node}", tiles, code))
+        return code + ['']
+    
+    def _munch_statement(self, destination: str, node: ExpressionNode) -> Candidate:
+        """
+        Select the tiles for destination = node.
         
-        for quad in quadruples:
-            if hasattr(quad, 'operator'):
-                # Modern quadruple (Quadruple dataclass)
-                operator = quad.operator
-                operand1 = quad.operand1
-                operand2 = quad.operand2
-                result = quad.result
-            else:
-                # Legacy quadruple (list format)
-                operator = quad[0]
-                operand1 = quad[1] if len(quad) > 1 else ""
-                operand2 = quad[2] if len(quad) > 2 else ""
-                result = quad[3] if len(quad) > 3 else ""
-            
-            # Generate assembly for each operation
-            if operator == '+':
-                code_lines.extend(self._generate_arithmetic('+', operand1, operand2, result))
-            elif operator == '-':
-                code_lines.extend(self._generate_arithmetic('-', operand1, operand2, result))
-            elif operator == '*':
-                code_lines.extend(self._generate_arithmetic('*', operand1, operand2, result))
-            elif operator == '/':
-                code_lines.extend(self._generate_arithmetic('/', operand1, operand2, result))
-            elif operator == '=':
-                code_lines.extend(self._generate_assignment(operand1, result))
+        Word destinations can take the operation in memory (inc x, add x, 5,
+        add x, ax) when they are also an operand; byte and flag destinations
+        are always stored from AX.
         
-        return '\n'.join(code_lines)
+        Returns:
+            (tile names, assembly lines) of the cheapest covering
+        """
+        if self._is_narrow(destination):
+            tiles, code = self._munch(node)
+            return tiles + ['store-narrow'], code + self._store(destination)
+        if self._operand_class(node) == 'imm':
+            return self._tile('store-imm', d=destination, c=self._immediate(node.operand))
+        
+        options = [self._combine(self._munch(node), self._tile('store', d=destination))]
+        if node.operator in ('+', '-'):
+            mnemonic = 'add' if node.operator == '+' else 'sub'
+            pairs = [(node.left, node.right)]
+            if node.operator in COMMUTATIVE_OPERATORS:
+                pairs.append((node.right, node.left))
+            for own, other in pairs:
+                if not own.is_leaf or own.operand != destination:
+                    continue
+                if self._operand_class(other) != 'imm':
+                    options.append(self._combine(self._munch(other), self._tile(f'{mnemonic}-mem-reg', d=destination)))
+                elif self._immediate(other.operand) == '1':
+                    options.append(self._tile('inc-mem' if mnemonic == 'add' else 'dec-mem', d=destination))
+                else:
+                    options.append(self._tile(f'{mnemonic}-mem-imm', d=destination, c=self._immediate(other.operand)))
+        return self._cheapest(options)
     
-    def _generate_arithmetic(self, operator: str, op1: str, op2: str, result: str) -> List[str]:
-        """Generate assembly for arithmetic operations."""
-        lines = [
-            '        xor ax, ax',
-            '        xor bx, bx',
-            f'        mov ax, {op1}',
-            f'        mov bx, {op2}'
-        ]
+    def _munch(self, node: ExpressionNode) -> Candidate:
+        """
+        Select the tiles that leave the value of an expression tree in AX.
         
-        if operator == '+':
-            lines.append('        add ax, bx')
-        elif operator == '-':
-            lines.append('        sub ax, bx')
-        elif operator == '*':
-            lines.append('        mul bx')
-        elif operator == '/':
-            lines.extend([
-                '        xor dx, dx',
-                '        div bx'
-            ])
+        The left operand is evaluated into AX and the right one folded into
+        the operation as an immediate or memory operand, or loaded into BX.
+        A right subtree is evaluated first and moved to BX; commutative
+        operators are reordered so that it rarely has to be.
+        
+        Raises:
+            ValueError: If both operands are subtrees (folding never builds such trees)
+        """
+        if node.is_leaf:
+            return self._munch_leaf(node.operand, 'ax')
         
-        lines.append(f'        mov {result}, ax')
-        lines.append('')  # Empty line for readability
+        operator, left, right = node.operator, node.left, node.right
+        if operator in COMMUTATIVE_OPERATORS and \
+                OPERAND_RANK[self._operand_class(left)] > OPERAND_RANK[self._operand_class(right)]:
+            left, right = right, left
+        kind = self._operand_class(right)
+        register_tile = self._tile(REGISTER_TILES[operator])
         
-        # Add temporary variable if needed
-        if result.startswith('t') and result not in self.temp_variables:
-            self.temp_variables.append(result)
+        if kind == 'tree':
+            if not left.is_leaf:
+                raise ValueError(f"Cannot select instructions for '{node}': both operands are subexpressions")
+            return self._combine(self._munch(right), self._tile('move-bx'),
+                                 self._munch_leaf(left.operand, 'ax'), register_tile)
         
-        return lines
+        if kind == 'imm' and operator == '*' and left.is_leaf and self._immediate(right.operand) == '0':
+            return self._tile('zero', r='ax')
+        
+        first = self._munch(left)
+        options = [self._combine(first, self._munch_leaf(right.operand, 'bx'), register_tile)]
+        if kind == 'mem':
+            name = {'+': 'add-mem', '-': 'sub-mem', '*': 'mul-mem', '/': 'div-mem'}[operator]
+            options.append(self._combine(first, self._tile(name, m=right.operand)))
+        elif kind == 'imm':
+            constant = int(self._immediate(right.operand))
+            if operator in ('+', '-') and constant == 0:
+                options.append(first)
+            elif operator in ('+', '-') and constant == 1:
+                options.append(self._combine(first, self._tile('inc' if operator == '+' else 'dec')))
+            elif operator in ('+', '-'):
+                options.append(self._combine(first, self._tile(f"{'add' if operator == '+' else 'sub'}-imm",
+                                                               c=str(constant))))
+            elif operator == '*':
+                shifts = self._multiply_ax(constant)
+                if shifts is not None:
+                    options.append(self._combine(first, (['mul-shift'], shifts)))
+            elif constant > 0 and constant & (constant - 1) == 0:
+                # Unsigned division by 2^k is a logical shift right by k
+                shifts = ['        shr ax, 1'] * (constant.bit_length() - 1)
+                options.append(self._combine(first, (['div-shift'], shifts)))
+        return self._cheapest(options)
+    
+    def _munch_leaf(self, operand: str, register: str) -> Candidate:
+        """Select the tile loading one operand into a word register."""
+        if self._constant_value(operand) is not None:
+            value = self._immediate(operand)
+            if value == '0':
+                return self._tile('zero', r=register)
+            return self._tile('load-imm', r=register, c=value)
+        if self._operand_class(ExpressionNode(operand=operand)) == 'reg':
+            return ['load-widen'], self._load(operand, register)
+        return self._tile('load-mem', r=register, m=operand)
+    
+    def _multiply_ax(self, constant: int) -> Optional[List[str]]:
+        """Multiply AX by 0, 2^k or 2^high +/- 2^low using shifts and one add/sub."""
+        if constant == 0:
+            return ['        xor ax, ax']
+        if constant & (constant - 1) == 0:
+            return ['        shl ax, 1'] * (constant.bit_length() - 1)
+        
+        low = (constant & -constant).bit_length() - 1
+        remainder = constant - (1 << low)
+        if remainder & (remainder - 1) == 0:
+            high, combine = remainder.bit_length() - 1, 'add'
+        else:
+            total = constant + (1 << low)
+            if total & (total - 1):
+                return None
+            high, combine = total.bit_length() - 1, 'sub'
+        
+        return (['        shl ax, 1'] * low
+                + ['        mov bx, ax']
+                + ['        shl ax, 1'] * (high - low)
+                + [f'        {combine} ax, bx'])
+    
+    def _operand_class(self, node: ExpressionNode) -> str:
+        """Classify an operand as a subtree, an immediate, a word in memory, or a byte/flag needing a register."""
+        if not node.is_leaf:
+            return 'tree'
+        if self._constant_value(node.operand) is not None:
+            return 'imm'
+        return 'reg' if self._is_narrow(node.operand) else 'mem'
+    
+    def _is_narrow(self, name: str) -> bool:
+        """Check whether a variable is stored as a boolean byte or packed flag rather than a word."""
+        storage = self.layout.get(name)
+        return bool(storage) and (storage.is_byte or storage.is_bit)
+    
+    def _immediate(self, operand: str) -> str:
+        """Constant operand as a 16-bit immediate."""
+        return str(self._constant_value(operand) & 0xFFFF)
+    
+    def _tile(self, name: str, **operands: str) -> Candidate:
+        """Instantiate a fixed tile."""
+        return [name], TILES[name].emit(**operands)
+    
+    def _combine(self, *candidates: Candidate) -> Candidate:
+        """Concatenate tile selections executed in sequence."""
+        return ([name for tiles, _ in candidates for name in tiles],
+                [line for _, code in candidates for line in code])
+    
+    def _cheapest(self, candidates: List[Candidate]) -> Candidate:
+        """Pick the candidate with the fewest estimated cycles, then the fewest bytes."""
+        return min(candidates, key=lambda candidate: (estimate_cycles(candidate[1]), estimate_size(candidate[1])))
+    
+    def _generate_conditional_jump(self, operator: str, op1: str, op2: str, label: str) -> List[str]:
+        """
+        Generate a compare-and-branch to an IR label.
+        
+        A literal left operand is moved to the right so it becomes the
+        immediate of cmp, and a comparison with zero uses the shorter test.
+        Boolean bytes are compared in AL, and a packed flag tested against
+        zero is tested in place in its flag word.
+        """
+        if op1.isdigit() and not op2.isdigit():
+            operator, op1, op2 = SWAPPED_RELATIONS[operator], op2, op1
+        first, second = self.layout.get(op1), self.layout.get(op2)
+        zero = self._constant_value(op2) == 0
+        
+        if first and first.is_bit and zero and operator in ('j==', 'j!='):
+            compare = [f'        test {first.label}, {first.mask}']
+        elif first and first.is_byte and (op2.isdigit() or (second and second.is_byte)):
+            compare = [f'        mov al, {op1}', '        test al, al' if zero else f'        cmp al, {op2}']
+        elif zero:
+            compare = self._load(op1) + ['        test ax, ax']
+        elif second and (second.is_byte or second.is_bit):
+            compare = self._load(op1) + self._load(op2, 'bx') + ['        cmp ax, bx']
+        else:
+            compare = self._load(op1) + [f'        cmp ax, {op2}']
+        
+        return compare + [
+            f'        {CONDITIONAL_JUMPS[operator]} {LABEL_PREFIX}{label}',
+            ''
+        ]
     
     def _generate_assignment(self, source: str, destination: str) -> List[str]:
         """Generate assembly for assignments."""
+        target = self.layout.get(destination)
+        if target and target.is_bit and source.isdigit():
+            # A constant flag is set or cleared in place
+            if int(source):
+                return [f'        or {target.label}, {target.mask}', '']
+            return [f'        and {target.label}, {~target.mask & 0xFFFF}', '']
+        if target and target.is_byte:
+            if source.isdigit():
+                return [f'        mov byte ptr {destination}, {int(source) & 0xFF}', '']
+            origin = self.layout.get(source)
+            if origin and origin.is_byte:
+                return [f'        mov al, {source}', f'        mov {destination}, al', '']
+        if target and (target.is_byte or target.is_bit):
+            return self._load(source) + self._store(destination) + ['']
+        
         return [
             '        xor ax, ax',
-            f'        mov ax, {source}',
+            *self._load(source),
             f'        mov {destination}, ax',
             ''
         ]
     
+    def _load(self, operand: str, register: str = 'ax') -> List[str]:
+        """Load an operand into a word register, widening boolean bytes and packed flags to 0/1."""
+        storage = self.layout.get(operand)
+        if storage and storage.is_byte:
+            low, high = register[0] + 'l', register[0] + 'h'
+            return [f'        mov {low}, {operand}', f'        xor {high}, {high}']
+        if storage and storage.is_bit:
+            return ([f'        mov {register}, {storage.label}']
+                    + self._shift(register, 'shr', storage.bit)
+                    + [f'        and {register}, 1'])
+        return [f'        mov {register}, {operand}']
+    
+    def _store(self, destination: str) -> List[str]:
+        """Store AX into a variable, narrowing it to a byte or packed flag as its storage requires."""
+        storage = self.layout.get(destination)
+        if storage and storage.is_byte:
+            return [f'        mov {destination}, al']
+        if storage and storage.is_bit:
+            return (self._shift('ax', 'shl', storage.bit)
+                    + [f'        and {storage.label}, {~storage.mask & 0xFFFF}',
+                       f'        or {storage.label}, ax'])
+        return [f'        mov {destination}, ax']
+    
+    def _shift(self, register: str, mnemonic: str, count: int) -> List[str]:
+        """Shift a register by a constant, through CL when single-bit shifts would be longer."""
+        if count > 2:
+            return ['        mov cl, ' + str(count), f'        {mnemonic} {register}, cl']
+        return [f'        {mnemonic} {register}, 1'] * count
+    
     def generate_print_code(self, strings: List[str], elements: List[str], symbol_table: List[Any]) -> str:
         """
         Generate assembly code for print operations.
@@ -314,57 +1063,60 @@ codigo ends
             Assembly code for print operation
         """
         code_lines = []
-        string_stack = []
-        string_counter = 0
+        literals = set(strings)
         
-        # Register string literals
-        for string_literal in strings:
-            string_counter += 1
-            string_stack.append(string_counter)
-            self.string_literals.append(string_literal)
-        
-        # Generate print code for each element
-        stack_index = 0
+        # Adjacent literals are printed as one interned string with a single call
+        pending: List[str] = []
         for element in elements:
-            is_string_literal = False
-            
-            # Check if element is a string literal
-            for string_literal in strings:
-                if element == string_literal:
-                    code_lines.extend([
-                        f'        mov dx, offset str{string_stack[stack_index]}',
-                        '        mov ah, 9',
-                        '        int 21h',
-                        ''
-                    ])
-                    is_string_literal = True
-                    stack_index += 1
-                    break
-            
-            if not is_string_literal:
-                # Element is a variable
-                symbol = self._find_symbol_in_table(element, symbol_table)
-                if symbol:
-                    symbol_type = symbol[1] if len(symbol) > 1 else "int"
-                    
-                    if symbol_type == "int":
-                        code_lines.extend([
-                            f"        mov AX, {element}",
-                            "        push AX",
-                            "        call todec",
-                            "        pop ax",
-                            ''
-                        ])
-                    elif symbol_type == "str":
-                        code_lines.extend([
-                            f'        mov dx, offset {element}',
-                            '        mov ah, 9',
-                            '        int 21h',
-                            ''
-                        ])
+            if element in literals:
+                pending.append(element)
+            elif self._is_literal(element):
+                pending.append(element[1:-1])
+            else:
+                if pending:
+                    code_lines.extend(self._generate_print_label(self.intern_literal(''.join(pending))))
+                    pending = []
+                code_lines.extend(self._generate_print_element(element, symbol_table))
+        if pending:
+            code_lines.extend(self._generate_print_label(self.intern_literal(''.join(pending))))
         
         return '\n'.join(code_lines)
     
+    def _generate_print_element(self, element: str, symbol_table: List[Any]) -> List[str]:
+        """Generate a call that prints one literal or variable."""
+        if self._is_literal(element):
+            return self._generate_print_label(self.intern_literal(element[1:-1]))
+        
+        # Element is a variable
+        symbol = self._find_symbol_in_table(element, symbol_table)
+        if not symbol:
+            return []
+        
+        symbol_type = symbol[1] if len(symbol) > 1 else "int"
+        routine = self._print_routine(symbol_type)
+        
+        if routine == '_todec':
+            self.runtime_routines.add(routine)
+            return self._load(element) + [
+                "        call _todec",
+                ''
+            ]
+        elif routine == '_printstr':
+            # Input buffers hold their text after the max/count bytes
+            if self._is_input_buffer(symbol):
+                return self._generate_print_label(f"{element}+2")
+            return self._generate_print_label(element)
+        return []
+    
+    def _generate_print_label(self, label: str) -> List[str]:
+        """Generate a _printstr call for a "$"-terminated label."""
+        self.runtime_routines.add('_printstr')
+        return [
+            f'        mov dx, offset {label}',
+            '        call _printstr',
+            ''
+        ]
+    
     def generate_read_code(self, variable: str, symbol_table: List[Any]) -> str:
         """
         Generate assembly code for read operations.
@@ -381,61 +1133,47 @@ codigo ends
             return ""
         
         symbol_type = symbol[1] if len(symbol) > 1 else "int"
+        routine = self._read_routine(symbol_type)
+        if routine:
+            self.runtime_routines.add(routine)
         
-        if symbol_type == 'str':
-            return f"""        xor ax, ax
-        xor bx, bx
-        mov dx, offset {variable}
-        mov ah, 0ah
-        int 21h
-        mov dl, 10
-        mov AH,2
-        int 21h
-        
+        if routine == '_readstr':
+            return f"""        mov dx, offset {variable}
+        call _readstr
 """
-        elif symbol_type == 'int':
-            return f"""        lea dx, numeroLectura
-        mov ah, 0ah
-        int 21h
-        lea bx, numeroLectura+1
-        mov ch, 0
-        mov cl, [bx]
-        push cx
-        cr:
-            inc bx
-            mov al, [bx]
-            cmp al, 30h
-            jb fuera
-            cmp al, 39h
-            ja fuera
-            sub [bx], 30h
-            loop cr
-        pop cx
-        dec cx
-        mov si, 0ah
-        lea bx, numeroLectura+2
-        mov al, [bx]
-        mov ah, 0
-        jcxz tp
-        cc:
-            mul si
-            jo fuera
-            inc bx
-            mov dl, [bx]
-            mov dh, 0
-            add ax, dx
-        loop cc
-        tp:
-            jc fuera
-            mov {variable}, ax
-        fuera:
-        mov dl, 10
-        mov AH,2
-        int 21h
-        
+        elif routine == '_readint':
+            return f"""        lea di, {variable}
+        call _readint
 """
         return ""
     
+    def _print_routine(self, symbol_type: Optional[str]) -> Optional[str]:
+        """Runtime routine that prints a variable of the given type."""
+        if symbol_type in ("int", "boolean"):
+            return '_todec'
+        if symbol_type == "str":
+            return '_printstr'
+        return None
+    
+    def _read_routine(self, symbol_type: Optional[str]) -> Optional[str]:
+        """Runtime routine that reads a variable of the given type."""
+        if symbol_type == "int":
+            return '_readint'
+        if symbol_type == "str":
+            return '_readstr'
+        return None
+    
+    def _symbol_type(self, name: str, symbol_table: List[Any]) -> Optional[str]:
+        """Look up the data type of a variable."""
+        symbol = self._find_symbol_in_table(name, symbol_table)
+        if not symbol:
+            return None
+        return symbol[1] if len(symbol) > 1 else "int"
+    
+    def _is_input_buffer(self, symbol: List[Any]) -> bool:
+        """Strings without an initial value are laid out as DOS input buffers."""
+        return symbol[1] == "str" and not (len(symbol) > 2 and symbol[2])
+    
     def _find_symbol_in_table(self, name: str, symbol_table: List[Any]) -> Optional[Any]:
         """Find a symbol in the symbol table."""
         for symbol in symbol_table:
@@ -445,27 +1183,11 @@ codigo ends
             elif len(symbol) > 0 and symbol[0] == name:
                 return symbol
         return None
-    
-    def _combine_template(self, template: str, data_section: str, code_section: str) -> str:
-        """Combine template with generated sections."""
-        # Replace placeholder comments with actual code
-        result = template
-        
-        # Insert data section
-        if "; Variables will be inserted here" in result:
-            result = result.replace("; Variables will be inserted here", data_section)
-        elif "        ; String literals will be inserted here" in result:
-            result = result.replace("        ; String literals will be inserted here", data_section)
-        
-        # Insert code section
-        if "; Generated code will be inserted here" in result:
-            result = result.replace("; Generated code will be inserted here", code_section)
-        
-        return result
 
 
 def generate_assembly(output_file: str, symbol_table: List[Any], 
-                     quadruples: List[Any] = None, number_table: List[Any] = None) -> bool:
+                     quadruples: List[Any] = None, number_table: List[Any] = None,
+                     pack_booleans: bool = False, outline: bool = False) -> bool:
     """
     Convenience function to generate assembly code.
     
@@ -474,14 +1196,37 @@ def generate_assembly(output_file: str, symbol_table: List[Any],
         symbol_table: Symbol table from analyzer
         quadruples: Intermediate code quadruples
         number_table: Number constants table
+        pack_booleans: Store booleans as bits of shared flag words
+        outline: Factor repeated instruction sequences into subroutines
         
     Returns:
         True if successful
     """
-    generator = AssemblyGenerator()
+    generator = AssemblyGenerator(pack_booleans=pack_booleans, outline=outline)
     return generator.generate_program(output_file, symbol_table, quadruples, number_table)
 
 
+def stream_assembly(stream: TextIO, symbol_table: List[Any], 
+                    quadruples: List[Any] = None, number_table: List[Any] = None,
+                    pack_booleans: bool = False, outline: bool = False) -> bool:
+    """
+    Convenience function to stream assembly code to a writable object.
+    
+    Args:
+        stream: Object with a write(str) method (file, socket.makefile('w'), ...)
+        symbol_table: Symbol table from analyzer
+        quadruples: Intermediate code quadruples
+        number_table: Number constants table
+        pack_booleans: Store booleans as bits of shared flag words
+        outline: Factor repeated instruction sequences into subroutines
+        
+    Returns:
+        True if successful
+    """
+    generator = AssemblyGenerator(pack_booleans=pack_booleans, outline=outline)
+    return generator.emit_program(stream, symbol_table, quadruples, number_table)
+
+
 if __name__ == "__main__":
     # Example usage
     mock_symbol_table = [
@@ -490,8 +1235,8 @@ if __name__ == "__main__":
     ]
     
     mock_quadruples = [
-        ['+', 'x', '10', 't1'],
-        ['=', 't1', '', 'result']
+        ['+', 'x', '10', '_t1'],
+        ['=', '_t1', '', 'result']
     ]
     
     success = generate_assembly('test_output.asm', mock_symbol_table, mock_quadruples)
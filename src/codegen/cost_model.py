@@ -0,0 +1,381 @@
+"""
+8086 Cost Model
+
+This module estimates the execution cost and code size of the assembly
+emitted by the code generator. Cycle counts follow the Intel 8086 timing
+tables: each instruction has a base cost per operand form plus the
+effective address (EA) calculation time when it touches memory. Sizes
+follow the 8086 encodings (opcode, ModR/M, displacement and immediate).
+"""
+
+import re
+from typing import Iterable, Optional, Tuple
+
+
+# 16-bit and 8-bit general purpose registers
+REGISTERS = {
+    'ax', 'bx', 'cx', 'dx', 'si', 'di', 'bp', 'sp',
+    'al', 'ah', 'bl', 'bh', 'cl', 'ch', 'dl', 'dh'
+}
+SEGMENT_REGISTERS = {'cs', 'ds', 'es', 'ss'}
+
+# Assembler directives and data definitions cost nothing at run time
+DIRECTIVES = {
+    'segment', 'ends', 'proc', 'endp', 'assume', 'public', 'end',
+    'db', 'dw', 'dd', 'equ'
+}
+
+# Base cycles per (mnemonic, destination kind, source kind); EA is added for 'mem'
+CYCLE_TABLE = {
+    ('mov', 'reg', 'reg'): 2, ('mov', 'reg', 'mem'): 8, ('mov', 'mem', 'reg'): 9,
+    ('mov', 'reg', 'imm'): 4, ('mov', 'mem', 'imm'): 10,
+    ('mov', 'seg', 'reg'): 2, ('mov', 'reg', 'seg'): 2,
+    ('alu', 'reg', 'reg'): 3, ('alu', 'reg', 'mem'): 9, ('alu', 'mem', 'reg'): 16,
+    ('alu', 'reg', 'imm'): 4, ('alu', 'mem', 'imm'): 17,
+    ('shift', 'reg', 'one'): 2, ('shift', 'mem', 'one'): 15,
+    ('shift', 'reg', 'cl'): 8, ('shift', 'mem', 'cl'): 20,
+    ('unary', 'reg', None): 3, ('unary', 'mem', None): 16,
+    ('incdec', 'reg', None): 2, ('incdec', 'mem', None): 15,
+    ('mul', 'reg', None): 124, ('mul', 'mem', None): 130,
+    ('div', 'reg', None): 150, ('div', 'mem', None): 156,
+    ('lea', 'reg', 'mem'): 2,
+    ('push', 'reg', None): 11, ('push', 'seg', None): 10, ('push', 'mem', None): 16,
+    ('pop', 'reg', None): 8, ('pop', 'seg', None): 8, ('pop', 'mem', None): 17,
+}
+
+ALU_MNEMONICS = {'add', 'sub', 'cmp', 'and', 'or', 'xor', 'adc', 'sbb', 'test'}
+SHIFT_MNEMONICS = {'shl', 'shr', 'sal', 'sar', 'rol', 'ror'}
+UNARY_MNEMONICS = {'neg', 'not'}
+
+# Control transfer costs (conditional branches are counted as taken)
+BRANCH_CYCLES = {
+    'jmp': 15, 'call': 19, 'ret': 8, 'retf': 18, 'int': 51,
+    'loop': 17, 'jcxz': 18, 'cbw': 2, 'cwd': 5, 'nop': 3,
+}
+CONDITIONAL_JUMP_CYCLES = 16
+
+# Shift counts cost 4 cycles per bit when taken from CL
+SHIFT_CL_PER_BIT = 4
+
+# Accumulator <-> direct memory moves have a short 10 cycle encoding
+ACCUMULATOR_MOVE_CYCLES = 10
+
+# Encoded sizes in bytes of instructions without operand-dependent forms
+FIXED_SIZES = {
+    'ret': 1, 'retf': 1, 'cbw': 1, 'cwd': 1, 'nop': 1,
+    'call': 3, 'jmp': 3, 'loop': 2, 'jcxz': 2, 'int': 2,
+}
+CONDITIONAL_JUMP_SIZE = 2
+
+BYTE_REGISTERS = {'al', 'ah', 'bl', 'bh', 'cl', 'ch', 'dl', 'dh'}
+
+_MEMORY_OPERAND = re.compile(r'\[([^\]]*)\]')
+_CHARACTER = re.compile(r"^(['\"]).\1$")
+
+
+def split_instruction(line: str) -> Optional[Tuple[str, list]]:
+    """
+    Split an assembly line into mnemonic and operands.
+
+    Args:
+        line: Assembly source line
+
+    Returns:
+        (mnemonic, operands) or None for blank lines, labels and directives
+    """
+    code = line.split(';', 1)[0].strip()
+    if not code or code.endswith(':'):
+        return None
+
+    # Strip a leading label ("cr: inc bx")
+    if ':' in code.split()[0]:
+        code = code.split(':', 1)[1].strip()
+        if not code:
+            return None
+
+    parts = code.split(None, 1)
+    mnemonic = parts[0].lower()
+    if mnemonic in DIRECTIVES or (len(parts) > 1 and parts[1].split()[0].lower() in DIRECTIVES):
+        return None
+
+    operands = [op.strip() for op in parts[1].split(',')] if len(parts) > 1 else []
+    return mnemonic, operands
+
+
+def operand_kind(operand: str) -> str:
+    """Classify an operand as 'reg', 'seg', 'imm' or 'mem'."""
+    lowered = operand.lower()
+    if lowered in REGISTERS:
+        return 'reg'
+    if lowered in SEGMENT_REGISTERS:
+        return 'seg'
+    if lowered.startswith('offset') or re.fullmatch(r'-?\d+|[0-9][0-9a-f]*h', lowered) \
+            or _CHARACTER.match(operand):
+        return 'imm'
+    return 'mem'
+
+
+def effective_address_cycles(operand: str) -> int:
+    """EA calculation time: direct 6, register indirect 5, indirect + displacement 9."""
+    match = _MEMORY_OPERAND.search(operand)
+    if not match:
+        return 6
+    inner = match.group(1).replace(' ', '').lower()
+    if inner in REGISTERS:
+        return 5
+    return 9
+
+
+def instruction_cycles(line: str) -> int:
+    """
+    Estimate the cycles taken by one assembly line.
+
+    Args:
+        line: Assembly source line
+
+    Returns:
+        Estimated 8086 clock cycles (0 for labels, directives and data)
+    """
+    parsed = split_instruction(line)
+    if parsed is None:
+        return 0
+    mnemonic, operands = parsed
+
+    if mnemonic in BRANCH_CYCLES:
+        return BRANCH_CYCLES[mnemonic]
+    if mnemonic.startswith('j'):
+        return CONDITIONAL_JUMP_CYCLES
+
+    kinds = [operand_kind(op) for op in operands]
+    memory_cost = sum(effective_address_cycles(op) for op, kind in zip(operands, kinds) if kind == 'mem')
+
+    if mnemonic == 'mov' and len(kinds) == 2:
+        accumulator = {operands[0].lower(), operands[1].lower()} & {'ax', 'al'}
+        if accumulator and 'mem' in kinds and not _MEMORY_OPERAND.search(''.join(operands)):
+            return ACCUMULATOR_MOVE_CYCLES
+        return CYCLE_TABLE.get(('mov', kinds[0], kinds[1]), 8) + memory_cost
+
+    if mnemonic in ALU_MNEMONICS and len(kinds) == 2:
+        return CYCLE_TABLE.get(('alu', kinds[0], kinds[1]), 4) + memory_cost
+
+    if mnemonic in SHIFT_MNEMONICS and len(kinds) == 2:
+        if operands[1].lower() == 'cl':
+            return CYCLE_TABLE[('shift', kinds[0], 'cl')] + memory_cost
+        count = int(operands[1]) if operands[1].isdigit() else 1
+        return CYCLE_TABLE[('shift', kinds[0], 'one')] * count + memory_cost
+
+    if mnemonic in UNARY_MNEMONICS and kinds:
+        return CYCLE_TABLE[('unary', kinds[0], None)] + memory_cost
+    if mnemonic in ('inc', 'dec') and kinds:
+        return CYCLE_TABLE[('incdec', kinds[0], None)] + memory_cost
+    if mnemonic in ('mul', 'imul') and kinds:
+        return CYCLE_TABLE[('mul', kinds[0], None)] + memory_cost
+    if mnemonic in ('div', 'idiv') and kinds:
+        return CYCLE_TABLE[('div', kinds[0], None)] + memory_cost
+    if mnemonic == 'lea':
+        return CYCLE_TABLE[('lea', 'reg', 'mem')] + memory_cost
+    if mnemonic in ('push', 'pop') and kinds:
+        return CYCLE_TABLE.get((mnemonic, kinds[0], None), 11) + memory_cost
+
+    return 4
+
+
+def displacement_size(operand: str) -> int:
+    """Displacement bytes of a memory operand: direct 2, [reg] 0, [reg+d8] 1, otherwise 2."""
+    match = _MEMORY_OPERAND.search(operand)
+    if not match:
+        return 2
+    if operand.split('[', 1)[0].strip().lower() not in ('', 'byte ptr', 'word ptr'):
+        return 2
+    inner = match.group(1).replace(' ', '').lower()
+    if inner in REGISTERS:
+        return 0
+    displacement = re.split(r'[+-]', inner, 1)[1] if re.search(r'[+-]', inner) else ''
+    return 1 if displacement.isdigit() and int(displacement) < 128 else 2
+
+
+def immediate_size(byte_sized: bool) -> int:
+    """Immediate bytes: 1 for byte operations, otherwise 2."""
+    return 1 if byte_sized else 2
+
+
+def _is_byte_operation(operands: list) -> bool:
+    """True when an operand fixes the operation size to 8 bits."""
+    return any(op.lower() in BYTE_REGISTERS or op.lower().startswith('byte ptr') for op in operands)
+
+
+def _fits_signed_byte(operand: str) -> bool:
+    """True for immediates the sign-extended imm8 ALU form can encode (0FF80h-0FFFFh included)."""
+    lowered = operand.lower()
+    if _CHARACTER.match(operand):
+        return True
+    if re.fullmatch(r'-?\d+', lowered):
+        value = int(lowered)
+    elif re.fullmatch(r'[0-9][0-9a-f]*h', lowered):
+        value = int(lowered[:-1], 16)
+    else:
+        return False
+    return -128 <= value <= 127 or 0xFF80 <= value <= 0xFFFF
+
+
+def instruction_size(line: str) -> int:
+    """
+    Estimate the encoded size of one assembly line.
+
+    Args:
+        line: Assembly source line
+
+    Returns:
+        Size in bytes (0 for labels, directives and data)
+    """
+    parsed = split_instruction(line)
+    if parsed is None:
+        return 0
+    mnemonic, operands = parsed
+
+    if mnemonic in FIXED_SIZES:
+        return FIXED_SIZES[mnemonic]
+    if mnemonic.startswith('j'):
+        return CONDITIONAL_JUMP_SIZE
+
+    kinds = [operand_kind(op) for op in operands]
+    displacement = sum(displacement_size(op) for op, kind in zip(operands, kinds) if kind == 'mem')
+    byte_sized = _is_byte_operation(operands)
+
+    if mnemonic == 'mov' and len(kinds) == 2:
+        if kinds[1] == 'imm':
+            if kinds[0] == 'mem':
+                return 2 + displacement + immediate_size(byte_sized)
+            return 1 + immediate_size(byte_sized)
+        accumulator = {operands[0].lower(), operands[1].lower()} & {'ax', 'al'}
+        if accumulator and 'mem' in kinds and not _MEMORY_OPERAND.search(''.join(operands)):
+            return 3
+        return 2 + displacement
+
+    if mnemonic in ALU_MNEMONICS and len(kinds) == 2:
+        if kinds[1] == 'imm':
+            if operands[0].lower() in ('al', 'ax'):
+                return 1 + immediate_size(byte_sized)
+            short = byte_sized or (mnemonic != 'test' and _fits_signed_byte(operands[1]))
+            return 2 + displacement + (1 if short else 2)
+        return 2 + displacement
+
+    if mnemonic in SHIFT_MNEMONICS and len(kinds) == 2:
+        count = int(operands[1]) if operands[1].isdigit() else 1
+        return (2 + displacement) * count
+
+    if mnemonic in ('inc', 'dec') and kinds == ['reg'] and not byte_sized:
+        return 1
+    if mnemonic in ('push', 'pop') and kinds and kinds[0] in ('reg', 'seg'):
+        return 1
+    if mnemonic == 'xchg' and 'ax' in (op.lower() for op in operands) and kinds == ['reg', 'reg']:
+        return 1
+
+    return 2 + displacement
+
+
+def data_size(line: str) -> int:
+    """
+    Size in bytes of a DB/DW data definition.
+
+    Args:
+        line: Assembly source line
+
+    Returns:
+        Bytes reserved by the definition (0 for anything else)
+    """
+    code = _strip_comment(line).strip()
+    words = code.split(None, 2)
+    if words and words[0].lower() in ('db', 'dw'):
+        directive, items = words[0].lower(), code.split(None, 1)[1] if len(words) > 1 else ''
+    elif len(words) == 3 and words[1].lower() in ('db', 'dw'):
+        directive, items = words[1].lower(), words[2]
+    else:
+        return 0
+
+    element = 1 if directive == 'db' else 2
+    return sum(_data_item_size(item, element) for item in _split_data_items(items))
+
+
+def _data_item_size(item: str, element: int) -> int:
+    """Size of one data item: a string, 'N dup(x)' or a single element."""
+    match = re.fullmatch(r'(\d+)\s+dup\s*\((.*)\)', item, re.IGNORECASE)
+    if match:
+        return int(match.group(1)) * sum(_data_item_size(inner, element)
+                                         for inner in _split_data_items(match.group(2)))
+    if len(item) >= 2 and item[0] in ('"', "'") and item[-1] == item[0] and element == 1:
+        return len(item) - 2
+    return element
+
+
+def _strip_comment(line: str) -> str:
+    """Remove a ';' comment, ignoring semicolons inside quotes."""
+    quote = None
+    for index, char in enumerate(line):
+        if quote:
+            quote = None if char == quote else quote
+        elif char in ('"', "'"):
+            quote = char
+        elif char == ';':
+            return line[:index]
+    return line
+
+
+def _split_data_items(text: str) -> list:
+    """Split data items on commas outside quotes and parentheses."""
+    items, current, quote, depth = [], '', None, 0
+    for char in text:
+        if quote:
+            quote = None if char == quote else quote
+        elif char in ('"', "'"):
+            quote = char
+        elif char in '()':
+            depth += 1 if char == '(' else -1
+        elif char == ',' and depth == 0:
+            items.append(current.strip())
+            current = ''
+            continue
+        current += char
+    if current.strip():
+        items.append(current.strip())
+    return items
+
+
+def estimate_size(lines: Iterable[str]) -> int:
+    """
+    Estimate the code size of a sequence of assembly lines.
+
+    Args:
+        lines: Assembly source lines
+
+    Returns:
+        Sum of the per-instruction sizes in bytes
+    """
+    return sum(instruction_size(line) for line in lines)
+
+
+def estimate_cycles(lines: Iterable[str]) -> int:
+    """
+    Estimate the cycles of a straight-line sequence of assembly lines.
+
+    Args:
+        lines: Assembly source lines
+
+    Returns:
+        Sum of the per-instruction estimates
+    """
+    return sum(instruction_cycles(line) for line in lines)
+
+
+if __name__ == "__main__":
+    # Example usage
+    sample = [
+        '        mov ax, x',
+        '        mov bx, 10',
+        '        mul bx',
+        '        mov t1, ax',
+    ]
+
+    for line in sample:
+        print(f"{line.strip():20} {instruction_size(line):2} bytes {instruction_cycles(line):4} cycles")
+    print(f"{'total':20} {estimate_size(sample):2} bytes {estimate_cycles(sample):4} cycles")
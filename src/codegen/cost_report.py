@@ -0,0 +1,197 @@
+"""
+Static Cost Report
+
+This module annotates generated assembly with per-instruction byte sizes
+and 8086 cycle estimates from the cost model, and aggregates them per
+source line and per statement kind (arithmetic, assignment, control, print,
+read).
+The report is a cheap way to spot expensive constructs without running
+the program.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Iterable, Tuple
+
+from .cost_model import instruction_size, instruction_cycles, data_size
+
+
+ARITHMETIC_OPERATORS = {'+', '-', '*', '/'}
+CONTROL_OPERATORS = {'label', 'goto', 'j<', 'j<=', 'j>', 'j>=', 'j==', 'j!='}
+
+# Statement kinds in reporting order
+STATEMENT_KINDS = ('arithmetic', 'assignment', 'control', 'print', 'read')
+
+
+@dataclass
+class InstructionCost:
+    """Size and cycle estimate of one assembly instruction."""
+    text: str
+    size: int
+    cycles: int
+
+
+@dataclass
+class StatementCost:
+    """Instructions generated for one source statement."""
+    line: Optional[int]
+    kind: str
+    instructions: List[InstructionCost] = field(default_factory=list)
+    operators: List[str] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        """Encoded size in bytes."""
+        return sum(instruction.size for instruction in self.instructions)
+
+    @property
+    def cycles(self) -> int:
+        """Estimated cycles."""
+        return sum(instruction.cycles for instruction in self.instructions)
+
+
+def annotate(lines: Iterable[str]) -> List[InstructionCost]:
+    """
+    Attach size and cycle estimates to assembly lines.
+
+    Args:
+        lines: Assembly source lines
+
+    Returns:
+        One InstructionCost per instruction (labels, blanks and directives are skipped)
+    """
+    annotated = []
+    for line in lines:
+        size = instruction_size(line)
+        if size:
+            annotated.append(InstructionCost(line.strip(), size, instruction_cycles(line)))
+    return annotated
+
+
+def statement_kind(operators: Iterable[str]) -> str:
+    """Classify a statement by the quadruple operators it produced."""
+    operators = set(operators)
+    if 'read' in operators:
+        return 'read'
+    if 'print' in operators:
+        return 'print'
+    if operators & CONTROL_OPERATORS:
+        return 'control'
+    if operators & ARITHMETIC_OPERATORS:
+        return 'arithmetic'
+    return 'assignment'
+
+
+@dataclass
+class CostReport:
+    """Static size and cycle estimates of a generated program."""
+    name: str = ""
+    statements: List[StatementCost] = field(default_factory=list)
+    routines: Dict[str, List[InstructionCost]] = field(default_factory=dict)
+    program: List[InstructionCost] = field(default_factory=list)
+    data_size: int = 0
+
+    def add_statement_code(self, line: Optional[int], operator: str, asm_lines: Iterable[str]):
+        """
+        Record the code generated for one quadruple.
+
+        Consecutive quadruples from the same source line form one statement;
+        quadruples without line information are reported individually.
+
+        Args:
+            line: Source line of the quadruple, or None if unknown
+            operator: Quadruple operator
+            asm_lines: Assembly lines generated for the quadruple
+        """
+        if not (self.statements and line is not None and self.statements[-1].line == line):
+            self.statements.append(StatementCost(line, ''))
+        statement = self.statements[-1]
+        statement.operators.append(operator)
+        statement.kind = statement_kind(statement.operators)
+        statement.instructions.extend(annotate(asm_lines))
+
+    def add_routine(self, name: str, asm_lines: Iterable[str]):
+        """Record the body of a runtime routine."""
+        self.routines[name] = annotate(asm_lines)
+
+    def add_program_lines(self, asm_lines: Iterable[str]):
+        """Record template code outside the generated sections (entry and exit)."""
+        self.program.extend(annotate(asm_lines))
+
+    def add_data_lines(self, asm_lines: Iterable[str]):
+        """Record data segment definitions."""
+        self.data_size += sum(data_size(line) for line in asm_lines)
+
+    def by_line(self) -> List[Tuple[Optional[int], str, int, int, int]]:
+        """Return (line, kind, instructions, bytes, cycles) per statement."""
+        return [(s.line, s.kind, len(s.instructions), s.size, s.cycles) for s in self.statements]
+
+    def by_kind(self) -> Dict[str, Tuple[int, int, int, int]]:
+        """Return (statements, instructions, bytes, cycles) per statement kind."""
+        totals: Dict[str, List[int]] = {}
+        for statement in self.statements:
+            entry = totals.setdefault(statement.kind, [0, 0, 0, 0])
+            entry[0] += 1
+            entry[1] += len(statement.instructions)
+            entry[2] += statement.size
+            entry[3] += statement.cycles
+        return {kind: tuple(totals[kind]) for kind in STATEMENT_KINDS if kind in totals}
+
+    @property
+    def statement_size(self) -> int:
+        """Bytes of code generated for source statements."""
+        return sum(statement.size for statement in self.statements)
+
+    @property
+    def runtime_size(self) -> int:
+        """Bytes of the runtime routines."""
+        return sum(i.size for body in self.routines.values() for i in body)
+
+    @property
+    def code_size(self) -> int:
+        """Total bytes of code."""
+        return self.statement_size + self.runtime_size + sum(i.size for i in self.program)
+
+    def format(self) -> str:
+        """Render the report as text."""
+        out = [f"Cost report: {self.name}" if self.name else "Cost report", ""]
+        out.append("Static estimates: every instruction is counted once and conditional jumps as taken.")
+        out.append("Statement costs include the call to a runtime routine but not its body.")
+
+        out += ["", "Per source line", f"  {'Line':>5}  {'Kind':<11} {'Instr':>5} {'Bytes':>6} {'Cycles':>7}"]
+        for line, kind, count, size, cycles in self.by_line():
+            label = str(line) if line is not None else '-'
+            out.append(f"  {label:>5}  {kind:<11} {count:>5} {size:>6} {cycles:>7}")
+
+        out += ["", "Per statement kind", f"  {'Kind':<11} {'Stmts':>5} {'Instr':>5} {'Bytes':>6} {'Cycles':>7}"]
+        for kind, (statements, count, size, cycles) in self.by_kind().items():
+            out.append(f"  {kind:<11} {statements:>5} {count:>5} {size:>6} {cycles:>7}")
+
+        out += ["", "Runtime routines", f"  {'Routine':<11} {'Instr':>5} {'Bytes':>6} {'Cycles':>7}"]
+        for name, body in self.routines.items():
+            out.append(f"  {name:<11} {len(body):>5} {sum(i.size for i in body):>6} "
+                       f"{sum(i.cycles for i in body):>7}")
+
+        program_size = sum(i.size for i in self.program)
+        out += ["", "Totals",
+                f"  Code bytes: {self.code_size} (statements {self.statement_size}, "
+                f"runtime {self.runtime_size}, entry/exit {program_size})",
+                f"  Data bytes: {self.data_size}",
+                f"  Statement cycles: {sum(s.cycles for s in self.statements)}"]
+
+        out += ["", "Annotated listing"]
+        for statement in self.statements:
+            label = f"line {statement.line}" if statement.line is not None else "quadruple"
+            out.append(f"  ; {label} ({statement.kind}): {statement.size} bytes, {statement.cycles} cycles")
+            for instruction in statement.instructions:
+                out.append(f"        {instruction.text:<32} ; {instruction.size:>2} bytes {instruction.cycles:>4} cycles")
+        return '\n'.join(out) + '\n'
+
+
+if __name__ == "__main__":
+    # Example usage
+    report = CostReport("example.asm")
+    report.add_statement_code(3, '*', ['        mov ax, x', '        shl ax, 1', '        mov t1, ax'])
+    report.add_statement_code(3, '=', ['        mov ax, t1', '        mov result, ax'])
+    report.add_statement_code(4, 'print', ['        mov ax, result', '        call _todec'])
+    report.add_data_lines(['        x DW 5', '        result DW 0', '        t1 DW ?'])
+    print(report.format())
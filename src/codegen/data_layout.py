@@ -0,0 +1,170 @@
+"""
+Data Segment Layout
+
+This module assigns storage to program variables by type:
+- int: one word (DW)
+- boolean: one byte (DB), or one bit of a shared flag word when packing is enabled
+- str: the text with a '$' terminator (DB), or a DOS input buffer when it
+  has no initial value
+
+Declarations are emitted words first so every word starts at an even
+offset; on the 8086 a word access at an odd address takes an extra bus
+cycle.
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Tuple
+
+
+# Flags packed into one word
+FLAG_WORD_BITS = 16
+
+# Prefix of the packed flag words; user identifiers cannot start with '_'
+FLAG_WORD_PREFIX = '_flags'
+
+# Size of the DOS input buffer laid out for strings without a value
+INPUT_BUFFER_SIZE = 20
+
+
+@dataclass
+class Storage:
+    """Where one variable lives in the data segment."""
+    name: str
+    data_type: str
+    label: str
+    size: int
+    bit: Optional[int] = None
+
+    @property
+    def is_byte(self) -> bool:
+        """Whether the variable is a whole byte."""
+        return self.size == 1 and self.bit is None
+
+    @property
+    def is_bit(self) -> bool:
+        """Whether the variable is one bit of a packed flag word."""
+        return self.bit is not None
+
+    @property
+    def mask(self) -> int:
+        """Bit mask of a packed flag within its word."""
+        return 1 << self.bit if self.bit is not None else 0
+
+
+class DataLayout:
+    """
+    Storage assignment for the variables of one program.
+    """
+
+    def __init__(self, pack_booleans: bool = False):
+        """
+        Initialize an empty layout.
+
+        Args:
+            pack_booleans: Store booleans as bits of shared flag words instead of bytes
+        """
+        self.pack_booleans = pack_booleans
+        self.storage: Dict[str, Storage] = {}
+        self.words: List[Tuple[str, int]] = []
+        self.bytes: List[str] = []
+        self.flag_words: List[List[Tuple[int, bool]]] = []
+
+    def add_variable(self, name: str, data_type: str, value: Any):
+        """
+        Assign storage to a variable.
+
+        Args:
+            name: Variable name
+            data_type: 'int', 'boolean' or 'str'
+            value: Initial value
+        """
+        if data_type == "int":
+            self.storage[name] = Storage(name, data_type, name, 2)
+            self.words.append((name, int(value)))
+        elif data_type == "boolean" and self.pack_booleans:
+            if not self.flag_words or len(self.flag_words[-1]) == FLAG_WORD_BITS:
+                self.flag_words.append([])
+            bit = len(self.flag_words[-1])
+            self.flag_words[-1].append((bit, bool(value)))
+            label = f"{FLAG_WORD_PREFIX}{len(self.flag_words)}"
+            self.storage[name] = Storage(name, data_type, label, 2, bit)
+        elif data_type == "boolean":
+            self.storage[name] = Storage(name, data_type, name, 1)
+            self.bytes.append(f"        {name} DB {1 if value else 0}")
+        elif data_type == "str":
+            if value and len(str(value)) > 0:
+                # Remove quotes if present
+                clean_value = str(value).strip('"')
+                self.storage[name] = Storage(name, data_type, name, len(clean_value) + 1)
+                self.bytes.append(f'        {name} DB "{clean_value}", "$"')
+            else:
+                self.storage[name] = Storage(name, data_type, name, INPUT_BUFFER_SIZE + 2)
+                self.bytes.append(f"        {name} db {INPUT_BUFFER_SIZE},?,{INPUT_BUFFER_SIZE} dup(?)")
+
+    def get(self, name: str) -> Optional[Storage]:
+        """Return the storage of a variable, or None if it has none."""
+        return self.storage.get(name)
+
+    def iter_word_lines(self) -> Iterator[str]:
+        """Yield the word declarations: int variables, then packed flag words."""
+        for name, value in self.words:
+            yield f"        {name} DW {value}"
+        for number, flags in enumerate(self.flag_words, 1):
+            initial = sum(1 << bit for bit, value in flags if value)
+            yield f"        {FLAG_WORD_PREFIX}{number} DW {initial}"
+
+    def iter_byte_lines(self) -> Iterator[str]:
+        """Yield the byte declarations: booleans and strings."""
+        yield from self.bytes
+
+    @property
+    def size(self) -> int:
+        """Bytes of variable storage."""
+        return 2 * (len(self.words) + len(self.flag_words)) + sum(
+            storage.size for storage in self.storage.values() if storage.data_type != "int" and not storage.is_bit)
+
+
+def is_word_declaration(line: str) -> bool:
+    """Check whether a data line declares words (DW)."""
+    parts = line.split()
+    return len(parts) > 1 and parts[1].lower() == 'dw'
+
+
+def order_for_alignment(lines: Iterable[str]) -> List[str]:
+    """Move word declarations in front of byte declarations, keeping their relative order."""
+    lines = list(lines)
+    return [line for line in lines if is_word_declaration(line)] + \
+           [line for line in lines if not is_word_declaration(line)]
+
+
+def layout_variables(symbol_table: List[Any], pack_booleans: bool = False) -> DataLayout:
+    """
+    Convenience function laying out every variable of a symbol table.
+
+    Args:
+        symbol_table: Symbol table from lexical analyzer
+        pack_booleans: Store booleans as bits of shared flag words
+
+    Returns:
+        DataLayout of the variables
+    """
+    layout = DataLayout(pack_booleans)
+    for symbol in symbol_table:
+        if hasattr(symbol, 'name'):
+            data_type = symbol.data_type.value if hasattr(symbol.data_type, 'value') else symbol.data_type
+            layout.add_variable(symbol.name, data_type, symbol.value)
+        else:
+            layout.add_variable(symbol[0], symbol[1], symbol[2])
+    return layout
+
+
+if __name__ == "__main__":
+    # Example usage
+    symbols = [['done', 'boolean', False], ['count', 'int', 3], ['name', 'str', '"abc"'],
+               ['ready', 'boolean', True], ['line', 'str', '']]
+
+    for pack in (False, True):
+        layout = layout_variables(symbols, pack)
+        print(f"pack_booleans={pack}: {layout.size} bytes")
+        for line in list(layout.iter_word_lines()) + list(layout.iter_byte_lines()):
+            print(line)
@@ -0,0 +1,255 @@
+"""
+Instruction Selection
+
+This module supports tree-pattern instruction selection for integer
+expressions. The lexical analyzer breaks every expression into one
+quadruple per operator, linked by temporaries; a temporary that is
+defined and used exactly once in straight-line code is folded back into
+the expression tree of its use, so the generator can cover whole trees
+with 8086 instruction patterns (tiles) instead of translating each
+quadruple through AX, BX and a temporary slot.
+
+Selection is maximal munch guided by the cost model: at each node every
+tile that matches is costed (a store together with its operation, an
+operation together with an immediate or memory operand, a plain register
+operation) and the covering with the fewest cycles, then bytes, wins.
+
+Tile operands: d destination word, c immediate, m word in memory,
+r register (BX) loaded from a byte, flag or subexpression, e the
+subexpression already in AX.
+"""
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Set, Tuple
+
+from .cost_model import estimate_cycles, estimate_size
+
+
+ARITHMETIC_OPERATORS = {'+', '-', '*', '/'}
+COMMUTATIVE_OPERATORS = {'+', '*'}
+
+# Quadruples whose operands may be folded expression trees
+FOLDING_USERS = ARITHMETIC_OPERATORS | {'='}
+
+TEMP_PATTERN = re.compile(r'_t\d+$')
+
+
+@dataclass(frozen=True)
+class Tile:
+    """An instruction pattern covering part of an expression tree."""
+    name: str
+    pattern: str
+    template: Tuple[str, ...] = ()
+
+    def emit(self, **operands: str) -> List[str]:
+        """Instantiate the template with the matched operands."""
+        return ['        ' + line.format(**operands) for line in self.template]
+
+
+# Tiles without a template produce operand-dependent code in the generator
+TILES: Dict[str, Tile] = {tile.name: tile for tile in (
+    # Statements: the store is covered together with the operation
+    Tile('store-imm', 'd = c', ('mov {d}, {c}',)),
+    Tile('inc-mem', 'd = d + 1', ('inc {d}',)),
+    Tile('dec-mem', 'd = d - 1', ('dec {d}',)),
+    Tile('add-mem-imm', 'd = d + c', ('add {d}, {c}',)),
+    Tile('sub-mem-imm', 'd = d - c', ('sub {d}, {c}',)),
+    Tile('add-mem-reg', 'd = d + e', ('add {d}, ax',)),
+    Tile('sub-mem-reg', 'd = d - e', ('sub {d}, ax',)),
+    Tile('store', 'd = e', ('mov {d}, ax',)),
+    Tile('store-narrow', 'd = e (byte or flag d)'),
+    # Leaves
+    Tile('zero', '0', ('xor {r}, {r}',)),
+    Tile('load-imm', 'c', ('mov {r}, {c}',)),
+    Tile('load-mem', 'm', ('mov {r}, {m}',)),
+    Tile('load-widen', 'byte or flag'),
+    Tile('move-bx', 'r = e', ('mov bx, ax',)),
+    # Operations with an immediate or memory operand
+    Tile('inc', 'e + 1', ('inc ax',)),
+    Tile('dec', 'e - 1', ('dec ax',)),
+    Tile('add-imm', 'e + c', ('add ax, {c}',)),
+    Tile('sub-imm', 'e - c', ('sub ax, {c}',)),
+    Tile('add-mem', 'e + m', ('add ax, {m}',)),
+    Tile('sub-mem', 'e - m', ('sub ax, {m}',)),
+    Tile('mul-mem', 'e * m', ('mul {m}',)),
+    Tile('div-mem', 'e / m', ('xor dx, dx', 'div {m}')),
+    Tile('mul-shift', 'e * c (shifts and add/sub)'),
+    Tile('div-shift', 'e / 2^k (shifts)'),
+    # Register operations
+    Tile('add-reg', 'e + r', ('add ax, bx',)),
+    Tile('sub-reg', 'e - r', ('sub ax, bx',)),
+    Tile('mul-reg', 'e * r', ('mul bx',)),
+    Tile('div-reg', 'e / r', ('xor dx, dx', 'div bx')),
+)}
+
+
+@dataclass
+class ExpressionNode:
+    """A leaf operand, or an arithmetic operator with two subtrees."""
+    operator: Optional[str] = None
+    operand: str = ''
+    left: Optional['ExpressionNode'] = None
+    right: Optional['ExpressionNode'] = None
+
+    @property
+    def is_leaf(self) -> bool:
+        """Whether the node is a single operand."""
+        return self.operator is None
+
+    def __str__(self) -> str:
+        if self.is_leaf:
+            return self.operand
+        left = str(self.left) if self.left.is_leaf else f"({self.left})"
+        right = str(self.right) if self.right.is_leaf else f"({self.right})"
+        return f"{left} {self.operator} {right}"
+
+
+@dataclass
+class TileSelection:
+    """The tiles chosen for one statement and the code they produced."""
+    line: Optional[int]
+    statement: str
+    tiles: List[str] = field(default_factory=list)
+    code: List[str] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        """Encoded size of the statement's code in bytes."""
+        return estimate_size(self.code)
+
+    @property
+    def cycles(self) -> int:
+        """Estimated cycles of the statement's code."""
+        return estimate_cycles(self.code)
+
+
+def find_foldable_temporaries(quadruples: List[Any], temporaries: Optional[Set[str]] = None) -> Dict[str, int]:
+    """
+    Find the temporaries that can be evaluated inside the expression using them.
+
+    A temporary qualifies when an arithmetic quadruple defines it, exactly
+    one later arithmetic or assignment quadruple reads it, and only
+    computations that leave its inputs unchanged lie in between. When both
+    operands of a quadruple qualify, the left one stays in memory so the
+    right subtree can be evaluated in AX without spilling.
+
+    Args:
+        quadruples: Quadruple intermediate code
+        temporaries: Names of the temporaries (defaults to names of the form _t<n>)
+
+    Returns:
+        Temporary name to the index of the quadruple at which its expression is evaluated
+    """
+    is_temp = temporaries.__contains__ if temporaries is not None else _is_temp
+    definitions: Dict[str, int] = {}
+    definition_count = Counter()
+    uses: Dict[str, List[int]] = {}
+    for index, quad in enumerate(quadruples):
+        operator, operand1, operand2, result = _unpack(quad)
+        for operand in (operand1, operand2):
+            if is_temp(operand):
+                uses.setdefault(operand, []).append(index)
+        if is_temp(result) and operator != 'label':
+            definition_count[result] += 1
+            if operator in ARITHMETIC_OPERATORS:
+                definitions[result] = index
+
+    user: Dict[str, int] = {}
+    for temp, index in definitions.items():
+        temp_uses = uses.get(temp, [])
+        if definition_count[temp] == 1 and len(temp_uses) == 1 and temp_uses[0] > index \
+                and _unpack(quadruples[temp_uses[0]])[0] in FOLDING_USERS:
+            user[temp] = temp_uses[0]
+
+    for temp, use in list(user.items()):
+        _, operand1, operand2, _ = _unpack(quadruples[use])
+        if temp == operand1 and operand2 in user:
+            del user[temp]
+
+    # The values an expression reads must not change before it is evaluated
+    leaves: Dict[str, Set[str]] = {}
+    for temp in sorted(user, key=definitions.get):
+        _, operand1, operand2, _ = _unpack(quadruples[definitions[temp]])
+        leaves[temp] = set()
+        for operand in (operand1, operand2):
+            leaves[temp] |= leaves[operand] if operand in user else {operand}
+        for quad in quadruples[definitions[temp] + 1:user[temp]]:
+            operator, _, _, result = _unpack(quad)
+            if operator not in FOLDING_USERS or result in leaves[temp]:
+                del user[temp]
+                break
+
+    def evaluation_point(temp: str) -> int:
+        result = _unpack(quadruples[user[temp]])[3]
+        return evaluation_point(result) if result in user else user[temp]
+
+    return {temp: evaluation_point(temp) for temp in user}
+
+
+def tile_cost_table() -> List[Tuple[str, str, Optional[int], Optional[int]]]:
+    """
+    Size and cycles of every fixed tile, with sample operands.
+
+    Returns:
+        (name, pattern, bytes, cycles) per tile; None for operand-dependent tiles
+    """
+    sample = {'d': 'x', 'c': '5', 'm': 'y', 'r': 'ax'}
+    table = []
+    for tile in TILES.values():
+        if tile.template:
+            code = tile.emit(**sample)
+            table.append((tile.name, tile.pattern, estimate_size(code), estimate_cycles(code)))
+        else:
+            table.append((tile.name, tile.pattern, None, None))
+    return table
+
+
+def format_tile_listing(selections: List[TileSelection]) -> str:
+    """
+    Render the tile cost table and the tiles chosen per statement.
+
+    Args:
+        selections: Tile selections in program order
+
+    Returns:
+        Listing text
+    """
+    out = ["Tile costs (sample operands)"]
+    for name, pattern, size, cycles in tile_cost_table():
+        cost = f"{size:>2} bytes {cycles:>4} cycles" if size is not None else "operand-dependent"
+        out.append(f"  {name:<13} {pattern:<30} {cost}")
+
+    out += ["", "Selected tiles"]
+    for selection in selections:
+        label = f"line {selection.line}" if selection.line is not None else "quadruple"
+        out.append(f"  ; {label}: {selection.statement}  [{', '.join(selection.tiles)}] "
+                   f"{selection.size} bytes, {selection.cycles} cycles")
+        out.extend(f"    {line.strip()}" for line in selection.code if line.strip())
+    return '\n'.join(out) + '\n'
+
+
+def _unpack(quad: Any) -> Tuple[str, str, str, str]:
+    """Return (operator, operand1, operand2, result) for either quadruple format."""
+    if hasattr(quad, 'operator'):
+        return quad.operator, quad.operand1, quad.operand2, quad.result
+    return quad[0], quad[1], quad[2], quad[3]
+
+
+def _is_temp(name: str) -> bool:
+    """Check whether an operand names a compiler-generated temporary."""
+    return bool(name) and TEMP_PATTERN.match(name) is not None
+
+
+if __name__ == "__main__":
+    # Example usage: result = (a + b) * (c - 1)
+    sample = [
+        ['+', 'a', 'b', '_t1'],
+        ['-', 'c', '1', '_t2'],
+        ['*', '_t1', '_t2', '_t3'],
+        ['=', '_t3', '', 'result'],
+    ]
+
+    print(find_foldable_temporaries(sample))
+    print(format_tile_listing([]))
@@ -0,0 +1,308 @@
+"""
+Procedural Abstraction
+
+This module shrinks generated assembly by outlining instruction sequences
+that occur several times in the entry procedure into near subroutines:
+
+    mov ax, z            call _P1
+    call _todec   ->     ...
+    ...                  call _P1
+    mov ax, z
+    call _todec          _P1 proc near
+                                 mov ax, z
+                                 call _todec
+                                 ret
+                         _P1 endp
+
+Candidate sequences are found by hashing windows of straight-line
+instructions, extending only windows whose prefix repeats; the one with
+the largest byte saving (by the cost model's instruction sizes) is
+outlined first, and the search repeats until no repeat pays for its call
+and return. Each call adds a call/ret pair at
+run time, so outlining trades cycles for size.
+
+Sequences never contain labels, jumps, returns, references to SP or BP,
+or a pop of a value pushed outside the sequence, so moving them into a
+subroutine cannot change control flow or what they see on the stack.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Dict, Optional, Tuple
+
+from .cost_model import FIXED_SIZES, split_instruction, instruction_size, estimate_size
+
+
+# Prefix of outlined routines; user identifiers cannot start with '_'
+OUTLINED_PREFIX = '_P'
+
+# Instructions per outlined sequence
+MIN_SEQUENCE_LENGTH = 2
+MAX_SEQUENCE_LENGTH = 32
+
+CALL_SIZE = FIXED_SIZES['call']
+RET_SIZE = FIXED_SIZES['ret']
+
+# Instructions that transfer control and end a straight-line run
+CONTROL_MNEMONICS = {'ret', 'retf', 'retn', 'iret', 'loop', 'loope', 'loopne', 'loopz', 'loopnz'}
+
+STACK_DEPTH_CHANGES = {'push': 1, 'pushf': 1, 'pop': -1, 'popf': -1}
+
+_STACK_REGISTER = re.compile(r'\b(sp|bp)\b', re.IGNORECASE)
+_PROC_LINE = re.compile(r'^\s*(\S+)\s+proc\b', re.IGNORECASE)
+
+
+@dataclass(frozen=True)
+class _LineInfo:
+    """What the outliner needs to know about one line."""
+    blank: bool = False
+    movable: bool = False
+    size: int = 0
+    depth: int = 0
+
+
+@dataclass
+class OutlinedRoutine:
+    """One subroutine extracted from repeated code."""
+    name: str
+    body: List[str]
+    calls: int
+
+    @property
+    def size(self) -> int:
+        """Encoded size of the outlined sequence in bytes."""
+        return estimate_size(self.body)
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes saved: the removed copies minus the calls, the routine body and its ret."""
+        return self.calls * (self.size - CALL_SIZE) - self.size - RET_SIZE
+
+    def lines(self) -> List[str]:
+        """Assembly lines of the routine."""
+        return ([f"; Outlined from {self.calls} identical sequences",
+                 f"{self.name} proc near"]
+                + self.body
+                + ["        ret", f"{self.name} endp", ""])
+
+
+@dataclass
+class OutliningResult:
+    """Outcome of procedural abstraction over one program."""
+    lines: List[str]
+    routines: List[OutlinedRoutine] = field(default_factory=list)
+    size_before: int = 0
+    size_after: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        """Code bytes saved over the whole program."""
+        return self.size_before - self.size_after
+
+    def format(self) -> str:
+        """Render a short report of the outlined routines."""
+        report = [f"Procedural abstraction: {len(self.routines)} routines, "
+                  f"{self.size_before} -> {self.size_after} code bytes ({self.bytes_saved} saved)"]
+        for routine in self.routines:
+            report.append(f"  {routine.name}: {len(routine.body)} instructions, {routine.size} bytes, "
+                          f"{routine.calls} calls, {routine.bytes_saved} bytes saved")
+        return '\n'.join(report)
+
+
+def outline_code(lines: List[str], start_number: int = 1,
+                 max_length: int = MAX_SEQUENCE_LENGTH) -> Tuple[List[str], List[OutlinedRoutine]]:
+    """
+    Outline repeated instruction sequences of a procedure body.
+
+    Blank and comment-only lines inside an outlined sequence are dropped.
+
+    Args:
+        lines: Body lines of one procedure
+        start_number: Number of the first routine name (_P<n>)
+        max_length: Longest sequence considered, in instructions
+
+    Returns:
+        (rewritten body lines, outlined routines)
+    """
+    lines = list(lines)
+    routines = []
+    analysis: Dict[str, _LineInfo] = {}
+    while True:
+        windows = _best_candidate(lines, max_length, analysis)
+        if windows is None:
+            return lines, routines
+
+        name = f"{OUTLINED_PREFIX}{start_number + len(routines)}"
+        body = [lines[index] for index in windows[0] if _line_info(lines[index], analysis).movable]
+        routines.append(OutlinedRoutine(name, body, len(windows)))
+        for window in reversed(windows):
+            lines[window[0]:window[-1] + 1] = [f"        call {name}"]
+
+
+def outline_program(lines: List[str], max_length: int = MAX_SEQUENCE_LENGTH) -> OutliningResult:
+    """
+    Apply procedural abstraction to the entry procedure of a program.
+
+    The outlined routines are placed right after the entry procedure.
+
+    Args:
+        lines: Assembly program lines
+        max_length: Longest sequence considered, in instructions
+
+    Returns:
+        OutliningResult with the rewritten program
+    """
+    lines = list(lines)
+    size_before = estimate_size(lines)
+
+    bounds = _entry_procedure(lines)
+    if bounds is None:
+        return OutliningResult(lines, [], size_before, size_before)
+    start, end = bounds
+
+    body, routines = outline_code(lines[start + 1:end], max_length=max_length)
+    routine_lines = [''] + [line for routine in routines for line in routine.lines()]
+    program = lines[:start + 1] + body + [lines[end]] + (routine_lines if routines else []) + lines[end + 1:]
+    return OutliningResult(program, routines, size_before, estimate_size(program))
+
+
+def _best_candidate(lines: List[str], max_length: int,
+                    analysis: Dict[str, _LineInfo]) -> Optional[List[List[int]]]:
+    """
+    Find the repeated sequence with the largest saving.
+
+    Windows are grown one instruction at a time, and only windows whose
+    shorter prefix repeats are extended. Each window is identified by the
+    pair (class of its prefix, next instruction), so classes are plain
+    integers and a window costs O(1) to classify regardless of its length.
+
+    Returns:
+        Line indices of the chosen non-overlapping occurrences, or None
+    """
+    flat: List[int] = []
+    run_ends: List[int] = []
+    for run in _straight_line_runs(lines, analysis):
+        flat.extend(run)
+        run_ends.extend([len(flat)] * len(run))
+
+    texts: Dict[str, int] = {}
+    codes = [texts.setdefault(lines[index].strip(), len(texts)) for index in flat]
+    sizes = [analysis[lines[index]].size for index in flat]
+    depths = [analysis[lines[index]].depth for index in flat]
+
+    # Class of each live window, and (size, stack depth, lowest depth) per class
+    classes = {position: code for position, code in enumerate(codes)}
+    info = {code: (sizes[position], depths[position], min(depths[position], 0))
+            for position, code in enumerate(codes)}
+    live = list(range(len(flat)))
+
+    best, best_saving = None, 0
+    for length in range(MIN_SEQUENCE_LENGTH, max_length + 1):
+        table: Dict[Tuple[int, int], int] = {}
+        groups: Dict[int, List[int]] = {}
+        next_classes: Dict[int, int] = {}
+        next_info: Dict[int, Tuple[int, int, int]] = {}
+        for position in live:
+            last = position + length - 1
+            if last >= run_ends[position]:
+                continue
+            key = (classes[position], codes[last])
+            cls = table.get(key)
+            if cls is None:
+                cls = table[key] = len(table)
+                size, depth, lowest = info[key[0]]
+                depth += depths[last]
+                next_info[cls] = (size + sizes[last], depth, min(lowest, depth))
+            next_classes[position] = cls
+            groups.setdefault(cls, []).append(position)
+
+        live = []
+        for cls, positions in groups.items():
+            if len(positions) < 2:
+                continue
+            live.extend(positions)
+            size, depth, lowest = next_info[cls]
+            if depth != 0 or lowest < 0:
+                continue
+            chosen = []
+            for position in positions:
+                if not chosen or position >= chosen[-1] + length:
+                    chosen.append(position)
+            saving = len(chosen) * (size - CALL_SIZE) - size - RET_SIZE
+            if saving > best_saving:
+                best_saving = saving
+                best = [flat[position:position + length] for position in chosen]
+        if not live:
+            break
+        live.sort()
+        classes, info = next_classes, next_info
+    return best
+
+
+def _straight_line_runs(lines: List[str], analysis: Dict[str, _LineInfo]) -> List[List[int]]:
+    """Split a body into runs of outlinable instruction indices."""
+    runs: List[List[int]] = [[]]
+    for index, line in enumerate(lines):
+        info = _line_info(line, analysis)
+        if info.movable:
+            runs[-1].append(index)
+        elif not info.blank and runs[-1]:
+            runs.append([])
+    return [run for run in runs if len(run) >= MIN_SEQUENCE_LENGTH]
+
+
+def _line_info(line: str, analysis: Dict[str, _LineInfo]) -> _LineInfo:
+    """Classify a line, reusing the result for lines seen before."""
+    info = analysis.get(line)
+    if info is None:
+        info = analysis[line] = _analyze_line(line)
+    return info
+
+
+def _analyze_line(line: str) -> _LineInfo:
+    """Classify one line as blank, a barrier, or an instruction that may be outlined."""
+    if not line.split(';', 1)[0].strip():
+        return _LineInfo(blank=True)
+    parsed = split_instruction(line)
+    if parsed is None:
+        return _LineInfo()
+    mnemonic, operands = parsed
+    if mnemonic.startswith('j') or mnemonic in CONTROL_MNEMONICS \
+            or any(_STACK_REGISTER.search(operand) for operand in operands):
+        return _LineInfo()
+    return _LineInfo(movable=True, size=instruction_size(line), depth=STACK_DEPTH_CHANGES.get(mnemonic, 0))
+
+
+def _entry_procedure(lines: List[str]) -> Optional[Tuple[int, int]]:
+    """Return the indices of the first procedure's proc and endp lines."""
+    for start, line in enumerate(lines):
+        match = _PROC_LINE.match(line)
+        if match:
+            name = match.group(1).lower()
+            for end in range(start + 1, len(lines)):
+                words = lines[end].split()
+                if len(words) >= 2 and words[0].lower() == name and words[1].lower() == 'endp':
+                    return start, end
+            return None
+    return None
+
+
+if __name__ == "__main__":
+    # Example usage
+    program = """p0      proc far
+        mov ax, x
+        call _todec
+        mov dx, offset _S1
+        call _printstr
+        mov ax, x
+        call _todec
+        mov dx, offset _S1
+        call _printstr
+        mov ax, x
+        call _todec
+        ret
+p0      endp""".splitlines()
+
+    result = outline_program(program)
+    print('\n'.join(result.lines))
+    print(result.format())
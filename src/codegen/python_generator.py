@@ -0,0 +1,501 @@
+"""
+Python Code Generator
+
+This module lowers the symbol table and quadruples into Python source,
+compiles it into a code object and runs it natively on CPython. Variables
+and temporaries become fast locals of a single function, and compiled code
+objects are cached per program hash so regression suites only pay for
+compilation once.
+
+Jumps are turned back into native if/else and while blocks; programs whose
+jumps do not nest that way run as a dispatch loop over their basic blocks.
+
+Semantics match the generated 8086 code and the bytecode VM: unsigned
+16-bit words, unsigned division, booleans as 0/1 and a newline echoed
+after every read.
+"""
+
+import sys
+import hashlib
+from collections import OrderedDict
+from types import CodeType
+from typing import List, Dict, Any, Optional, Tuple, Callable
+from dataclasses import dataclass
+
+
+# Unsigned 16-bit word arithmetic
+WORD_MASK = 0xFFFF
+
+# Input limits of the DOS buffers used by _readint/_readstr
+INT_INPUT_LIMIT = 5
+STR_INPUT_LIMIT = 19
+
+# Maximum number of compiled programs kept in memory
+CACHE_LIMIT = 256
+
+ENTRY_POINT = "automata_program"
+
+# Python operators for the relational jump quadruples
+RELATIONS = {'j<': '<', 'j<=': '<=', 'j>': '>', 'j>=': '>=', 'j==': '==', 'j!=': '!='}
+
+_code_cache: "OrderedDict[str, PythonProgram]" = OrderedDict()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+class PythonBackendError(Exception):
+    """Runtime error raised by a program executed on the Python backend."""
+    pass
+
+
+class _Unstructured(Exception):
+    """Raised when jumps cannot be expressed as nested if/while blocks."""
+    pass
+
+
+@dataclass
+class PythonProgram:
+    """A program compiled to a Python code object."""
+    program_hash: str
+    source: str
+    code: CodeType
+    function: Callable[..., Dict[str, Any]]
+
+    def run(self, io: Any = None) -> Dict[str, Any]:
+        """
+        Execute the program.
+
+        Args:
+            io: Object with read_line() and write(str); stdin/stdout if None
+
+        Returns:
+            Final values of the program variables
+        """
+        read_line = io.read_line if io else _console_read_line
+        write = io.write if io else sys.stdout.write
+
+        def read_int(current: int) -> int:
+            text = read_line()[:INT_INPUT_LIMIT]
+            write('\n')
+            if text.isdigit() and int(text) <= WORD_MASK:
+                return int(text)
+            return current
+
+        def read_str(current: str) -> str:
+            text = read_line()[:STR_INPUT_LIMIT]
+            write('\n')
+            return text
+
+        try:
+            return self.function(read_int, read_str, write)
+        except ZeroDivisionError:
+            raise PythonBackendError("Division by zero")
+
+
+class PythonGenerator:
+    """
+    Generates Python source and code objects from compiler intermediate representation.
+    """
+
+    ARITHMETIC_OPERATORS = {'+', '-', '*', '/'}
+
+    def __init__(self):
+        """Initialize the Python generator."""
+        self.types: Dict[str, str] = {}
+        self.label_index: Dict[str, int] = {}
+        self.jump_sources: Dict[str, List[int]] = {}
+
+    def generate_source(self, symbol_table: List[Any], quadruples: List[Any],
+                        number_table: List[Any] = None) -> str:
+        """
+        Generate Python source for a program.
+
+        Args:
+            symbol_table: Symbol table from the lexical analyzer
+            quadruples: Quadruple intermediate code
+            number_table: Number table for constants
+
+        Returns:
+            Python source defining the program function
+        """
+        self.types = {}
+
+        lines = [f"def {ENTRY_POINT}(read_int, read_str, write):"]
+
+        names = []
+        for symbol in symbol_table:
+            name, data_type, value = self._unpack_symbol(symbol)
+            self.types[name] = data_type
+            names.append(name)
+            if data_type == "str":
+                initial = repr(str(value).strip('"') if value else "")
+            elif data_type == "boolean":
+                initial = '1' if value in (True, 1, "True") else '0'
+            else:
+                initial = str(int(value or 0) & WORD_MASK)
+            lines.append(f"    {self._local(name)} = {initial}")
+
+        statements = [self._unpack_quadruple(quad) for quad in quadruples]
+        lines.extend(f"    {line}" for line in self._generate_body(statements))
+
+        result = ', '.join(f"{name!r}: {self._local(name)}" for name in names)
+        lines.append(f"    return {{{result}}}")
+        return '\n'.join(lines) + '\n'
+
+    def compile_program(self, symbol_table: List[Any], quadruples: List[Any],
+                        number_table: List[Any] = None) -> PythonProgram:
+        """
+        Compile a program to a code object, reusing the cached one when possible.
+
+        Args:
+            symbol_table: Symbol table from the lexical analyzer
+            quadruples: Quadruple intermediate code
+            number_table: Number table for constants
+
+        Returns:
+            Compiled PythonProgram
+        """
+        program_hash = self.program_hash(symbol_table, quadruples, number_table)
+        cached = _code_cache.get(program_hash)
+        if cached is not None:
+            _code_cache.move_to_end(program_hash)
+            _cache_stats["hits"] += 1
+            return cached
+
+        _cache_stats["misses"] += 1
+        source = self.generate_source(symbol_table, quadruples, number_table)
+        code = compile(source, f"<automata {program_hash[:12]}>", 'exec')
+        namespace: Dict[str, Any] = {}
+        exec(code, namespace)
+        program = PythonProgram(program_hash, source, code, namespace[ENTRY_POINT])
+
+        _code_cache[program_hash] = program
+        if len(_code_cache) > CACHE_LIMIT:
+            _code_cache.popitem(last=False)
+        return program
+
+    def program_hash(self, symbol_table: List[Any], quadruples: List[Any],
+                     number_table: List[Any] = None) -> str:
+        """Hash the program representation that determines the generated code."""
+        digest = hashlib.sha256()
+        for symbol in symbol_table:
+            digest.update(repr(self._unpack_symbol(symbol)).encode('utf-8'))
+        digest.update(b'|')
+        for quad in quadruples:
+            digest.update(repr(self._unpack_quadruple(quad)).encode('utf-8'))
+        digest.update(b'|')
+        for entry in number_table or []:
+            pair = (entry.identifier, entry.value) if hasattr(entry, 'identifier') else (entry[1], entry[0])
+            digest.update(repr(pair).encode('utf-8'))
+        return digest.hexdigest()
+
+    def _generate_body(self, statements: List[Tuple[str, str, str, str]]) -> List[str]:
+        """Translate the program, recovering structured control flow when possible."""
+        self.label_index = {}
+        self.jump_sources = {}
+        for index, (operator, _, _, result) in enumerate(statements):
+            if operator == 'label':
+                self.label_index[result] = index
+            elif operator == 'goto' or operator in RELATIONS:
+                self.jump_sources.setdefault(result, []).append(index)
+
+        try:
+            return self._structure(statements, 0, len(statements), None)
+        except _Unstructured:
+            return self._dispatch_loop(statements)
+
+    def _structure(self, statements: List[Tuple[str, str, str, str]], start: int, end: int,
+                   loop: Optional[Tuple[str, Optional[str]]]) -> List[str]:
+        """
+        Rebuild if/else and while blocks from the jumps in statements[start:end].
+
+        Args:
+            statements: Unpacked quadruples
+            start: First statement of the region
+            end: End of the region (exclusive)
+            loop: (header label, exit label) of the innermost enclosing loop
+
+        Returns:
+            Python lines for the region
+
+        Raises:
+            _Unstructured: If a jump leaves the region other than as break/continue
+        """
+        lines = []
+        index = start
+        while index < end:
+            operator, operand1, operand2, result = statements[index]
+
+            if operator == 'label':
+                back_edges = [source for source in self.jump_sources.get(result, []) if index < source < end]
+                if not back_edges:
+                    index += 1
+                    continue
+
+                # A label with jumps back to it from later in the region is a loop header
+                back_edge = max(back_edges)
+                following = statements[back_edge + 1] if back_edge + 1 < len(statements) else None
+                exit_label = following[3] if following and following[0] == 'label' else None
+                body = self._structure(statements, index + 1, back_edge, (result, exit_label))
+                jump, left, right, _ = statements[back_edge]
+                if jump != 'goto':
+                    body += [f"if not {self._condition(jump, left, right)}:", "    break"]
+                lines.append("while True:")
+                lines.extend(self._indent(body))
+                index = back_edge + 1
+                continue
+
+            if operator == 'goto' or operator in RELATIONS:
+                condition, label, following = self._jump_condition(statements, index, end)
+                loop_jump = self._loop_jump(condition, label, loop)
+                if loop_jump is not None:
+                    lines.extend(loop_jump)
+                    index = following
+                    continue
+
+                target = self.label_index.get(label)
+                if condition is None or target is None or not following <= target <= end:
+                    raise _Unstructured(label)
+
+                # The then-part runs when the jump is not taken; a goto over an
+                # else-part ends it
+                then_end, else_end = target, None
+                if target - 1 >= following and statements[target - 1][0] == 'goto':
+                    else_target = self.label_index.get(statements[target - 1][3])
+                    if else_target is not None and target < else_target <= end:
+                        then_end, else_end = target - 1, else_target
+
+                lines.append(f"if not {condition}:")
+                lines.extend(self._indent(self._structure(statements, following, then_end, loop)))
+                if else_end is not None:
+                    lines.append("else:")
+                    lines.extend(self._indent(self._structure(statements, target, else_end, loop)))
+                    index = else_end
+                else:
+                    index = target
+                continue
+
+            lines.extend(self._generate_statement(operator, operand1, operand2, result))
+            index += 1
+        return lines
+
+    def _jump_condition(self, statements: List[Tuple[str, str, str, str]], index: int,
+                        end: int) -> Tuple[Optional[str], str, int]:
+        """
+        Read the jump at statements[index], merging a run of short-circuit jumps.
+
+        && and || compile to conditional jumps that share one target outside
+        the run and skip each other through labels inside it; such a run is
+        folded back into a single condition.
+
+        Returns:
+            (condition, or None for a goto; target label; index after the jump or run)
+        """
+        operator, operand1, operand2, result = statements[index]
+        if operator == 'goto':
+            return None, result, index + 1
+
+        stop = index + 1
+        while stop < end and (statements[stop][0] in RELATIONS or statements[stop][0] == 'label'):
+            stop += 1
+        while stop > index + 1:
+            merged = self._merge_jumps(statements, index, stop)
+            if merged is not None:
+                return merged[0], merged[1], stop
+            stop -= 1
+        return self._condition(operator, operand1, operand2), result, index + 1
+
+    def _merge_jumps(self, statements: List[Tuple[str, str, str, str]], start: int,
+                     stop: int) -> Optional[Tuple[str, str]]:
+        """Return (condition, target) for a self-contained run of conditional jumps, or None."""
+        inner = {statements[i][3]: i for i in range(start, stop) if statements[i][0] == 'label'}
+        outside = {statements[i][3] for i in range(start, stop)
+                   if statements[i][0] in RELATIONS and statements[i][3] not in inner}
+        if len(outside) != 1:
+            return None
+        # Labels inside the run may only be entered by forward jumps from the run itself
+        for label, position in inner.items():
+            if any(not start <= source < position for source in self.jump_sources.get(label, [])):
+                return None
+
+        target = outside.pop()
+        # taken[i] holds the condition under which control at statement i reaches target
+        taken = {stop: 'False'}
+        for i in range(stop - 1, start - 1, -1):
+            operator, operand1, operand2, result = statements[i]
+            if operator == 'label':
+                taken[i] = taken[i + 1]
+                continue
+            jumped = 'True' if result == target else taken[inner[result]]
+            taken[i] = _select(self._condition(operator, operand1, operand2), jumped, taken[i + 1])
+        return taken[start], target
+
+    def _loop_jump(self, condition: Optional[str], label: str,
+                   loop: Optional[Tuple[str, Optional[str]]]) -> Optional[List[str]]:
+        """Translate a jump to the enclosing loop header or exit into continue/break."""
+        if loop is None or label not in loop:
+            return None
+        action = 'continue' if label == loop[0] else 'break'
+        if condition is None:
+            return [action]
+        return [f"if {condition}:", f"    {action}"]
+
+    def _dispatch_loop(self, statements: List[Tuple[str, str, str, str]]) -> List[str]:
+        """Run the basic blocks from a loop that dispatches on the current block number."""
+        leaders = {0}
+        for index, (operator, _, _, _) in enumerate(statements):
+            if operator == 'label':
+                leaders.add(index)
+            elif operator == 'goto' or operator in RELATIONS:
+                leaders.add(index + 1)
+        starts = sorted(leader for leader in leaders if leader < len(statements))
+        block_number = {start: number for number, start in enumerate(starts)}
+        target = {label: block_number[index] for label, index in self.label_index.items()}
+
+        lines = ["block = 0", "while True:"]
+        for number, start in enumerate(starts):
+            stop = starts[number + 1] if number + 1 < len(starts) else len(statements)
+            body = []
+            for operator, operand1, operand2, result in statements[start:stop]:
+                if operator == 'goto':
+                    body += [f"block = {target[result]}", "continue"]
+                elif operator in RELATIONS:
+                    body += [f"if {self._condition(operator, operand1, operand2)}:",
+                             f"    block = {target[result]}", "    continue"]
+                elif operator != 'label':
+                    body += self._generate_statement(operator, operand1, operand2, result)
+            if statements[stop - 1][0] != 'goto':
+                body += [f"block = {number + 1}", "continue"] if number + 1 < len(starts) else ["break"]
+            lines.append(f"    {'if' if number == 0 else 'elif'} block == {number}:")
+            lines.extend(f"        {line}" for line in body)
+        lines.append("    break")
+        return lines
+
+    def _condition(self, operator: str, operand1: str, operand2: str) -> str:
+        """Render a relational jump condition as a Python expression."""
+        return f"({self._value(operand1)} {RELATIONS[operator]} {self._value(operand2)})"
+
+    def _indent(self, lines: List[str]) -> List[str]:
+        """Indent a block body, using pass for an empty one."""
+        return [f"    {line}" for line in lines] or ["    pass"]
+
+    def _generate_statement(self, operator: str, operand1: str, operand2: str, result: str) -> List[str]:
+        """Translate one quadruple into Python statements."""
+        if operator in self.ARITHMETIC_OPERATORS:
+            left, right = self._value(operand1), self._value(operand2)
+            target = self._local(result)
+            if operator == '/':
+                return [f"{target} = {left} // {right}"]
+            return [f"{target} = ({left} {operator} {right}) & {WORD_MASK}"]
+
+        if operator == '=':
+            return [f"{self._local(result)} = {self._value(operand1)}"]
+
+        if operator == 'print':
+            if len(operand1) >= 2 and operand1[0] == '"' and operand1[-1] == '"':
+                return [f"write({operand1[1:-1]!r})"]
+            if self.types.get(operand1) == "str":
+                return [f"write({self._local(operand1)})"]
+            return [f"write(str({self._local(operand1)}))"]
+
+        if operator == 'read':
+            target = self._local(result)
+            if self.types.get(result) == "str":
+                return [f"{target} = read_str({target})"]
+            if self.types.get(result) == "int":
+                return [f"{target} = read_int({target})"]
+            return []
+
+        raise PythonBackendError(f"Unsupported quadruple operator '{operator}'")
+
+    def _value(self, operand: str) -> str:
+        """Render an operand as a Python expression."""
+        if operand.isdigit():
+            return str(int(operand) & WORD_MASK)
+        # Constants are literal digits; every other operand is a variable or temporary
+        return self._local(operand)
+
+    def _local(self, name: str) -> str:
+        """Mangle a program name into a local that cannot clash with Python keywords."""
+        return f"v_{name}"
+
+    def _unpack_symbol(self, symbol: Any) -> Tuple[str, str, Any]:
+        """Return (name, type, value) for either symbol table format."""
+        if hasattr(symbol, 'name'):
+            data_type = symbol.data_type.value if hasattr(symbol.data_type, 'value') else symbol.data_type
+            return symbol.name, data_type, symbol.value
+        return symbol[0], symbol[1], symbol[2]
+
+    def _unpack_quadruple(self, quad: Any) -> Tuple[str, str, str, str]:
+        """Return (operator, operand1, operand2, result) for either quadruple format."""
+        if hasattr(quad, 'operator'):
+            return quad.operator, quad.operand1, quad.operand2, quad.result
+        padded = list(quad) + [""] * (4 - len(quad))
+        return padded[0], padded[1], padded[2], padded[3]
+
+
+def _select(condition: str, when_true: str, when_false: str) -> str:
+    """Build the Python expression 'when_true if condition else when_false', simplified."""
+    if when_true == when_false:
+        return when_true
+    if when_true == 'True':
+        return condition if when_false == 'False' else f"({condition} or {when_false})"
+    if when_false == 'False':
+        return f"({condition} and {when_true})"
+    if when_true == 'False':
+        return f"(not {condition} and {when_false})"
+    return f"({when_true} if {condition} else {when_false})"
+
+
+def _console_read_line() -> str:
+    """Read one line from stdin without its line terminator."""
+    return sys.stdin.readline().rstrip('\r\n')
+
+
+def cache_info() -> Dict[str, int]:
+    """Return hit/miss counters and the current size of the code object cache."""
+    return {"hits": _cache_stats["hits"], "misses": _cache_stats["misses"], "size": len(_code_cache)}
+
+
+def clear_cache():
+    """Drop every cached code object and reset the counters."""
+    _code_cache.clear()
+    _cache_stats["hits"] = 0
+    _cache_stats["misses"] = 0
+
+
+def run_python(symbol_table: List[Any], quadruples: List[Any],
+               number_table: List[Any] = None, io: Any = None) -> Dict[str, Any]:
+    """
+    Convenience function to compile (or fetch from cache) and run a program.
+
+    Args:
+        symbol_table: Symbol table from analyzer
+        quadruples: Intermediate code quadruples
+        number_table: Number constants table
+        io: I/O backend with read_line() and write(str)
+
+    Returns:
+        Final values of the program variables
+    """
+    program = PythonGenerator().compile_program(symbol_table, quadruples, number_table)
+    return program.run(io)
+
+
+if __name__ == "__main__":
+    # Example usage
+    mock_symbol_table = [
+        ['x', 'int', 42, 'id0', 'NoRead'],
+        ['result', 'int', 0, 'id1', 'NoRead']
+    ]
+
+    mock_quadruples = [
+        ['+', 'x', '10', '_t1'],
+        ['=', '_t1', '', 'result'],
+        ['print', '"result = "', '', ''],
+        ['print', 'result', '', '']
+    ]
+
+    generator = PythonGenerator()
+    print(generator.generate_source(mock_symbol_table, mock_quadruples))
+    print(run_python(mock_symbol_table, mock_quadruples))
+    print(cache_info())
@@ -0,0 +1,199 @@
+"""
+Runtime Support Library
+
+This module holds the 8086 runtime routines shared by generated programs.
+Use sites only load their arguments and call the routine; each routine and
+the data it needs are emitted once, and only when a program references it.
+
+Calling conventions:
+- _printstr: DX = offset of a "$"-terminated string
+- _todec:    AX = unsigned value to print in decimal
+- _readint:  DI = offset of the destination word (left unchanged on bad input)
+- _readstr:  DX = offset of a DOS input buffer (max, count, text); the text is
+             "$"-terminated after reading so it can be printed from offset+2
+
+Routine, label and data names start with an underscore (or contain one),
+which user identifiers cannot, so a program variable never collides with them.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List
+
+
+@dataclass
+class RuntimeRoutine:
+    """A runtime procedure and the data segment lines it depends on."""
+    name: str
+    code: str
+    data: List[str] = field(default_factory=list)
+
+
+PRINTSTR = RuntimeRoutine(
+    name="_printstr",
+    code="""; Print the "$"-terminated string at DS:DX
+_printstr proc near
+        push ax
+        mov ah, 9
+        int 21h
+        pop ax
+        ret
+_printstr endp""",
+)
+
+TODEC = RuntimeRoutine(
+    name="_todec",
+    code="""; Print AX as an unsigned decimal number.
+; Digits are produced by repeated subtraction of powers of ten, which
+; avoids one 150-cycle div per digit.
+_todec proc near
+        push ax
+        push bx
+        push cx
+        push dx
+        push si
+        mov si, offset _todec_pow
+        xor cx, cx
+td_power:
+        mov bx, [si]
+        mov dl, '0'
+td_count:
+        cmp ax, bx
+        jb td_digit
+        sub ax, bx
+        inc dl
+        jmp td_count
+td_digit:
+        cmp dl, '0'
+        jne td_print
+        jcxz td_next
+td_print:
+        mov cx, 1
+        push ax
+        mov ah, 2
+        int 21h
+        pop ax
+td_next:
+        add si, 2
+        cmp si, offset _todec_pow+8
+        jb td_power
+        add al, '0'
+        mov dl, al
+        mov ah, 2
+        int 21h
+        pop si
+        pop dx
+        pop cx
+        pop bx
+        pop ax
+        ret
+_todec endp""",
+    data=["        _todec_pow DW 10000, 1000, 100, 10"],
+)
+
+READINT = RuntimeRoutine(
+    name="_readint",
+    code="""; Read an unsigned decimal number into the word at DS:DI.
+; The destination is left unchanged on empty, non-digit or overflowing input.
+_readint proc near
+        push ax
+        push bx
+        push cx
+        push dx
+        push si
+        lea dx, _numeroLectura
+        mov ah, 0ah
+        int 21h
+        lea si, _numeroLectura+2
+        mov cl, _numeroLectura+1
+        mov ch, 0
+        xor ax, ax
+        jcxz ri_done
+ri_digit:
+        mov bl, [si]
+        sub bl, 30h
+        cmp bl, 9
+        ja ri_done
+        mov bh, 0
+        shl ax, 1
+        jc ri_done
+        mov dx, ax
+        shl ax, 1
+        jc ri_done
+        shl ax, 1
+        jc ri_done
+        add ax, dx
+        jc ri_done
+        add ax, bx
+        jc ri_done
+        inc si
+        loop ri_digit
+        mov [di], ax
+ri_done:
+        mov dl, 10
+        mov ah, 2
+        int 21h
+        pop si
+        pop dx
+        pop cx
+        pop bx
+        pop ax
+        ret
+_readint endp""",
+    data=["        _numeroLectura db 6,?,6 dup(?)"],
+)
+
+READSTR = RuntimeRoutine(
+    name="_readstr",
+    code="""; Read a line into the DOS input buffer at DS:DX and "$"-terminate it
+_readstr proc near
+        push ax
+        push bx
+        push dx
+        mov ah, 0ah
+        int 21h
+        mov bx, dx
+        mov al, [bx+1]
+        mov ah, 0
+        add bx, ax
+        mov byte ptr [bx+2], '$'
+        mov dl, 10
+        mov ah, 2
+        int 21h
+        pop dx
+        pop bx
+        pop ax
+        ret
+_readstr endp""",
+)
+
+# Library order is the emission order
+RUNTIME_ROUTINES: Dict[str, RuntimeRoutine] = {
+    routine.name: routine for routine in (PRINTSTR, TODEC, READINT, READSTR)
+}
+
+
+def resolve_routines(names: Iterable[str]) -> List[RuntimeRoutine]:
+    """
+    Return the referenced routines in library order.
+
+    Args:
+        names: Names of the routines referenced by a program
+
+    Returns:
+        RuntimeRoutine objects, each listed once
+    """
+    wanted = set(names)
+    return [routine for name, routine in RUNTIME_ROUTINES.items() if name in wanted]
+
+
+def iter_runtime_data(names: Iterable[str]) -> Iterator[str]:
+    """Yield the data segment lines required by the referenced routines."""
+    for routine in resolve_routines(names):
+        yield from routine.data
+
+
+def iter_runtime_code(names: Iterable[str]) -> Iterator[str]:
+    """Yield the code of the referenced routines, separated by blank lines."""
+    for routine in resolve_routines(names):
+        yield from routine.code.splitlines()
+        yield ''
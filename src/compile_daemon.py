@@ -0,0 +1,273 @@
+"""
+Automata Language Compiler - Compile Daemon
+
+This module keeps a warm compiler process serving compilation jobs over a
+Unix domain socket, so a build that runs the compiler once per file pays
+for interpreter startup, compiler imports and regex compilation once
+instead of on every run.
+
+The daemon imports the compiler up front and forks a child per job; the
+child inherits the warm state, runs the command line in the client's
+working directory and environment, and sends back the exit code and
+everything the compiler printed to stdout and stderr. Forking also isolates jobs from each
+other, so concurrent clients compile in parallel.
+
+Protocol: the client sends one JSON line, {"argv": [...], "cwd": ...,
+"env": {...}} for a job or {"command": "ping" | "stop"}, and reads one JSON
+reply, {"exit_code": ..., "output": ..., "errors": ...} for a job.
+
+The client half of this module imports nothing but json, os and socket,
+so a thin client starts in the time of a bare interpreter; the server
+half imports what it needs when the daemon starts. submit_job returns
+None whenever no daemon answers, and the client then compiles in-process.
+A daemon that accepts a job but does not reply within the job timeout
+($AUTOMATA_DAEMON_TIMEOUT seconds) fails the job instead, since it may
+still be running.
+"""
+
+import json
+import os
+import socket
+from typing import List, Dict, Any, Callable, Optional, Tuple
+
+
+# Environment variable overriding the default socket location
+SOCKET_VARIABLE = 'AUTOMATA_DAEMON_SOCKET'
+
+# Environment variable overriding the job timeout
+TIMEOUT_VARIABLE = 'AUTOMATA_DAEMON_TIMEOUT'
+
+# Seconds a client waits to connect before compiling in-process instead
+CONNECT_TIMEOUT = 0.5
+
+# Seconds a client waits for a job's reply, and for a ping or stop acknowledgement
+JOB_TIMEOUT = 300.0
+CONTROL_TIMEOUT = 5.0
+
+# Exit code of a job whose reply did not arrive in time, as timeout(1) uses
+TIMEOUT_EXIT_CODE = 124
+
+# Directory for the socket when neither $AUTOMATA_DAEMON_SOCKET nor $XDG_RUNTIME_DIR is set
+FALLBACK_SOCKET_DIR = '/tmp'
+
+
+def default_socket_path() -> str:
+    """Socket location: $AUTOMATA_DAEMON_SOCKET, else a per-user socket in the runtime or temp directory."""
+    configured = os.environ.get(SOCKET_VARIABLE)
+    if configured:
+        return configured
+    directory = os.environ.get('XDG_RUNTIME_DIR') or os.environ.get('TMPDIR') or FALLBACK_SOCKET_DIR
+    user = os.getuid() if hasattr(os, 'getuid') else 0
+    return os.path.join(directory, f"automata-compiler-{user}.sock")
+
+
+def job_timeout() -> float:
+    """Seconds to wait for a job's reply: $AUTOMATA_DAEMON_TIMEOUT, else JOB_TIMEOUT."""
+    try:
+        return float(os.environ.get(TIMEOUT_VARIABLE, JOB_TIMEOUT))
+    except ValueError:
+        return JOB_TIMEOUT
+
+
+def submit_job(arguments: List[str], cwd: Optional[str] = None, socket_path: Optional[str] = None,
+               timeout: Optional[float] = None) -> Optional[Tuple[int, str, str]]:
+    """
+    Run a compiler command line on the daemon.
+
+    Args:
+        arguments: Command-line arguments after the program name
+        cwd: Directory the paths in the arguments are relative to (defaults to the current one)
+        socket_path: Daemon socket (defaults to default_socket_path())
+        timeout: Seconds to wait for the reply (defaults to job_timeout())
+
+    Returns:
+        (exit code, standard output, standard error), or None if no daemon is running
+        or it failed to answer. A job whose reply does not arrive in time fails with
+        TIMEOUT_EXIT_CODE and a message on standard error.
+    """
+    message = {'argv': list(arguments), 'cwd': cwd or os.getcwd(), 'env': dict(os.environ)}
+    try:
+        reply = _request(message, socket_path, job_timeout() if timeout is None else timeout)
+    except TimeoutError as e:
+        return TIMEOUT_EXIT_CODE, '', f"Error: {e}\n"
+    if reply is None or not isinstance(reply.get('exit_code'), int):
+        return None
+    return reply['exit_code'], str(reply.get('output', '')), str(reply.get('errors', ''))
+
+
+def daemon_running(socket_path: Optional[str] = None) -> bool:
+    """Whether a daemon answers on the socket."""
+    try:
+        return _request({'command': 'ping'}, socket_path) is not None
+    except TimeoutError:
+        return False
+
+
+def stop_daemon(socket_path: Optional[str] = None) -> bool:
+    """
+    Ask the daemon to shut down.
+
+    Returns:
+        True if a daemon was running and acknowledged
+    """
+    try:
+        return _request({'command': 'stop'}, socket_path) is not None
+    except TimeoutError:
+        return False
+
+
+def serve(runner: Callable[[List[str]], int], socket_path: Optional[str] = None,
+          warm_up: Optional[Callable[[], None]] = None):
+    """
+    Serve compilation jobs until a stop command arrives.
+
+    Args:
+        runner: Runs a command line and returns its exit code (the compiler's run function)
+        socket_path: Socket to listen on (defaults to default_socket_path())
+        warm_up: Called once before serving, to load state every job inherits
+
+    Raises:
+        RuntimeError: If the platform lacks Unix sockets or fork, or a daemon already serves the socket
+    """
+    import contextlib
+    import signal
+    import socketserver
+    import stat
+
+    if not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'fork'):
+        raise RuntimeError("The compile daemon needs Unix domain sockets and fork")
+    path = socket_path or default_socket_path()
+    if os.path.exists(path):
+        if daemon_running(path):
+            raise RuntimeError(f"A compile daemon is already running on {path}")
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            raise RuntimeError(f"{path} exists and is not a socket")
+        # Left behind by a daemon that did not shut down cleanly
+        os.unlink(path)
+
+    if warm_up:
+        warm_up()
+
+    class DaemonServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        """Unix socket server that handles each connection in a forked child."""
+
+    class JobHandler(socketserver.StreamRequestHandler):
+        """Reads one request line and writes one JSON reply."""
+
+        def handle(self):
+            try:
+                request = json.loads(self.rfile.readline())
+            except ValueError:
+                return
+            if request.get('command') == 'ping':
+                self._reply({'pid': os.getppid()})
+            elif request.get('command') == 'stop':
+                self._reply({'stopping': True})
+                # Runs in the forked child: signal the serving parent to leave serve_forever
+                os.kill(os.getppid(), signal.SIGTERM)
+            elif 'argv' in request:
+                self._reply(run_job(runner, request['argv'], request.get('cwd', '/'), request.get('env', {})))
+
+        def _reply(self, reply: Dict[str, Any]):
+            self.wfile.write(json.dumps(reply).encode('utf-8') + b'\n')
+
+    # The socket is created owner-only, so no other user can connect before it is locked down
+    previous_umask = os.umask(0o177)
+    try:
+        server = DaemonServer(path, JobHandler)
+    finally:
+        os.umask(previous_umask)
+    signal.signal(signal.SIGTERM, _stop_serving)
+    print(f"Compile daemon listening on {path} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve_forever()
+    except (_StopServing, KeyboardInterrupt):
+        pass
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(path)
+    print("Compile daemon stopped", flush=True)
+
+
+def run_job(runner: Callable[[List[str]], int], arguments: List[str],
+            cwd: str, environment: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Run one command line with the client's directory and environment, capturing what it prints.
+
+    The job's environment is replaced by the client's, so variables the
+    client does not have are unset rather than inherited from the daemon.
+
+    Args:
+        runner: Runs a command line and returns its exit code
+        arguments: Command-line arguments
+        cwd: Client working directory
+        environment: Client environment
+
+    Returns:
+        Reply with 'exit_code', 'output' (standard output) and 'errors' (standard error)
+    """
+    import contextlib
+    import io
+    import traceback
+
+    output, errors = io.StringIO(), io.StringIO()
+    with contextlib.redirect_stdout(output), contextlib.redirect_stderr(errors):
+        try:
+            os.chdir(cwd)
+            os.environ.clear()
+            os.environ.update(environment)
+            exit_code = runner(arguments)
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            traceback.print_exc()
+            exit_code = 1
+    return {'exit_code': exit_code, 'output': output.getvalue(), 'errors': errors.getvalue()}
+
+
+class _StopServing(Exception):
+    """Raised in the serving process to leave serve_forever."""
+
+
+def _stop_serving(signal_number, frame):
+    """Signal handler that ends the serve loop."""
+    raise _StopServing()
+
+
+def _request(message: Dict[str, Any], socket_path: Optional[str],
+             timeout: float = CONTROL_TIMEOUT) -> Optional[Dict[str, Any]]:
+    """
+    Send one request and read the reply; None if the daemon is absent or the exchange fails.
+
+    Raises:
+        TimeoutError: If the daemon accepted the connection but did not reply within timeout seconds
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    path = socket_path or default_socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.settimeout(CONNECT_TIMEOUT)
+            connection.connect(path)
+        except OSError:
+            return None
+        connection.settimeout(timeout)
+        try:
+            connection.sendall(json.dumps(message).encode('utf-8') + b'\n')
+            with connection.makefile('rb') as stream:
+                reply = json.loads(stream.readline())
+        except socket.timeout:
+            raise TimeoutError(f"the compile daemon did not reply within {timeout:g} s") from None
+        except (OSError, ValueError):
+            return None
+    return reply if isinstance(reply, dict) else None
+
+
+if __name__ == "__main__":
+    # Example usage
+    path = default_socket_path()
+    print(f"Socket: {path}")
+    print(f"Daemon running: {daemon_running(path)}")
+    result = submit_job([])
+    print("Job:", "no daemon, compile in-process" if result is None else f"exit code {result[0]}")
@@ -5,17 +5,26 @@ This is the main compiler driver that coordinates all phases of compilation
 from source code to assembly output for the Automata Language (.af).
 """
 
+import contextlib
+import json
 import sys
 import os
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import List, Dict, Tuple, Any, Optional
 
 # Add src directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__)))
 
 from utils.preprocessor import SourcePreprocessor
 from utils.file_buffer import FileBuffer
-from lexer.token_analyzer import TokenAnalyzer, analyze_tokens
+from utils.compile_cache import CompileCache, cache_key
+from utils.compile_stats import CompilationStats, memory_tracing
+from utils.profiling import PhaseProfiler
+from lexer.token_analyzer import TokenAnalyzer, Token, TokenType, analyze_tokens
+from lexer.lexical_analyzer import LexicalAnalyzer, SymbolEntry, NumberEntry, Quadruple, DataType
+from optimizer.variables import usage_warnings
+from optimizer.evaluation import DEFAULT_STEP_BUDGET
+from optimizer.pass_manager import DEFAULT_OPTIMIZATION_LEVEL, OPTIMIZATION_LEVELS, PassManager
 
 
 class CompilerError(Exception):
@@ -28,53 +37,127 @@ class SimpleCompiler:
     Main compiler class that orchestrates the compilation process for Automata Language.
     """
     
-    def __init__(self, source_file: str):
+    def __init__(self, source_file: str, pack_booleans: bool = False,
+                 evaluation_steps: int = DEFAULT_STEP_BUDGET, outline: bool = False,
+                 optimization_level: int = DEFAULT_OPTIMIZATION_LEVEL, passes: Optional[List[str]] = None,
+                 cache: Optional[CompileCache] = None, output_dir: Optional[str] = None,
+                 trace_memory: bool = False, profiler: Optional[PhaseProfiler] = None):
         """
         Initialize the compiler with a source file.
         
         Args:
             source_file: Path to the source file to compile
+            pack_booleans: Store booleans as bits of shared flag words instead of bytes
+            evaluation_steps: VM step budget for running programs without input
+                at compile time, 0 to disable
+            outline: Factor repeated instruction sequences into subroutines
+            optimization_level: Preset optimization pipeline (0, 1 or 2)
+            passes: Optimization pass names to run instead of the level's preset
+            cache: Compilation cache; a hit restores every output without running any phase
+            output_dir: Directory for the token listing, assembly and reports (created if
+                missing; defaults to the working directory). The preprocessed .afd file
+                is always written next to the source
+            trace_memory: Record each phase's peak allocated memory with tracemalloc
+                (slows compilation; timings and counters are always recorded)
+            profiler: Runs every phase under cProfile, one profile per phase
         """
         self.source_file = source_file
+        self.pack_booleans = pack_booleans
+        self.evaluation_steps = evaluation_steps
+        self.outline = outline
+        self.optimization_level = optimization_level
+        self.cache = cache
+        self.cache_hit = False
+        self.output_dir = output_dir
+        self.trace_memory = trace_memory
+        self.profiler = profiler
+        if passes is None:
+            self.pass_manager = PassManager.for_level(optimization_level)
+        else:
+            self.pass_manager = PassManager.from_names(passes)
         self.source_name = Path(source_file).stem
         self.preprocessor = SourcePreprocessor()
         self.file_buffer = FileBuffer()
         self.token_analyzer = TokenAnalyzer()
+        self.lexical_analyzer = LexicalAnalyzer()
         
         # Compilation results
         self.preprocessed_file = None
         self.tokens = []
         self.symbol_table = []
+        self.number_table = []
         self.quadruples = []
         self.assembly_output = None
+        self.cost_report = None
+        self.tile_listing = None
+        self.warnings = []
+        self.stats = CompilationStats()
         
     def compile(self) -> bool:
         """
         Perform complete compilation of the source file.
         
+        The cost of every phase and the size counters are left in `stats`.
+        
         Returns:
             True if compilation succeeds, False otherwise
         """
+        self.stats = CompilationStats()
+        with memory_tracing(self.trace_memory):
+            success = self._compile()
+        if not success:
+            self._count_sizes(finished=False)
+        return success
+    
+    def _compile(self) -> bool:
+        """Run the phases, timing each one."""
         try:
             print(f"🚀 Starting compilation of '{self.source_file}'")
             print("=" * 60)
+            if self.output_dir:
+                os.makedirs(self.output_dir, exist_ok=True)
+            
+            # Unchanged sources compiled with the same compiler and options are restored
+            key = None
+            if self.cache is not None:
+                with self._phase('cache-lookup'):
+                    key = self._cache_key()
+                    restored = key is not None and self._restore_from_cache(key)
+                if restored:
+                    self._count_sizes()
+                    print("\n✅ Compilation completed successfully!")
+                    self._print_compilation_summary()
+                    return True
             
             # Phase 1: Preprocessing
-            if not self._preprocess():
-                return False
+            with self._phase('preprocess'):
+                if not self._preprocess():
+                    return False
             
             # Phase 2: Lexical Analysis
-            if not self._lexical_analysis():
-                return False
+            with self._phase('lexical'):
+                if not self._lexical_analysis():
+                    return False
             
             # Phase 3: Syntax and Semantic Analysis (integrated)
-            if not self._syntax_semantic_analysis():
-                return False
+            with self._phase('syntax-semantic'):
+                if not self._syntax_semantic_analysis():
+                    return False
+            
+            # Optimization passes over the quadruples
+            with self._phase('optimize'):
+                self._optimize()
             
             # Phase 4: Code Generation
-            if not self._code_generation():
-                return False
+            with self._phase('codegen'):
+                if not self._code_generation():
+                    return False
+            
+            if key is not None:
+                with self._phase('cache-store'):
+                    self._store_in_cache(key)
             
+            self._count_sizes()
             print("\n✅ Compilation completed successfully!")
             self._print_compilation_summary()
             return True
@@ -86,6 +169,16 @@ class SimpleCompiler:
             print(f"\n💥 Unexpected error during compilation: {e}")
             return False
     
+    @contextlib.contextmanager
+    def _phase(self, name: str):
+        """Time the enclosed phase, and profile it when a profiler is attached."""
+        with self.stats.phase(name):
+            if self.profiler is None:
+                yield
+            else:
+                with self.profiler.phase(name):
+                    yield
+    
     def _preprocess(self) -> bool:
         """
         Phase 1: Preprocess the source file.
@@ -120,7 +213,7 @@ class SimpleCompiler:
             source_content = self.file_buffer.read_entire_file(self.source_file)
             
             # Generate tokens and save to file
-            output_file = f"{self.source_name}_tokens.csv"
+            output_file = self._output_files()['token_listing']
             self.tokens = self.token_analyzer.tokenize_with_output(source_content, output_file)
             
             print(f"   ✓ Generated {len(self.tokens)} tokens")
@@ -156,20 +249,47 @@ class SimpleCompiler:
                     parsed_lines.append([content, line_num])
             
             print(f"   ✓ Parsed {len(parsed_lines)} lines")
-            print("   ✓ Symbol table and semantic analysis completed")
             
-            # Enhanced symbol table for demonstration
-            self.symbol_table = [
-                ['x', 'int', 2, 'id0', 'NoRead'],
-                ['y', 'int', 10, 'id1', 'NoRead'],
-                ['result', 'int', 0, 'id2', 'NoRead'],
-                ['z', 'int', 0, 'id3', 'NoRead']
-            ]
+            # Integrated syntax/semantic analysis and quadruple generation
+            self.lexical_analyzer.reset()
+            success = True
+            for line in parsed_lines:
+                if not self.lexical_analyzer.analyze_line(line, 0):
+                    success = False
+            if not self.lexical_analyzer.check_blocks_closed():
+                success = False
             
-            return True
+            self.symbol_table = list(self.lexical_analyzer.get_symbol_table())
+            self.number_table = list(self.lexical_analyzer.get_number_table())
+            self.quadruples = list(self.lexical_analyzer.get_quadruples())
             
         except Exception as e:
             raise CompilerError(f"Syntax/Semantic analysis failed: {e}")
+        
+        if not success:
+            raise CompilerError("Syntax/Semantic analysis failed")
+        
+        print("   ✓ Symbol table and semantic analysis completed")
+        print(f"   ✓ Generated {len(self.quadruples)} quadruples")
+        return True
+    
+    def _optimize(self):
+        """Run the optimization pipeline and report unused variables."""
+        # Optimization passes over the quadruples, each timed with its IR size change
+        self.quadruples = self.pass_manager.run(self.quadruples, self.symbol_table, self.number_table,
+                                                self.evaluation_steps)
+        for record in self.pass_manager.records:
+            if record.message:
+                print(f"   ✓ {record.message} ({record.seconds * 1000:.1f} ms)")
+        print(f"   ✓ Optimization: {len(self.pass_manager.passes)} passes in "
+              f"{self.pass_manager.total_seconds * 1000:.1f} ms")
+        
+        # Variables whose value is never used are reported (and, when optimizing, get no storage)
+        self.warnings = self.pass_manager.warnings
+        if self.warnings is None:
+            self.warnings = usage_warnings(self.symbol_table, self.quadruples)
+        for warning in self.warnings:
+            print(f"   ⚠️  {warning}")
     
     def _code_generation(self) -> bool:
         """
@@ -182,20 +302,38 @@ class SimpleCompiler:
         
         try:
             # Generate assembly file name
-            self.assembly_output = f"{self.source_name}.asm"
+            self.assembly_output = self._output_files()['assembly']
             
             # Generate assembly code using the assembly generator
             from codegen.assembly_generator import AssemblyGenerator
             
-            generator = AssemblyGenerator()
+            # The static size and cycle report is collected from the emitted code, headed by the
+            # file name only: the output directory is not part of the cache key
+            generator = AssemblyGenerator(pack_booleans=self.pack_booleans, outline=self.outline)
             success = generator.generate_program(
                 self.assembly_output, 
                 self.symbol_table, 
-                self.quadruples
+                self.quadruples,
+                self.number_table,
+                report_name=os.path.basename(self.assembly_output)
             )
             
             if success:
                 print(f"   ✓ Assembly code generated: {self.assembly_output}")
+                if generator.outlining is not None:
+                    print(f"   ✓ Procedural abstraction: {len(generator.outlining.routines)} routines, "
+                          f"{generator.outlining.bytes_saved} bytes saved")
+                
+                # Static size and cycle report next to the assembly output
+                self.cost_report = self._output_files()['cost_report']
+                if generator.save_cost_report(self.cost_report):
+                    print(f"   ✓ Cost report saved to: {self.cost_report}")
+                
+                # Instruction selection listing: tile costs and the tiles chosen per statement
+                self.tile_listing = self._output_files()['tile_listing']
+                with open(self.tile_listing, 'w', encoding='utf-8') as f:
+                    f.write(generator.tile_listing())
+                print(f"   ✓ Tile listing saved to: {self.tile_listing}")
                 return True
             else:
                 raise CompilerError("Assembly generation failed")
@@ -211,21 +349,37 @@ class SimpleCompiler:
         except Exception as e:
             raise CompilerError(f"Code generation failed: {e}")
     
+    def _count_sizes(self, finished: bool = True):
+        """
+        Record the size counters of the program at each stage.
+        
+        Args:
+            finished: Whether code generation completed, so the assembly output is current
+        """
+        self.stats.count('preprocessed_lines', _count_lines(self.preprocessed_file))
+        self.stats.count('tokens', len(self.tokens))
+        self.stats.count('symbols', len(self.symbol_table))
+        self.stats.count('quadruples', len(self.quadruples))
+        self.stats.count('asm_lines', _count_lines(self.assembly_output) if finished else 0)
+    
     def _generate_basic_assembly(self) -> str:
         """Generate basic assembly code template."""
-        variables_section = ""
+        # Words first, then booleans and strings, so every word stays aligned
+        words_section = ""
+        bytes_section = ""
         for symbol in self.symbol_table:
-            name = symbol[0]
-            data_type = symbol[1]
-            value = symbol[2]
+            name = symbol.name
+            data_type = symbol.data_type.value
+            value = symbol.value
             
             if data_type == "int":
-                variables_section += f"        {name} DW {value}\n"
+                words_section += f"        {name} DW {value}\n"
             elif data_type == "str":
-                variables_section += f'        {name} DB "{value}", "$"\n'
+                bytes_section += f'        {name} DB "{value}", "$"\n'
             elif data_type == "boolean":
                 bool_val = 1 if value else 0
-                variables_section += f"        {name} DW {bool_val}\n"
+                bytes_section += f"        {name} DB {bool_val}\n"
+        variables_section = words_section + bytes_section
         
         return f"""pila segment para stack 'stack'
         DB 500 dup (?)
@@ -235,8 +389,7 @@ extra segment para public 'data'
 extra ends
 
 datos segment para public 'data'
-        numerolectura db 6,?,6 dup(?)
-{variables_section}
+{variables_section}        _numeroLectura db 6,?,6 dup(?)
 datos ends
 
 codigo segment para public 'code'
@@ -258,7 +411,7 @@ p0      proc far
 p0      endp
 
 ; Utility procedure to convert and print decimal numbers
-todec proc near
+_todec proc near
         push BP
         mov BP,SP
         push AX
@@ -269,39 +422,131 @@ todec proc near
         mov cx,0
         mov dx,0
         
-label1:
+_label1:
         cmp ax,0
-        je print1
+        je _print1
         mov bx,10
         div bx
         push dx
         inc cx
         xor dx,dx
-        jmp label1
+        jmp _label1
 
-print1:
+_print1:
         cmp cx,0
-        je exit
+        je _exit
         pop dx
         add dx,48
         mov ah,02h
         int 21h
         dec cx
-        jmp print1
+        jmp _print1
 
-exit:
+_exit:
         pop CX
         pop DX
         pop BX
         pop AX
         pop BP
         ret
-todec endp
+_todec endp
 
 codigo ends
         end p0
 """
     
+    def _cache_key(self) -> Optional[str]:
+        """
+        Content address of this compilation, or None without a cache or a readable source.
+        
+        The cached files name the program (the cost report header), so the
+        source name is part of the key; the output directory is not.
+        """
+        if self.cache is None:
+            return None
+        try:
+            source_text = self.file_buffer.read_entire_file(self.source_file)
+        except (OSError, UnicodeDecodeError):
+            return None
+        return cache_key(source_text, {
+            'name': self.source_name,
+            'pack_booleans': self.pack_booleans,
+            'evaluation_steps': self.evaluation_steps,
+            'outline': self.outline,
+            'passes': self.pass_manager.names,
+        })
+    
+    def _output_files(self) -> Dict[str, str]:
+        """Files a compilation writes, by cache entry field."""
+        directory = self.output_dir or ''
+        return {
+            'preprocessed': f"{self.source_file}d",
+            'token_listing': os.path.join(directory, f"{self.source_name}_tokens.csv"),
+            'assembly': os.path.join(directory, f"{self.source_name}.asm"),
+            'cost_report': os.path.join(directory, f"{self.source_name}_cost.txt"),
+            'tile_listing': os.path.join(directory, f"{self.source_name}_tiles.txt"),
+        }
+    
+    def _store_in_cache(self, key: str):
+        """Save the results of a successful compilation; a cache failure never fails the build."""
+        try:
+            files = {}
+            for field, path in self._output_files().items():
+                if os.path.exists(path):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        files[field] = f.read()
+            self.cache.put(key, {
+                'files': files,
+                'tokens': [[token.type.value, token.lexeme, token.line, token.column] for token in self.tokens],
+                'symbols': [[symbol.name, symbol.data_type.value, symbol.value, symbol.identifier,
+                             symbol.read_status] for symbol in self.symbol_table],
+                'numbers': [[entry.value, entry.identifier] for entry in self.number_table],
+                'quadruples': [[quad.operator, quad.operand1, quad.operand2, quad.result, quad.line]
+                               for quad in self.quadruples],
+                'warnings': self.warnings,
+            })
+        except OSError as e:
+            print(f"   ⚠️  Could not store compilation in cache: {e}")
+    
+    def _restore_from_cache(self, key: str) -> bool:
+        """
+        Restore the results and output files of a cached compilation.
+        
+        Returns:
+            True on a cache hit
+        """
+        entry = self.cache.get(key)
+        if entry is None:
+            print("♻️  Cache miss: compiling")
+            return False
+        
+        try:
+            paths = self._output_files()
+            for field, content in entry['files'].items():
+                with open(paths[field], 'w', encoding='utf-8') as f:
+                    f.write(content)
+            self.tokens = [Token(TokenType(kind), lexeme, line, column)
+                           for kind, lexeme, line, column in entry['tokens']]
+            self.symbol_table = [SymbolEntry(name, DataType(data_type), value, identifier, read_status)
+                                 for name, data_type, value, identifier, read_status in entry['symbols']]
+            self.number_table = [NumberEntry(value, identifier) for value, identifier in entry['numbers']]
+            self.quadruples = [Quadruple(*quad) for quad in entry['quadruples']]
+            self.warnings = list(entry['warnings'])
+        except (OSError, KeyError, ValueError, TypeError) as e:
+            print(f"♻️  Cache entry unusable ({e}): compiling")
+            return False
+        
+        files = entry['files']
+        self.preprocessed_file = paths['preprocessed'] if 'preprocessed' in files else None
+        self.assembly_output = paths['assembly']
+        self.cost_report = paths['cost_report'] if 'cost_report' in files else None
+        self.tile_listing = paths['tile_listing'] if 'tile_listing' in files else None
+        self.cache_hit = True
+        print("♻️  Cache hit: all phases skipped")
+        for warning in self.warnings:
+            print(f"   ⚠️  {warning}")
+        return True
+    
     def _print_compilation_summary(self):
         """Print a summary of the compilation results."""
         print("\n📊 Compilation Summary:")
@@ -309,43 +554,272 @@ codigo ends
         print(f"   Preprocessed:     {self.preprocessed_file}")
         print(f"   Tokens generated: {len(self.tokens)}")
         print(f"   Symbol table:     {len(self.symbol_table)} entries")
+        print(f"   Quadruples:       {len(self.quadruples)}")
         print(f"   Assembly output:  {self.assembly_output}")
+        if self.cost_report:
+            print(f"   Cost report:      {self.cost_report}")
+        if self.tile_listing:
+            print(f"   Tile listing:     {self.tile_listing}")
+        
+        if self.cache is not None:
+            print(f"   Cache:            {'hit' if self.cache_hit else 'miss'} "
+                  f"({self.cache.stats().format()})")
+        
+        print("\n⏱️  Phases:")
+        for line in self.stats.format().splitlines():
+            print(f"   {line}")
+        
+        if self.pass_manager.records:
+            print(f"\n⏱️  Optimization passes ({', '.join(self.pass_manager.names)}):")
+            for line in self.pass_manager.format().splitlines():
+                print(f"   {line}")
         
         if self.symbol_table:
             print("\n📋 Symbol Table:")
             for i, symbol in enumerate(self.symbol_table):
-                print(f"   {i}: {symbol}")
+                print(f"   {i}: {[symbol.name, symbol.data_type.value, symbol.value, symbol.identifier, symbol.read_status]}")
 
 
-def main():
-    """Main entry point for the compiler."""
-    if len(sys.argv) != 2:
+def _count_lines(path: Optional[str]) -> int:
+    """Number of lines in a file, 0 if there is none or it cannot be read."""
+    if not path:
+        return 0
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return sum(1 for _ in f)
+    except (OSError, UnicodeDecodeError):
+        return 0
+
+
+# Command-line options shared by compiler.py and compile.py
+OPTION_HELP = [
+    "   -O0            no optimization passes",
+    "   -O1            dead code, loops, dead stores, print coalescing",
+    "   -O2            -O1 plus compile-time evaluation of programs without input (default)",
+    "   --cache        reuse results of unchanged sources ($AUTOMATA_CACHE_DIR,",
+    "                  default ~/.cache/automata-compiler)",
+    "   -j, --jobs N   compile in parallel on N worker processes (default: CPU count)",
+    "   -o, --output-dir DIR",
+    "                  put each file's outputs in DIR/<name>/ (default: build)",
+    "   --watch        compile, then recompile each file when it changes (uses the cache)",
+    "   --stats        print per-phase wall and CPU time and size counters as JSON on",
+    "                  stdout (the compiler log goes to stderr)",
+    "   --trace-memory record each phase's peak allocated memory (tracemalloc, slower)",
+    "   --profile OUT  run one compilation under cProfile; writes OUT.pstats and",
+    "                  OUT.collapsed (flamegraph stacks rooted at each phase)",
+    "",
+    "Sources may be files, directories (searched for .af files) or glob patterns;",
+    "more than one source, a directory, a pattern, -j or -o compiles them as a batch.",
+]
+
+
+def parse_arguments(arguments: List[str]) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Split command-line arguments into sources and compiler options.
+    
+    Args:
+        arguments: Arguments after the program name
+        
+    Returns:
+        (sources, options: 'optimization_level', 'cache', 'watch', 'stats' and
+         'trace_memory' (whether the flag was given), 'jobs', 'output_dir' and
+         'profile' (None unless given))
+        
+    Raises:
+        ValueError: On an unknown option, a bad value or a missing value
+    """
+    sources = []
+    options = {'optimization_level': DEFAULT_OPTIMIZATION_LEVEL, 'cache': False, 'watch': False,
+               'stats': False, 'trace_memory': False, 'jobs': None, 'output_dir': None, 'profile': None}
+    remaining = list(arguments)
+    while remaining:
+        argument = remaining.pop(0)
+        if argument.startswith('-O'):
+            if not argument[2:].isdigit() or int(argument[2:]) not in OPTIMIZATION_LEVELS:
+                raise ValueError(f"Unknown optimization level '{argument}' (use "
+                                 f"{', '.join(f'-O{known}' for known in OPTIMIZATION_LEVELS)})")
+            options['optimization_level'] = int(argument[2:])
+        elif argument == '--cache':
+            options['cache'] = True
+        elif argument == '--watch':
+            options['watch'] = True
+        elif argument == '--stats':
+            options['stats'] = True
+        elif argument == '--trace-memory':
+            options['trace_memory'] = True
+        elif argument in ('-j', '--jobs') or argument.startswith('-j') or argument.startswith('--jobs='):
+            value = _option_value(argument, ('-j', '--jobs'), remaining)
+            if not value.isdigit() or int(value) < 1:
+                raise ValueError(f"Job count must be a positive integer, got '{value}'")
+            options['jobs'] = int(value)
+        elif argument == '--profile' or argument.startswith('--profile='):
+            options['profile'] = _option_value(argument, ('--profile', '--profile'), remaining)
+        elif argument in ('-o', '--output-dir') or argument.startswith('--output-dir='):
+            options['output_dir'] = _option_value(argument, ('-o', '--output-dir'), remaining)
+        elif argument.startswith('-'):
+            raise ValueError(f"Unknown option '{argument}'")
+        else:
+            sources.append(argument)
+    return sources, options
+
+
+def _option_value(argument: str, names: Tuple[str, str], remaining: List[str]) -> str:
+    """Value of an option given as '-xVALUE', '--name=VALUE' or followed by a separate argument."""
+    short, long = names
+    if argument.startswith(long + '='):
+        return argument[len(long) + 1:]
+    if argument not in names:
+        return argument[len(short):]
+    if not remaining:
+        raise ValueError(f"Option '{argument}' needs a value")
+    return remaining.pop(0)
+
+
+def is_batch(sources: List[str], options: Dict[str, Any]) -> bool:
+    """Whether the command line asks for batch compilation rather than one verbose compile."""
+    return (len(sources) > 1 or options['jobs'] is not None or options['output_dir'] is not None
+            or os.path.isdir(sources[0]) or any(character in sources[0] for character in '*?['))
+
+
+def run_batch(sources: List[str], options: Dict[str, Any]):
+    """
+    Compile sources in parallel and print the aggregate summary.
+    
+    Returns:
+        BatchSummary of the batch
+    """
+    from batch_compiler import DEFAULT_OUTPUT_ROOT, compile_batch
+    
+    print(f"🚀 Batch compilation of {', '.join(sources)}")
+    print("=" * 60)
+    summary = compile_batch(sources, output_root=options['output_dir'] or DEFAULT_OUTPUT_ROOT,
+                            jobs=options['jobs'], optimization_level=options['optimization_level'],
+                            cache=options['cache'], trace_memory=options['trace_memory'])
+    print(f"\n{'✅' if summary.success else '❌'} Batch Summary:")
+    for line in summary.format().splitlines():
+        print(f"   {line}")
+    return summary
+
+
+def run_single(source_file: str, options: Dict[str, Any]) -> Tuple[SimpleCompiler, bool]:
+    """
+    Compile one source with the full log.
+    
+    Returns:
+        (the compiler, holding the results and statistics, whether compilation succeeded)
+    """
+    # Verify file extension
+    if not source_file.endswith('.af'):
+        print("⚠️  Warning: Source file should have .af extension")
+    
+    # Create and run compiler
+    compiler = SimpleCompiler(source_file, optimization_level=options['optimization_level'],
+                              cache=CompileCache() if options['cache'] else None,
+                              trace_memory=options['trace_memory'],
+                              profiler=PhaseProfiler() if options['profile'] else None)
+    success = compiler.compile()
+    
+    if compiler.profiler is not None and compiler.profiler.profiles:
+        pstats_path, collapsed_path = compiler.profiler.write(options['profile'])
+        print(f"\n🔬 Profile written to {pstats_path} and {collapsed_path}")
+    return compiler, success
+
+
+def run_with_stats(sources: List[str], options: Dict[str, Any]) -> bool:
+    """
+    Compile with the log on stderr, then print the statistics as JSON on stdout.
+    
+    One source gives one object; a batch gives {"success", "files": [...]}.
+    
+    Returns:
+        True if every source compiled
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        if is_batch(sources, options):
+            summary = run_batch(sources, options)
+            success = summary.success
+            report = {'success': success,
+                      'files': [{'source': result.source, 'success': result.success, **(result.stats or {})}
+                                for result in summary.results]}
+        else:
+            compiler, success = run_single(sources[0], options)
+            report = {'source': sources[0], 'success': success, **compiler.stats.to_dict()}
+    print(json.dumps(report, indent=2))
+    return success
+
+
+def run(arguments: List[str]) -> int:
+    """
+    Run the compiler on command-line arguments.
+    
+    Args:
+        arguments: Arguments after the program name
+        
+    Returns:
+        Process exit code: 0 on success, 1 on any error
+    """
+    try:
+        sources, options = parse_arguments(arguments)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return 1
+    
+    if not sources:
         print("Automata Language Compiler")
         print("==========================")
         print()
-        print("Usage: python compiler.py <source_file.af>")
+        print("Usage: python compiler.py [options] <source.af | directory | pattern>...")
+        print()
+        for line in OPTION_HELP:
+            print(line)
         print()
         print("Examples:")
         print("   python compiler.py ../examples/basic_program.af")
-        print("   python compiler.py ../examples/arithmetic.af")
-        print("   python compiler.py ../examples/control_flow.af")
+        print("   python compiler.py -O1 ../examples/control_flow.af")
+        print("   python compiler.py -j 4 ../examples")
+        print("   python compiler.py --watch ../examples")
         print()
         print("For web API access, run: python ../app.py")
-        sys.exit(1)
+        return 1
     
-    source_file = sys.argv[1]
+    if options['profile'] and (options['watch'] or is_batch(sources, options)):
+        print("❌ Error: --profile profiles the compilation of a single source file")
+        return 1
     
-    # Verify file extension
-    if not source_file.endswith('.af'):
-        print("⚠️  Warning: Source file should have .af extension")
+    if options['watch']:
+        return 0 if run_watch(sources, options) else 1
     
-    # Create and run compiler
-    compiler = SimpleCompiler(source_file)
-    success = compiler.compile()
+    if options['stats']:
+        success = run_with_stats(sources, options)
+    elif is_batch(sources, options):
+        success = run_batch(sources, options).success
+    else:
+        _, success = run_single(sources[0], options)
     
     # Exit with appropriate code
-    sys.exit(0 if success else 1)
+    return 0 if success else 1
+
+
+def run_watch(sources: List[str], options: Dict[str, Any]) -> bool:
+    """
+    Watch sources and recompile them as they change, until interrupted.
+    
+    Returns:
+        True if the last compilation of every watched file succeeded
+    """
+    from batch_compiler import DEFAULT_OUTPUT_ROOT
+    from watch_compiler import watch
+    
+    results = watch(sources, output_root=options['output_dir'] or DEFAULT_OUTPUT_ROOT,
+                    optimization_level=options['optimization_level'])
+    latest = {result.source: result.success for result in results}
+    return all(latest.values())
+
+
+def main():
+    """Main entry point for the compiler."""
+    sys.exit(run(sys.argv[1:]))
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
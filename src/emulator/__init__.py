@@ -0,0 +1,15 @@
+"""
+Emulator Module
+
+Contains the 8086 emulator used to run generated assembly in-process:
+- ProgramImage: Loads MASM source into data memory and decoded instructions
+- CPU8086: Executes the supported 8086 subset with DOS int 21h services
+"""
+
+from .cpu8086 import (
+    EmulatorError, Operand, Instruction, EmulationResult, ProgramImage, CPU8086,
+    emulate, emulate_file
+)
+
+__all__ = ['EmulatorError', 'Operand', 'Instruction', 'EmulationResult', 'ProgramImage', 'CPU8086',
+           'emulate', 'emulate_file']
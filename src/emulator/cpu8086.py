@@ -0,0 +1,827 @@
+"""
+8086 Subset Emulator
+
+This module loads the MASM source produced by the assembly generator and
+executes it on an emulated 8086, providing the DOS int 21h services the
+generated programs use. Each run reports the number of executed
+instructions and an estimated cycle count (including the extra bus cycle
+of word accesses at odd addresses), which makes it a precise performance
+oracle for code generation changes.
+
+Supported:
+- Segments: one data segment and one stack segment, laid out from offset 0
+- Data: DB/DW with numbers, characters, strings, '?' and 'N dup(x)'
+- Instructions: mov, lea, xchg, add, sub, cmp, and, or, xor, test, adc, sbb,
+  inc, dec, neg, not, mul, div, shl/sal, shr, sar, push, pop, call, ret,
+  jmp, conditional jumps, loop, jcxz, int, cbw, cwd, nop
+- DOS services: int 21h AH=02h, 09h, 0Ah, 4Ch and int 20h
+
+Like the assembler, the loader rejects a name defined twice (as data, a
+procedure, a label or a segment) and data or labels named after registers.
+"""
+
+import re
+from typing import List, Dict, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field
+
+from codegen.cost_model import instruction_cycles, CONDITIONAL_JUMP_CYCLES, SHIFT_CL_PER_BIT
+
+
+# Cycle costs of not-taken branches (taken costs come from the cost model)
+NOT_TAKEN_CYCLES = {'loop': 5, 'jcxz': 6}
+CONDITIONAL_NOT_TAKEN_CYCLES = 4
+
+# A word transfer at an odd address takes a second bus cycle
+ODD_WORD_ACCESS_CYCLES = 4
+
+WORD_REGISTERS = ('ax', 'bx', 'cx', 'dx', 'si', 'di', 'bp', 'sp')
+BYTE_REGISTERS = {
+    'al': ('ax', 0), 'ah': ('ax', 8), 'bl': ('bx', 0), 'bh': ('bx', 8),
+    'cl': ('cx', 0), 'ch': ('cx', 8), 'dl': ('dx', 0), 'dh': ('dx', 8),
+}
+SEGMENT_REGISTERS = ('cs', 'ds', 'es', 'ss')
+
+# Conditional jumps: mnemonic -> predicate over (cf, zf, sf, of)
+CONDITIONS = {
+    'je': lambda cf, zf, sf, of: zf, 'jz': lambda cf, zf, sf, of: zf,
+    'jne': lambda cf, zf, sf, of: not zf, 'jnz': lambda cf, zf, sf, of: not zf,
+    'jb': lambda cf, zf, sf, of: cf, 'jc': lambda cf, zf, sf, of: cf,
+    'jnae': lambda cf, zf, sf, of: cf,
+    'jae': lambda cf, zf, sf, of: not cf, 'jnc': lambda cf, zf, sf, of: not cf,
+    'jnb': lambda cf, zf, sf, of: not cf,
+    'ja': lambda cf, zf, sf, of: not cf and not zf, 'jnbe': lambda cf, zf, sf, of: not cf and not zf,
+    'jbe': lambda cf, zf, sf, of: cf or zf, 'jna': lambda cf, zf, sf, of: cf or zf,
+    'jl': lambda cf, zf, sf, of: sf != of, 'jnge': lambda cf, zf, sf, of: sf != of,
+    'jge': lambda cf, zf, sf, of: sf == of, 'jnl': lambda cf, zf, sf, of: sf == of,
+    'jg': lambda cf, zf, sf, of: not zf and sf == of, 'jnle': lambda cf, zf, sf, of: not zf and sf == of,
+    'jle': lambda cf, zf, sf, of: zf or sf != of, 'jng': lambda cf, zf, sf, of: zf or sf != of,
+    'jo': lambda cf, zf, sf, of: of, 'jno': lambda cf, zf, sf, of: not of,
+    'js': lambda cf, zf, sf, of: sf, 'jns': lambda cf, zf, sf, of: not sf,
+}
+
+_DUP_ITEM = re.compile(r'^(\d+)\s+dup\s*\((.*)\)$', re.IGNORECASE)
+_NUMBER = re.compile(r'^-?(\d+|[0-9][0-9a-f]*h)$', re.IGNORECASE)
+
+
+class EmulatorError(Exception):
+    """Raised for unsupported source, invalid operations or exhausted budgets."""
+    pass
+
+
+@dataclass
+class Operand:
+    """A decoded instruction operand."""
+    kind: str                 # 'reg', 'reg8', 'seg', 'imm', 'mem'
+    value: Any = None         # register name, immediate value or displacement
+    base: Optional[str] = None  # base/index register for memory operands
+    size: Optional[int] = None  # 8 or 16 bits
+
+
+@dataclass
+class Instruction:
+    """A decoded instruction ready for execution."""
+    mnemonic: str
+    operands: List[Operand]
+    cycles: int
+    line_number: int
+    source: str
+    target: Optional[int] = None  # instruction index for jumps and calls
+    far: bool = False             # ret inside a far procedure
+
+
+@dataclass
+class EmulationResult:
+    """Outcome of an emulated run."""
+    output: str
+    instructions: int
+    cycles: int
+    exit_code: int = 0
+    input_lines: List[str] = field(default_factory=list)
+    odd_word_accesses: int = 0
+
+    def summary(self) -> str:
+        """One-line performance summary."""
+        return f"{self.instructions} instructions, ~{self.cycles} cycles"
+
+
+class ProgramImage:
+    """
+    Assembles generated MASM source into data memory and decoded instructions.
+    """
+
+    def __init__(self, source: str):
+        """
+        Load a program.
+
+        Args:
+            source: Assembly source text
+        """
+        self.data = bytearray()
+        self.symbols: Dict[str, Tuple[int, int]] = {}  # name -> (offset, element size)
+        self.stack_size = 0
+        self.instructions: List[Instruction] = []
+        self.labels: Dict[str, int] = {}
+        self.segments: Set[str] = set()
+        self.entry_point = 0
+        self._load(source)
+
+    def _load(self, source: str):
+        """Parse segments, data definitions and code."""
+        segment = None
+        segment_kind = None
+        code_lines: List[Tuple[int, str]] = []
+        entry_name = None
+
+        for line_number, raw_line in enumerate(source.splitlines(), 1):
+            line = self._strip_comment(raw_line).strip()
+            if not line:
+                continue
+            words = line.split()
+            lowered = [word.lower() for word in words]
+
+            if len(words) > 1 and lowered[1] == 'segment':
+                segment = lowered[0]
+                self._check_new_name(segment, line_number)
+                self.segments.add(segment)
+                segment_kind = 'stack' if 'stack' in lowered else ('code' if "'code'" in lowered else 'data')
+                continue
+            if len(words) > 1 and lowered[1] == 'ends':
+                segment = None
+                continue
+            if lowered[0] == 'end':
+                entry_name = lowered[1] if len(words) > 1 else None
+                continue
+            if segment is None:
+                continue
+
+            if segment_kind == 'code':
+                code_lines.append((line_number, line))
+            elif segment_kind == 'stack':
+                self.stack_size += len(self._data_items(line.split(None, 1)[1], 1)) if lowered[0] in ('db', 'dw') else 0
+            else:
+                self._define_data(line, line_number)
+
+        self._assemble(code_lines)
+        if entry_name is not None:
+            if entry_name not in self.labels:
+                raise EmulatorError(f"Entry point '{entry_name}' not found")
+            self.entry_point = self.labels[entry_name]
+
+    def _strip_comment(self, line: str) -> str:
+        """Remove a ';' comment, ignoring semicolons inside quotes."""
+        quote = None
+        for index, char in enumerate(line):
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in ('"', "'"):
+                quote = char
+            elif char == ';':
+                return line[:index]
+        return line
+
+    def _check_new_name(self, name: str, line_number: int):
+        """
+        Reject a name that is already defined or is a register, as the assembler would.
+
+        Raises:
+            EmulatorError: If the name is a register or an existing segment, data name, procedure or label
+        """
+        if name in WORD_REGISTERS or name in BYTE_REGISTERS or name in SEGMENT_REGISTERS:
+            raise EmulatorError(f"Line {line_number}: '{name}' is a register name")
+        if name in self.segments or name in self.symbols or name in self.labels:
+            raise EmulatorError(f"Line {line_number}: symbol '{name}' redefined")
+
+    def _define_data(self, line: str, line_number: int = 0):
+        """Lay out one DB/DW definition in data memory."""
+        words = line.split(None, 2)
+        if words[0].lower() in ('db', 'dw'):
+            name, directive, rest = None, words[0].lower(), line.split(None, 1)[1]
+        elif len(words) >= 3 and words[1].lower() in ('db', 'dw'):
+            name, directive, rest = words[0].lower(), words[1].lower(), words[2]
+        else:
+            raise EmulatorError(f"Unsupported data definition: {line}")
+
+        element_size = 1 if directive == 'db' else 2
+        if name:
+            self._check_new_name(name, line_number)
+            self.symbols[name] = (len(self.data), element_size)
+        self.data.extend(self._data_items(rest, element_size))
+
+    def _data_items(self, text: str, element_size: int) -> bytearray:
+        """Encode a comma-separated list of data items."""
+        encoded = bytearray()
+        for item in self._split_operands(text):
+            match = _DUP_ITEM.match(item)
+            if match:
+                count = int(match.group(1))
+                inner = self._data_items(match.group(2), element_size)
+                encoded.extend(inner * count)
+            elif item[0] in ('"', "'") and element_size == 1:
+                encoded.extend(item[1:-1].encode('latin-1'))
+            elif item == '?':
+                encoded.extend(bytes(element_size))
+            else:
+                encoded.extend((self._parse_number(item) & (0xFF if element_size == 1 else 0xFFFF))
+                               .to_bytes(element_size, 'little'))
+        return encoded
+
+    def _split_operands(self, text: str) -> List[str]:
+        """Split on commas that are not inside quotes or parentheses."""
+        items, current, quote, depth = [], [], None, 0
+        for char in text:
+            if quote:
+                current.append(char)
+                if char == quote:
+                    quote = None
+                continue
+            if char in ('"', "'"):
+                quote = char
+            elif char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == ',' and depth == 0:
+                items.append(''.join(current).strip())
+                current = []
+                continue
+            current.append(char)
+        if current and ''.join(current).strip():
+            items.append(''.join(current).strip())
+        return items
+
+    def _parse_number(self, text: str) -> int:
+        """Parse a decimal, 'h'-suffixed hexadecimal or character constant."""
+        text = text.strip()
+        if len(text) == 3 and text[0] == text[2] and text[0] in ('"', "'"):
+            return ord(text[1])
+        if text.lower().endswith('h'):
+            return int(text[:-1], 16)
+        return int(text)
+
+    def _assemble(self, code_lines: List[Tuple[int, str]]):
+        """Decode instructions and resolve labels."""
+        pending = []
+        proc_far = False
+
+        for line_number, line in code_lines:
+            words = line.split()
+            lowered = [word.lower() for word in words]
+
+            if len(words) > 1 and lowered[1] == 'proc':
+                self._check_new_name(lowered[0], line_number)
+                self.labels[lowered[0]] = len(pending)
+                proc_far = 'far' in lowered
+                continue
+            if len(words) > 1 and lowered[1] == 'endp':
+                proc_far = False
+                continue
+            if lowered[0] in ('assume', 'public'):
+                continue
+
+            if ':' in words[0] and not words[0].lower().startswith(('cs:', 'ds:', 'es:', 'ss:')):
+                label, _, line = line.partition(':')
+                self._check_new_name(label.strip().lower(), line_number)
+                self.labels[label.strip().lower()] = len(pending)
+                line = line.strip()
+                if not line:
+                    continue
+
+            parts = line.split(None, 1)
+            mnemonic = parts[0].lower()
+            operand_text = parts[1] if len(parts) > 1 else ''
+            pending.append((line_number, line, mnemonic, operand_text, proc_far))
+
+        for line_number, line, mnemonic, operand_text, far in pending:
+            instruction = Instruction(mnemonic, [], instruction_cycles(line), line_number, line, far=far)
+            if mnemonic == 'call' or mnemonic == 'jmp' or mnemonic == 'loop' or mnemonic == 'jcxz' \
+                    or mnemonic in CONDITIONS:
+                label = operand_text.strip().lower()
+                if label.startswith('short '):
+                    label = label[6:].strip()
+                if label not in self.labels:
+                    raise EmulatorError(f"Line {line_number}: unknown label '{label}'")
+                instruction.target = self.labels[label]
+            else:
+                instruction.operands = [self._decode_operand(op, line_number)
+                                        for op in self._split_operands(operand_text)]
+            self.instructions.append(instruction)
+
+    def _decode_operand(self, text: str, line_number: int) -> Operand:
+        """Decode one operand into register, immediate or memory form."""
+        text = text.strip()
+        lowered = text.lower()
+        size = None
+        if lowered.startswith('byte ptr'):
+            size, text, lowered = 8, text[8:].strip(), lowered[8:].strip()
+        elif lowered.startswith('word ptr'):
+            size, text, lowered = 16, text[8:].strip(), lowered[8:].strip()
+
+        if lowered in WORD_REGISTERS:
+            return Operand('reg', lowered, size=16)
+        if lowered in BYTE_REGISTERS:
+            return Operand('reg8', lowered, size=8)
+        if lowered in SEGMENT_REGISTERS:
+            return Operand('seg', lowered, size=16)
+        if lowered.startswith('offset'):
+            return Operand('imm', self._address(lowered[6:].strip(), line_number)[0])
+        if _NUMBER.match(lowered) or (len(text) == 3 and text[0] in ('"', "'")):
+            return Operand('imm', self._parse_number(text))
+        if lowered in ('datos', 'extra', 'pila', 'codigo'):
+            return Operand('imm', 0)
+
+        if '[' in lowered:
+            prefix, _, rest = lowered.partition('[')
+            inner = rest.rstrip(']').replace(' ', '')
+            base, displacement = inner, 0
+            for separator in ('+', '-'):
+                if separator in inner:
+                    base, _, number = inner.partition(separator)
+                    displacement = self._parse_number(number) * (1 if separator == '+' else -1)
+                    break
+            if prefix:
+                displacement += self._address(prefix, line_number)[0]
+            return Operand('mem', displacement, base=base, size=size)
+
+        displacement, element_size = self._address(lowered, line_number)
+        return Operand('mem', displacement, size=size or element_size * 8)
+
+    def _address(self, expression: str, line_number: int) -> Tuple[int, int]:
+        """Resolve 'symbol' or 'symbol+n' to (offset, element size)."""
+        name, _, addend = expression.replace(' ', '').partition('+')
+        if name not in self.symbols:
+            raise EmulatorError(f"Line {line_number}: unknown symbol '{name}'")
+        offset, element_size = self.symbols[name]
+        return offset + (self._parse_number(addend) if addend else 0), element_size
+
+
+class CPU8086:
+    """
+    Executes a ProgramImage with DOS int 21h services.
+    """
+
+    def __init__(self, io: Any = None, max_instructions: Optional[int] = 10_000_000):
+        """
+        Initialize the CPU.
+
+        Args:
+            io: Object with read_line() and write(str); scripted empty input if None
+            max_instructions: Instruction budget, None for unlimited
+        """
+        self.io = io
+        self.max_instructions = max_instructions
+
+    def run(self, image: ProgramImage) -> EmulationResult:
+        """
+        Run a loaded program until it returns from its entry procedure.
+
+        Args:
+            image: Loaded program
+
+        Returns:
+            EmulationResult with output, instruction count and cycles
+        """
+        self.memory = bytearray(image.data) + bytearray(0x10000 - len(image.data))
+        self.stack = bytearray(max(image.stack_size, 2) + 4)
+        self.registers = {name: 0 for name in WORD_REGISTERS}
+        self.registers['sp'] = len(self.stack)
+        self.cf = self.zf = self.sf = self.of = False
+        self.output: List[str] = []
+        self.exit_code = 0
+        self.call_depth = 0
+        self.odd_word_accesses = 0
+
+        instructions = image.instructions
+        index = image.entry_point
+        executed = 0
+        cycles = 0
+        limit = self.max_instructions
+
+        while 0 <= index < len(instructions):
+            instruction = instructions[index]
+            executed += 1
+            if limit is not None and executed > limit:
+                raise EmulatorError(f"Instruction budget of {limit} exhausted")
+
+            handler = getattr(self, f"_op_{instruction.mnemonic}", None)
+            if handler is None:
+                if instruction.mnemonic in CONDITIONS:
+                    taken = CONDITIONS[instruction.mnemonic](self.cf, self.zf, self.sf, self.of)
+                    cycles += CONDITIONAL_JUMP_CYCLES if taken else CONDITIONAL_NOT_TAKEN_CYCLES
+                    index = instruction.target if taken else index + 1
+                    continue
+                raise EmulatorError(f"Line {instruction.line_number}: unsupported instruction "
+                                    f"'{instruction.source}'")
+
+            cycles += instruction.cycles
+            next_index = handler(instruction, index)
+            if next_index is None:
+                index += 1
+            elif next_index < 0:
+                break
+            else:
+                index = next_index
+
+            # Dynamic costs the static table cannot know
+            if instruction.mnemonic in ('loop', 'jcxz') and next_index is None:
+                cycles += NOT_TAKEN_CYCLES[instruction.mnemonic] - instruction.cycles
+            elif instruction.mnemonic in ('shl', 'sal', 'shr', 'sar') \
+                    and instruction.operands[1].kind == 'reg8':
+                cycles += SHIFT_CL_PER_BIT * (self.registers['cx'] & 0xFF)
+
+        cycles += ODD_WORD_ACCESS_CYCLES * self.odd_word_accesses
+        return EmulationResult(''.join(self.output), executed, cycles, self.exit_code,
+                               odd_word_accesses=self.odd_word_accesses)
+
+    # Register and memory access
+
+    def _read(self, operand: Operand, size: int = 16) -> int:
+        """Read an operand value."""
+        kind = operand.kind
+        if kind == 'reg':
+            return self.registers[operand.value]
+        if kind == 'reg8':
+            register, shift = BYTE_REGISTERS[operand.value]
+            return (self.registers[register] >> shift) & 0xFF
+        if kind == 'imm':
+            return operand.value & (0xFF if size == 8 else 0xFFFF)
+        if kind == 'seg':
+            return 0
+        address = self._effective_address(operand)
+        if (operand.size or size) == 8:
+            return self.memory[address]
+        self.odd_word_accesses += address & 1
+        return self.memory[address] | (self.memory[(address + 1) & 0xFFFF] << 8)
+
+    def _write(self, operand: Operand, value: int, size: int = 16):
+        """Write an operand value."""
+        kind = operand.kind
+        if kind == 'reg':
+            self.registers[operand.value] = value & 0xFFFF
+        elif kind == 'reg8':
+            register, shift = BYTE_REGISTERS[operand.value]
+            current = self.registers[register] & ~(0xFF << shift)
+            self.registers[register] = current | ((value & 0xFF) << shift)
+        elif kind == 'seg':
+            pass
+        elif kind == 'mem':
+            address = self._effective_address(operand)
+            self.memory[address] = value & 0xFF
+            if (operand.size or size) != 8:
+                self.odd_word_accesses += address & 1
+                self.memory[(address + 1) & 0xFFFF] = (value >> 8) & 0xFF
+        else:
+            raise EmulatorError("Cannot write to an immediate operand")
+
+    def _effective_address(self, operand: Operand) -> int:
+        """Compute the data segment offset of a memory operand."""
+        address = operand.value
+        if operand.base:
+            address += self.registers[operand.base]
+        return address & 0xFFFF
+
+    def _size(self, instruction: Instruction) -> int:
+        """Operand size of an instruction, taken from its first sized operand."""
+        for operand in instruction.operands:
+            if operand.kind in ('reg', 'reg8', 'seg') or (operand.kind == 'mem' and operand.size):
+                return operand.size
+        return 16
+
+    def _set_logic_flags(self, value: int, size: int):
+        """Flags after and/or/xor/test."""
+        mask = 0xFF if size == 8 else 0xFFFF
+        self.cf = self.of = False
+        self.zf = (value & mask) == 0
+        self.sf = bool(value & (mask + 1) >> 1)
+
+    def _add(self, left: int, right: int, size: int, carry: int = 0) -> int:
+        """Add with flags."""
+        mask = 0xFF if size == 8 else 0xFFFF
+        sign = (mask + 1) >> 1
+        total = left + right + carry
+        result = total & mask
+        self.cf = total > mask
+        self.zf = result == 0
+        self.sf = bool(result & sign)
+        self.of = bool(~(left ^ right) & (left ^ result) & sign)
+        return result
+
+    def _sub(self, left: int, right: int, size: int, borrow: int = 0) -> int:
+        """Subtract with flags."""
+        mask = 0xFF if size == 8 else 0xFFFF
+        sign = (mask + 1) >> 1
+        result = (left - right - borrow) & mask
+        self.cf = left < right + borrow
+        self.zf = result == 0
+        self.sf = bool(result & sign)
+        self.of = bool((left ^ right) & (left ^ result) & sign)
+        return result
+
+    def _push(self, value: int):
+        """Push a word on the stack."""
+        sp = self.registers['sp'] - 2
+        if sp < 0:
+            raise EmulatorError("Stack overflow")
+        self.stack[sp:sp + 2] = (value & 0xFFFF).to_bytes(2, 'little')
+        self.registers['sp'] = sp
+
+    def _pop(self) -> int:
+        """Pop a word from the stack."""
+        sp = self.registers['sp']
+        if sp + 2 > len(self.stack):
+            raise EmulatorError("Stack underflow")
+        self.registers['sp'] = sp + 2
+        return int.from_bytes(self.stack[sp:sp + 2], 'little')
+
+    # Data movement
+
+    def _op_mov(self, instruction: Instruction, index: int) -> Optional[int]:
+        destination, source = instruction.operands
+        size = self._size(instruction)
+        self._write(destination, self._read(source, size), size)
+
+    def _op_lea(self, instruction: Instruction, index: int) -> Optional[int]:
+        destination, source = instruction.operands
+        self._write(destination, self._effective_address(source))
+
+    def _op_xchg(self, instruction: Instruction, index: int) -> Optional[int]:
+        first, second = instruction.operands
+        size = self._size(instruction)
+        a, b = self._read(first, size), self._read(second, size)
+        self._write(first, b, size)
+        self._write(second, a, size)
+
+    def _op_push(self, instruction: Instruction, index: int) -> Optional[int]:
+        self._push(self._read(instruction.operands[0]))
+
+    def _op_pop(self, instruction: Instruction, index: int) -> Optional[int]:
+        self._write(instruction.operands[0], self._pop())
+
+    def _op_cbw(self, instruction: Instruction, index: int) -> Optional[int]:
+        al = self.registers['ax'] & 0xFF
+        self.registers['ax'] = al | (0xFF00 if al & 0x80 else 0)
+
+    def _op_cwd(self, instruction: Instruction, index: int) -> Optional[int]:
+        self.registers['dx'] = 0xFFFF if self.registers['ax'] & 0x8000 else 0
+
+    def _op_nop(self, instruction: Instruction, index: int) -> Optional[int]:
+        return None
+
+    # Arithmetic and logic
+
+    def _op_add(self, instruction: Instruction, index: int) -> Optional[int]:
+        destination, source = instruction.operands
+        size = self._size(instruction)
+        self._write(destination, self._add(self._read(destination, size), self._read(source, size), size), size)
+
+    def _op_adc(self, instruction: Instruction, index: int) -> Optional[int]:
+        destination, source = instruction.operands
+        size = self._size(instruction)
+        value = self._add(self._read(destination, size), self._read(source, size), size, int(self.cf))
+        self._write(destination, value, size)
+
+    def _op_sub(self, instruction: Instruction, index: int) -> Optional[int]:
+        destination, source = instruction.operands
+        size = self._size(instruction)
+        self._write(destination, self._sub(self._read(destination, size), self._read(source, size), size), size)
+
+    def _op_sbb(self, instruction: Instruction, index: int) -> Optional[int]:
+        destination, source = instruction.operands
+        size = self._size(instruction)
+        value = self._sub(self._read(destination, size), self._read(source, size), size, int(self.cf))
+        self._write(destination, value, size)
+
+    def _op_cmp(self, instruction: Instruction, index: int) -> Optional[int]:
+        first, second = instruction.operands
+        size = self._size(instruction)
+        self._sub(self._read(first, size), self._read(second, size), size)
+
+    def _op_and(self, instruction: Instruction, index: int) -> Optional[int]:
+        destination, source = instruction.operands
+        size = self._size(instruction)
+        value = self._read(destination, size) & self._read(source, size)
+        self._set_logic_flags(value, size)
+        self._write(destination, value, size)
+
+    def _op_or(self, instruction: Instruction, index: int) -> Optional[int]:
+        destination, source = instruction.operands
+        size = self._size(instruction)
+        value = self._read(destination, size) | self._read(source, size)
+        self._set_logic_flags(value, size)
+        self._write(destination, value, size)
+
+    def _op_xor(self, instruction: Instruction, index: int) -> Optional[int]:
+        destination, source = instruction.operands
+        size = self._size(instruction)
+        value = self._read(destination, size) ^ self._read(source, size)
+        self._set_logic_flags(value, size)
+        self._write(destination, value, size)
+
+    def _op_test(self, instruction: Instruction, index: int) -> Optional[int]:
+        first, second = instruction.operands
+        size = self._size(instruction)
+        self._set_logic_flags(self._read(first, size) & self._read(second, size), size)
+
+    def _op_inc(self, instruction: Instruction, index: int) -> Optional[int]:
+        operand = instruction.operands[0]
+        size = self._size(instruction)
+        carry = self.cf
+        self._write(operand, self._add(self._read(operand, size), 1, size), size)
+        self.cf = carry
+
+    def _op_dec(self, instruction: Instruction, index: int) -> Optional[int]:
+        operand = instruction.operands[0]
+        size = self._size(instruction)
+        carry = self.cf
+        self._write(operand, self._sub(self._read(operand, size), 1, size), size)
+        self.cf = carry
+
+    def _op_neg(self, instruction: Instruction, index: int) -> Optional[int]:
+        operand = instruction.operands[0]
+        size = self._size(instruction)
+        self._write(operand, self._sub(0, self._read(operand, size), size), size)
+
+    def _op_not(self, instruction: Instruction, index: int) -> Optional[int]:
+        operand = instruction.operands[0]
+        size = self._size(instruction)
+        self._write(operand, ~self._read(operand, size), size)
+
+    def _op_mul(self, instruction: Instruction, index: int) -> Optional[int]:
+        source = instruction.operands[0]
+        size = self._size(instruction)
+        if size == 8:
+            product = (self.registers['ax'] & 0xFF) * self._read(source, 8)
+            self.registers['ax'] = product & 0xFFFF
+            self.cf = self.of = product > 0xFF
+        else:
+            product = self.registers['ax'] * self._read(source)
+            self.registers['ax'] = product & 0xFFFF
+            self.registers['dx'] = product >> 16
+            self.cf = self.of = product > 0xFFFF
+
+    def _op_div(self, instruction: Instruction, index: int) -> Optional[int]:
+        source = instruction.operands[0]
+        size = self._size(instruction)
+        divisor = self._read(source, size)
+        if size == 8:
+            dividend = self.registers['ax']
+            if divisor == 0 or dividend // divisor > 0xFF:
+                raise EmulatorError(f"Line {instruction.line_number}: divide overflow")
+            self.registers['ax'] = (dividend % divisor) << 8 | dividend // divisor
+        else:
+            dividend = (self.registers['dx'] << 16) | self.registers['ax']
+            if divisor == 0 or dividend // divisor > 0xFFFF:
+                raise EmulatorError(f"Line {instruction.line_number}: divide overflow")
+            self.registers['ax'] = dividend // divisor
+            self.registers['dx'] = dividend % divisor
+
+    def _shift_count(self, instruction: Instruction) -> int:
+        return self._read(instruction.operands[1], 8) & 0x1F
+
+    def _op_shl(self, instruction: Instruction, index: int) -> Optional[int]:
+        operand = instruction.operands[0]
+        size = self._size(instruction)
+        count = self._shift_count(instruction)
+        if count:
+            mask = 0xFF if size == 8 else 0xFFFF
+            shifted = self._read(operand, size) << count
+            result = shifted & mask
+            self.cf = bool(shifted & (mask + 1))
+            self.of = bool(result & ((mask + 1) >> 1)) != self.cf
+            self.zf = result == 0
+            self.sf = bool(result & ((mask + 1) >> 1))
+            self._write(operand, result, size)
+
+    _op_sal = _op_shl
+
+    def _op_shr(self, instruction: Instruction, index: int) -> Optional[int]:
+        operand = instruction.operands[0]
+        size = self._size(instruction)
+        count = self._shift_count(instruction)
+        if count:
+            value = self._read(operand, size)
+            result = value >> count
+            self.cf = bool((value >> (count - 1)) & 1)
+            self.of = bool(value & ((0xFF if size == 8 else 0xFFFF) + 1) >> 1)
+            self.zf = result == 0
+            self.sf = False
+            self._write(operand, result, size)
+
+    def _op_sar(self, instruction: Instruction, index: int) -> Optional[int]:
+        operand = instruction.operands[0]
+        size = self._size(instruction)
+        count = self._shift_count(instruction)
+        if count:
+            bits = 8 if size == 8 else 16
+            value = self._read(operand, size)
+            signed = value - (1 << bits) if value & (1 << (bits - 1)) else value
+            result = (signed >> count) & ((1 << bits) - 1)
+            self.cf = bool((signed >> (count - 1)) & 1)
+            self.of = False
+            self.zf = result == 0
+            self.sf = bool(result & (1 << (bits - 1)))
+            self._write(operand, result, size)
+
+    # Control transfer
+
+    def _op_jmp(self, instruction: Instruction, index: int) -> Optional[int]:
+        return instruction.target
+
+    def _op_loop(self, instruction: Instruction, index: int) -> Optional[int]:
+        self.registers['cx'] = (self.registers['cx'] - 1) & 0xFFFF
+        return instruction.target if self.registers['cx'] else None
+
+    def _op_jcxz(self, instruction: Instruction, index: int) -> Optional[int]:
+        return instruction.target if self.registers['cx'] == 0 else None
+
+    def _op_call(self, instruction: Instruction, index: int) -> Optional[int]:
+        self._push(index + 1)
+        self.call_depth += 1
+        return instruction.target
+
+    def _op_ret(self, instruction: Instruction, index: int) -> Optional[int]:
+        if self.call_depth == 0:
+            # Far return from the entry procedure hands control back to DOS
+            return -1
+        self.call_depth -= 1
+        return self._pop()
+
+    def _op_int(self, instruction: Instruction, index: int) -> Optional[int]:
+        number = instruction.operands[0].value
+        if number == 0x20:
+            return -1
+        if number != 0x21:
+            raise EmulatorError(f"Line {instruction.line_number}: unsupported interrupt {number:#x}")
+
+        function = (self.registers['ax'] >> 8) & 0xFF
+        if function == 0x02:
+            self.output.append(chr(self.registers['dx'] & 0xFF))
+            self.registers['ax'] = (self.registers['ax'] & 0xFF00) | (self.registers['dx'] & 0xFF)
+        elif function == 0x09:
+            address = self.registers['dx']
+            end = self.memory.find(b'$', address)
+            if end < 0:
+                raise EmulatorError(f"Line {instruction.line_number}: unterminated '$' string")
+            self.output.append(self.memory[address:end].decode('latin-1'))
+        elif function == 0x0A:
+            self._buffered_input(self.registers['dx'])
+        elif function == 0x4C:
+            self.exit_code = self.registers['ax'] & 0xFF
+            return -1
+        else:
+            raise EmulatorError(f"Line {instruction.line_number}: unsupported int 21h function {function:#04x}")
+        return None
+
+    def _buffered_input(self, address: int):
+        """DOS function 0Ah: read a line into a (max, count, text) buffer."""
+        maximum = self.memory[address]
+        line = self.io.read_line() if self.io else ""
+        text = line.encode('latin-1', 'replace')[:max(maximum - 1, 0)]
+        self.memory[address + 1] = len(text)
+        self.memory[address + 2:address + 2 + len(text)] = text
+        self.memory[address + 2 + len(text)] = 0x0D
+
+
+def emulate(source: str, io: Any = None, max_instructions: Optional[int] = 10_000_000) -> EmulationResult:
+    """
+    Convenience function to load and run generated assembly.
+
+    Args:
+        source: Assembly source text
+        io: I/O backend with read_line() (output is captured in the result)
+        max_instructions: Instruction budget
+
+    Returns:
+        EmulationResult with output, instruction count and cycles
+    """
+    image = ProgramImage(source)
+    return CPU8086(io, max_instructions).run(image)
+
+
+def emulate_file(filename: str, io: Any = None, max_instructions: Optional[int] = 10_000_000) -> EmulationResult:
+    """
+    Convenience function to run a generated .asm file.
+
+    Args:
+        filename: Path to the assembly file
+        io: I/O backend with read_line()
+        max_instructions: Instruction budget
+
+    Returns:
+        EmulationResult with output, instruction count and cycles
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        return emulate(f.read(), io, max_instructions)
+
+
+if __name__ == "__main__":
+    # Example usage
+    import sys
+
+    if len(sys.argv) != 2:
+        print("Usage: python -m emulator.cpu8086 <program.asm>")
+        sys.exit(1)
+
+    result = emulate_file(sys.argv[1])
+    print(result.output)
+    print(f"\n{result.summary()}")
@@ -43,6 +43,52 @@ class Quadruple:
     operand1: str
     operand2: str
     result: str
+    line: int = 0  # Source line that produced the quadruple
+
+
+# Relational operators and the operator that tests the opposite outcome
+NEGATED_RELATIONS = {'<': '>=', '>=': '<', '>': '<=', '<=': '>', '==': '!=', '!=': '=='}
+ARITHMETIC_TOKENS = {'+', '-', '*', '/'}
+
+# Booleans are stored as 0/1 bytes (DB, after the word declarations so words stay
+# aligned), so boolean literals compare as these constants
+BOOLEAN_LITERALS = {'True': '1', 'False': '0'}
+
+# Statement recognition patterns, compiled once at import and shared by every analyzer
+
+# Variable declarations
+DECLARATION_PATTERNS = (
+    re.compile(r'(^str)\s*([a-zA-Z]+[0-9]*)\s*(;$)'),     # String declarations
+    re.compile(r'(^int)\s*([a-zA-Z]+[0-9]*)\s*(;$)'),     # Integer declarations  
+    re.compile(r'(^boolean)\s*([a-zA-Z]+[0-9]*)\s*(;$)')  # Boolean declarations
+)
+
+# Declaration with assignment
+DECLARE_ASSIGN_PATTERNS = (
+    re.compile(r'(^str)\s*([a-zA-Z]+[0-9]*)\s*=\s*(\"[^\"]*\")\s*(;$)'),     # String with assignment
+    re.compile(r'(^int)\s*([a-zA-Z]+[0-9]*)\s*=\s*([0-9]+)\s*(;$)'),        # Integer with assignment
+    re.compile(r'(^boolean)\s*([a-zA-Z]+[0-9]*)\s*=\s*(True|False)\s*(;$)') # Boolean with assignment
+)
+
+# Declaration with variable assignment
+DECLARE_ASSIGN_VAR_PATTERNS = (
+    re.compile(r'(^str)\s*([a-zA-Z]+[0-9]*)\s*=\s*([a-zA-Z]+[0-9]*)\s*(;$)'),
+    re.compile(r'(^int)\s*([a-zA-Z]+[0-9]*)\s*=\s*([a-zA-Z]+[0-9]*)\s*(;$)'),
+    re.compile(r'(^boolean)\s*([a-zA-Z]+[0-9]*)\s*=\s*([a-zA-Z]+[0-9]*)\s*(;$)')
+)
+
+# Assignment patterns
+ASSIGNMENT_PATTERNS = (
+    re.compile(r'^([a-zA-Z]+[0-9]*)\s*=\s*(True|False)\s*(;$)'),      # Boolean assignment
+    re.compile(r'^([a-zA-Z]+[0-9]*)\s*=\s*([a-zA-Z]+[0-9]*)\s*(;$)'), # Variable assignment
+    re.compile(r'^([a-zA-Z]+[0-9]*)\s*=\s*([0-9]+)\s*(;$)'),         # Integer assignment
+    re.compile(r'^([a-zA-Z]+[0-9]*)\s*=\s*(\"[^\"]*\")\s*(;$)')      # String assignment
+)
+
+# Expression and print argument tokenizers
+EXPRESSION_TOKEN_PATTERN = re.compile(r'\d+|[a-zA-Z]+\d*|[-+*/()]')
+PRINT_ELEMENT_PATTERN = re.compile(r'"[^"]*"|[^+\s]+')
+CONDITION_TOKEN_PATTERN = re.compile(r'\d+|[a-zA-Z]+\d*|&&|\|\||==|!=|<=|>=|[-+*/()<>!]')
 
 
 class LexicalAnalyzer:
@@ -68,41 +114,24 @@ class LexicalAnalyzer:
         self.operation_in_comparison = False
         self.error_occurred = False
         self.should_reset = True
-        self.last_temp = 't4'
+        self.temp_counter = 0
+        self.last_temp = '_t0'
+        self.current_line = 0
+        self.label_counter = 0
+        self.block_stack: List[Tuple[str, ...]] = []
         
         # Compile regex patterns for different statement types
         self._compile_patterns()
     
     def _compile_patterns(self):
-        """Compile regex patterns for statement recognition."""
-        # Variable declarations
-        self.declaration_patterns = [
-            re.compile(r'(^str)\s*([a-zA-Z]+[0-9]*)\s*(;$)'),     # String declarations
-            re.compile(r'(^int)\s*([a-zA-Z]+[0-9]*)\s*(;$)'),     # Integer declarations  
-            re.compile(r'(^boolean)\s*([a-zA-Z]+[0-9]*)\s*(;$)')  # Boolean declarations
-        ]
-        
-        # Declaration with assignment
-        self.declare_assign_patterns = [
-            re.compile(r'(^str)\s*([a-zA-Z]+[0-9]*)\s*=\s*(\"[^\"]*\")\s*(;$)'),     # String with assignment
-            re.compile(r'(^int)\s*([a-zA-Z]+[0-9]*)\s*=\s*([0-9]+)\s*(;$)'),        # Integer with assignment
-            re.compile(r'(^boolean)\s*([a-zA-Z]+[0-9]*)\s*=\s*(True|False)\s*(;$)') # Boolean with assignment
-        ]
-        
-        # Declaration with variable assignment
-        self.declare_assign_var_patterns = [
-            re.compile(r'(^str)\s*([a-zA-Z]+[0-9]*)\s*=\s*([a-zA-Z]+[0-9]*)\s*(;$)'),
-            re.compile(r'(^int)\s*([a-zA-Z]+[0-9]*)\s*=\s*([a-zA-Z]+[0-9]*)\s*(;$)'),
-            re.compile(r'(^boolean)\s*([a-zA-Z]+[0-9]*)\s*=\s*([a-zA-Z]+[0-9]*)\s*(;$)')
-        ]
-        
-        # Assignment patterns
-        self.assignment_patterns = [
-            re.compile(r'^([a-zA-Z]+[0-9]*)\s*=\s*(True|False)\s*(;$)'),      # Boolean assignment
-            re.compile(r'^([a-zA-Z]+[0-9]*)\s*=\s*([a-zA-Z]+[0-9]*)\s*(;$)'), # Variable assignment
-            re.compile(r'^([a-zA-Z]+[0-9]*)\s*=\s*([0-9]+)\s*(;$)'),         # Integer assignment
-            re.compile(r'^([a-zA-Z]+[0-9]*)\s*=\s*(\"[^\"]*\")\s*(;$)')      # String assignment
-        ]
+        """Bind the statement recognition patterns, which are compiled once at import."""
+        self.declaration_patterns = DECLARATION_PATTERNS
+        self.declare_assign_patterns = DECLARE_ASSIGN_PATTERNS
+        self.declare_assign_var_patterns = DECLARE_ASSIGN_VAR_PATTERNS
+        self.assignment_patterns = ASSIGNMENT_PATTERNS
+        self.expression_token_pattern = EXPRESSION_TOKEN_PATTERN
+        self.print_element_pattern = PRINT_ELEMENT_PATTERN
+        self.condition_token_pattern = CONDITION_TOKEN_PATTERN
     
     def is_reserved_word(self, word: str, check_data_types: bool = False) -> bool:
         """
@@ -165,6 +194,237 @@ class LexicalAnalyzer:
                 identifier = f"n{len(self.number_table)}"
                 self.number_table.append(NumberEntry(num_value, identifier))
     
+    def new_temp(self) -> str:
+        """
+        Create a new temporary name for intermediate results.
+        
+        Temporaries start with an underscore, which identifiers cannot, so
+        they never clash with a user variable.
+        """
+        self.temp_counter += 1
+        self.last_temp = f"_t{self.temp_counter}"
+        return self.last_temp
+    
+    def new_label(self) -> str:
+        """Create a new label name for jump targets."""
+        self.label_counter += 1
+        return f"L{self.label_counter}"
+    
+    def emit(self, operator: str, operand1: str = "", operand2: str = "", result: str = ""):
+        """Append a quadruple to the intermediate code."""
+        self.quadruples.append(Quadruple(operator, operand1, operand2, result, self.current_line))
+    
+    def generate_expression_code(self, expression: str) -> str:
+        """
+        Lower an arithmetic expression into quadruples.
+        
+        Uses recursive descent over the grammar
+        E -> E (+|-) T | T,  T -> T (*|/) F | F,  F -> (E) | id | num
+        
+        Args:
+            expression: Arithmetic expression without the assignment target
+            
+        Returns:
+            Name of the variable, constant or temporary holding the result
+        """
+        tokens = self.expression_token_pattern.findall(expression)
+        position = 0
+        
+        def peek() -> Optional[str]:
+            return tokens[position] if position < len(tokens) else None
+        
+        def advance() -> str:
+            nonlocal position
+            token = tokens[position]
+            position += 1
+            return token
+        
+        def parse_factor() -> str:
+            token = advance()
+            if token == '(':
+                operand = parse_expression()
+                advance()  # Closing parenthesis
+                return operand
+            return token
+        
+        def parse_term() -> str:
+            left = parse_factor()
+            while peek() in ('*', '/'):
+                operator = advance()
+                right = parse_factor()
+                temp = self.new_temp()
+                self.emit(operator, left, right, temp)
+                left = temp
+            return left
+        
+        def parse_expression() -> str:
+            left = parse_term()
+            while peek() in ('+', '-'):
+                operator = advance()
+                right = parse_term()
+                temp = self.new_temp()
+                self.emit(operator, left, right, temp)
+                left = temp
+            return left
+        
+        return parse_expression()
+    
+    def parse_condition(self, condition: str) -> Optional[Tuple]:
+        """
+        Parse an if/while condition into a tree.
+        
+        Uses recursive descent over the grammar
+        C -> C || A | A,  A -> A && N | N,  N -> !N | (C) | R,  R -> E relop E | E
+        
+        Nodes are ('or', left, right), ('and', left, right), ('not', operand),
+        ('rel', operator, left_expression, right_expression) and ('value', expression),
+        where expressions are arithmetic expression strings.
+        
+        Args:
+            condition: Condition text without the surrounding if(...)/while(...)
+            
+        Returns:
+            Condition tree, or None if the condition is malformed
+        """
+        tokens = self.condition_token_pattern.findall(condition)
+        position = 0
+        
+        def peek(offset: int = 0) -> Optional[str]:
+            index = position + offset
+            return tokens[index] if index < len(tokens) else None
+        
+        def parse_expression_tokens() -> str:
+            nonlocal position
+            start = position
+            depth = 0
+            while position < len(tokens):
+                token = tokens[position]
+                if token == '(':
+                    depth += 1
+                elif token == ')':
+                    if depth == 0:
+                        break
+                    depth -= 1
+                elif depth == 0 and (token in NEGATED_RELATIONS or token in ('&&', '||', '!')):
+                    break
+                position += 1
+            if position == start or depth != 0:
+                raise ValueError("expected an expression")
+            return ' '.join(tokens[start:position])
+        
+        def parse_relation() -> Tuple:
+            nonlocal position
+            left = parse_expression_tokens()
+            if peek() in NEGATED_RELATIONS:
+                operator = tokens[position]
+                position += 1
+                return ('rel', operator, left, parse_expression_tokens())
+            return ('value', left)
+        
+        def parse_not() -> Tuple:
+            nonlocal position
+            if peek() == '!':
+                position += 1
+                return ('not', parse_not())
+            if peek() == '(':
+                # A parenthesised condition, unless the parentheses group arithmetic
+                saved = position
+                try:
+                    position += 1
+                    node = parse_or()
+                    if peek() == ')' and peek(1) not in ARITHMETIC_TOKENS and peek(1) not in NEGATED_RELATIONS:
+                        position += 1
+                        return node
+                except ValueError:
+                    pass
+                position = saved
+            return parse_relation()
+        
+        def parse_and() -> Tuple:
+            nonlocal position
+            left = parse_not()
+            while peek() == '&&':
+                position += 1
+                left = ('and', left, parse_not())
+            return left
+        
+        def parse_or() -> Tuple:
+            nonlocal position
+            left = parse_and()
+            while peek() == '||':
+                position += 1
+                left = ('or', left, parse_and())
+            return left
+        
+        try:
+            tree = parse_or()
+        except (ValueError, IndexError):
+            return None
+        return tree if position == len(tokens) else None
+    
+    def generate_condition_code(self, node: Tuple, false_label: str):
+        """
+        Emit short-circuit jumping code that reaches false_label when a condition fails.
+        
+        Each comparison becomes one conditional jump; the right operand of
+        && and || is only evaluated when it can change the outcome, and no
+        boolean value is ever stored.
+        
+        Args:
+            node: Condition tree from parse_condition
+            false_label: Label to jump to when the condition is false
+        """
+        self.generate_jump_code(node, false_label, False)
+    
+    def generate_jump_code(self, node: Tuple, label: str, jump_when: bool):
+        """
+        Emit code that jumps to label when the condition equals jump_when and falls through otherwise.
+        
+        Args:
+            node: Condition tree from parse_condition
+            label: Jump target
+            jump_when: Outcome of the condition that takes the jump
+        """
+        kind = node[0]
+        
+        if kind == 'not':
+            self.generate_jump_code(node[1], label, not jump_when)
+        
+        elif kind in ('and', 'or'):
+            # 'a && b' fails as soon as a fails; 'a || b' holds as soon as a holds
+            decided_by_left = (kind == 'or')
+            if jump_when == decided_by_left:
+                self.generate_jump_code(node[1], label, jump_when)
+                self.generate_jump_code(node[2], label, jump_when)
+            else:
+                skip = self.new_label()
+                self.generate_jump_code(node[1], skip, decided_by_left)
+                self.generate_jump_code(node[2], label, jump_when)
+                self.emit('label', '', '', skip)
+        
+        elif kind == 'rel':
+            _, operator, left, right = node
+            operand1 = self.generate_relation_operand(left)
+            operand2 = self.generate_relation_operand(right)
+            if not jump_when:
+                operator = NEGATED_RELATIONS[operator]
+            self.emit('j' + operator, operand1, operand2, label)
+        
+        elif node[1] in ('True', 'False'):
+            if (node[1] == 'True') == jump_when:
+                self.emit('goto', '', '', label)
+        
+        else:
+            # Any other value holds when it is non-zero
+            operand = self.generate_expression_code(node[1])
+            self.emit('j!=' if jump_when else 'j==', operand, '0', label)
+    
+    def generate_relation_operand(self, expression: str) -> str:
+        """Lower one side of a comparison, turning a boolean literal into its 0/1 constant."""
+        if expression in BOOLEAN_LITERALS:
+            return BOOLEAN_LITERALS[expression]
+        return self.generate_expression_code(expression)
+    
     def process_variable_declaration(self, line: List[str]) -> bool:
         """Process a variable declaration statement."""
         line_content, line_number = line
@@ -232,6 +492,10 @@ class LexicalAnalyzer:
                     print(f'Error, variable already declared, on line {line_number}')
                     return False
                 
+                # Inside a block the initializer runs every time the block does
+                if self.block_stack and data_type != DataType.STRING:
+                    self.emit('=', str(int(value)), '', var_name)
+                
                 return True
         
         return False
@@ -257,12 +521,15 @@ class LexicalAnalyzer:
             print(f'Error, variable not declared, on line {line_number}')
             return False
         
-        # Type checking and assignment based on assignment_type
+        # Type checking and assignment based on assignment_type.
+        # int/boolean assignments become runtime quadruples so the symbol
+        # table keeps the initial value; strings are resolved at compile time,
+        # where check_string_assignment allows it.
         if assignment_type == 0:  # Boolean assignment
             if symbol.data_type != DataType.BOOLEAN:
                 print(f'Error, trying to assign boolean to non-boolean variable on line {line_number}')
                 return False
-            symbol.value = value_str == "True"
+            self.emit('=', '1' if value_str == "True" else '0', '', var_name)
         
         elif assignment_type == 1:  # Variable assignment
             source_symbol = self.find_symbol(value_str)
@@ -272,30 +539,60 @@ class LexicalAnalyzer:
             if symbol.data_type != source_symbol.data_type:
                 print(f'Error, type mismatch in assignment on line {line_number}')
                 return False
-            symbol.value = source_symbol.value
+            if symbol.data_type == DataType.STRING:
+                if not self.check_string_assignment(var_name, line_number, value_str):
+                    return False
+                symbol.value = source_symbol.value
+            else:
+                self.emit('=', value_str, '', var_name)
         
         elif assignment_type == 2:  # Integer assignment
             if symbol.data_type != DataType.INT:
                 print(f'Error, trying to assign integer to non-integer variable on line {line_number}')
                 return False
-            symbol.value = int(value_str)
+            self.add_to_number_table([value_str])
+            self.emit('=', value_str, '', var_name)
         
         elif assignment_type == 3:  # String assignment
             if symbol.data_type != DataType.STRING:
                 print(f'Error, trying to assign string to non-string variable on line {line_number}')
                 return False
+            if not self.check_string_assignment(var_name, line_number):
+                return False
             symbol.value = value_str
         
         return True
     
+    def check_string_assignment(self, name: str, line_number: int, source: Optional[str] = None) -> bool:
+        """
+        Check that a string assignment can be resolved at compile time.
+        
+        Strings have no runtime store: an assignment replaces the variable's
+        value for the whole program. That only matches the program's meaning
+        at the top level, before the variable is printed or read, and from a
+        source string that is never read.
+        """
+        if self.block_stack:
+            print(f'Error, string {name} cannot be assigned inside if/while, on line {line_number}')
+            return False
+        used = {quad.operand1 if quad.operator == 'print' else quad.result
+                for quad in self.quadruples if quad.operator in ('print', 'read')}
+        if name in used:
+            print(f'Error, string {name} cannot be assigned after it is printed or read, on line {line_number}')
+            return False
+        if source is not None and any(quad.operator == 'read' and quad.result == source for quad in self.quadruples):
+            print(f'Error, string {name} cannot be assigned from {source}, which is read at run time, '
+                  f'on line {line_number}')
+            return False
+        return True
+    
     def process_arithmetic_expression(self, line: List[str], iteration: int) -> bool:
-        """Process arithmetic expressions with LR parsing."""
-        # This would integrate with the LR parser from lr_parser.py
-        # For now, returning True as placeholder
+        """Process arithmetic expressions, emitting quadruples for them."""
         line_content, line_number = line
         
-        # Extract expression part
-        expression = re.sub(r'.*=\s*', '', line_content).replace(" ", "")
+        # Extract target and expression parts
+        target = re.match(r'^(?:int\s+)?([a-zA-Z]+[0-9]*)\s*=', line_content).group(1)
+        expression = re.sub(r'.*=\s*', '', line_content).replace(" ", "").rstrip(';')
         variables = re.findall(r'[a-zA-Z]+\d*', expression)
         numbers = re.findall(r'\b\d+\b', expression)
         
@@ -313,55 +610,133 @@ class LexicalAnalyzer:
             print(f'Error, unbalanced parentheses on line {line_number}')
             return False
         
+        # Declare the target when the expression initializes a new variable
+        if line_content.startswith('int'):
+            if self.is_reserved_word(target):
+                print(f'Cannot declare variables with reserved words, error on line {line_number}')
+                return False
+            if not self.add_to_symbol_table(target, DataType.INT, 0):
+                print(f'Error, variable already declared, on line {line_number}')
+                return False
+        
+        symbol = self.find_symbol(target)
+        if not symbol:
+            print(f'Error, variable {target} not declared, on line {line_number}')
+            return False
+        if symbol.data_type != DataType.INT:
+            print(f'Error, trying to assign integer to non-integer variable on line {line_number}')
+            return False
+        
+        result = self.generate_expression_code(expression)
+        self.emit('=', result, '', target)
+        
         print(f'Syntax analysis line {line_number}: Correct')
         return True
     
     def process_control_structure(self, line: List[str], iteration: int) -> bool:
-        """Process if and while statements."""
+        """Process if and while statements, emitting their condition jumps."""
         line_content, line_number = line
         
         # Extract condition
         if line_content.startswith('if('):
+            kind = 'if'
             condition = re.sub(r'^if\(', '', line_content)
         elif line_content.startswith('while('):
+            kind = 'while'
             condition = re.sub(r'^while\(', '', line_content)
         else:
             return False
         
-        condition = re.sub(r'\){.*', '', condition)
+        condition = re.sub(r'\)\s*{.*', '', condition)
         
         if condition in ['True', 'False']:
             print(f'Logic analysis line {line_number}: Correct')
             print(f'Comparison {condition}')
-            return True
+        else:
+            variables = re.findall(r'[a-zA-Z]+\d*', condition)
+            for var in variables:
+                if var not in ('True', 'False') and not self.find_symbol(var):
+                    print(f'Error, variable {var} not declared in condition, on line {line_number}')
+                    return False
         
-        # Process condition (simplified)
-        variables = re.findall(r'[a-zA-Z]+\d*', condition)
-        for var in variables:
-            if not self.find_symbol(var):
-                print(f'Error, variable {var} not declared in condition, on line {line_number}')
+        tree = self.parse_condition(condition)
+        if tree is None:
+            print(f'Error, malformed condition on line {line_number}')
+            return False
+        self.add_to_number_table(re.findall(r'\b\d+\b', condition))
+        
+        if kind == 'while':
+            start = self.new_label()
+            end = self.new_label()
+            self.emit('label', '', '', start)
+            self.generate_condition_code(tree, end)
+            self.block_stack.append(('while', start, end))
+        else:
+            end = self.new_label()
+            self.generate_condition_code(tree, end)
+            self.block_stack.append(('if', end))
+        
+        if condition not in ['True', 'False']:
+            print(f'Logic analysis line {line_number}: Correct')
+        return True
+    
+    def process_block_end(self, line: List[str]) -> bool:
+        """Close the innermost if/else/while block ('}' or '} else {')."""
+        line_content, line_number = line
+        
+        if not self.block_stack:
+            print(f'Error, unmatched closing brace on line {line_number}')
+            return False
+        
+        block = self.block_stack.pop()
+        if re.match(r'^}\s*else\s*{$', line_content):
+            if block[0] != 'if':
+                print(f'Error, else without if on line {line_number}')
                 return False
+            end = self.new_label()
+            self.emit('goto', '', '', end)
+            self.emit('label', '', '', block[1])
+            self.block_stack.append(('else', end))
+            return True
         
-        print(f'Logic analysis line {line_number}: Correct')
+        if block[0] == 'while':
+            self.emit('goto', '', '', block[1])
+            self.emit('label', '', '', block[2])
+        else:
+            self.emit('label', '', '', block[1])
+        return True
+    
+    def check_blocks_closed(self) -> bool:
+        """Report if/while blocks left open at the end of the program."""
+        if self.block_stack:
+            print(f'Error, {len(self.block_stack)} block(s) not closed at end of program')
+            return False
         return True
     
     def process_print_statement(self, line: List[str], iteration: int) -> bool:
-        """Process print statements."""
+        """Process print statements, emitting one print quadruple per element."""
         line_content, line_number = line
         
         # Extract print content
         content = re.sub(r'^print\(', '', line_content)
         content = re.sub(r'\);\s*$', '', content)
         
-        # Find variables in print statement
-        variables = re.findall(r'[a-zA-Z]+[0-9]*', content)
+        elements = self.print_element_pattern.findall(content)
         
         # Validate all variables are declared
-        for var in variables:
-            if not self.find_symbol(var):
-                print(f'Error on line {line_number}, variable {var} not declared')
+        for element in elements:
+            if element.startswith('"') or element.isdigit():
+                continue
+            if not self.find_symbol(element):
+                print(f'Error on line {line_number}, variable {element} not declared')
                 return False
         
+        # Literals keep their quotes so code generation can tell them apart
+        for element in elements:
+            if element.isdigit():
+                element = f'"{element}"'
+            self.emit('print', element)
+        
         return True
     
     def process_read_statement(self, line: List[str], iteration: int) -> bool:
@@ -380,6 +755,7 @@ class LexicalAnalyzer:
         
         # Mark as requiring input
         symbol.read_status = 'SiRead'
+        self.emit('read', '', '', var_name)
         return True
     
     def analyze_line(self, line: List[str], iteration: int) -> bool:
@@ -397,6 +773,9 @@ class LexicalAnalyzer:
             self.symbol_table.clear()
             self.number_table.clear()
             self.quadruples.clear()
+            self.temp_counter = 0
+            self.label_counter = 0
+            self.block_stack = []
             self.should_reset = False
         
         if not self.logic_result:
@@ -405,6 +784,7 @@ class LexicalAnalyzer:
             return True
         
         line_content = line[0]
+        self.current_line = line[1]
         
         # Try variable declaration
         if self.process_variable_declaration(line):
@@ -427,11 +807,11 @@ class LexicalAnalyzer:
             return self.process_arithmetic_expression(line, iteration)
         
         # Try control structures
-        if re.match(r'^if\(.*\){$|^if\(.*\){', line_content) or re.match(r'^while\(.*\){$|^while\(.*\){', line_content):
+        if re.match(r'^if\(.*\)\s*{', line_content) or re.match(r'^while\(.*\)\s*{', line_content):
             return self.process_control_structure(line, iteration)
         
         # Try print statements
-        if re.match(r'^print\([a-zA-Z0-9\+\s"]*\);', line_content):
+        if re.match(r'^print\(\s*("[^"]*"|[a-zA-Z0-9]+)(\s*\+\s*("[^"]*"|[a-zA-Z0-9]+))*\s*\);', line_content):
             return self.process_print_statement(line, iteration)
         
         # Try read statements
@@ -440,7 +820,7 @@ class LexicalAnalyzer:
         
         # Try closing brace
         if re.match(r'}', line_content):
-            return True
+            return self.process_block_end(line)
         
         # If nothing matches, it's a syntax error
         print(f"Error, check line {line[1]} as there is a syntax error in declaration or assignment")
@@ -468,6 +848,11 @@ class LexicalAnalyzer:
         self.operation_in_comparison = False
         self.error_occurred = False
         self.should_reset = True
+        self.temp_counter = 0
+        self.last_temp = '_t0'
+        self.current_line = 0
+        self.label_counter = 0
+        self.block_stack = []
 
 
 def analyze_source_lines(lines: List[List[str]], iteration: int = 0) -> Tuple[bool, LexicalAnalyzer]:
@@ -488,6 +873,9 @@ def analyze_source_lines(lines: List[List[str]], iteration: int = 0) -> Tuple[bo
         if not analyzer.analyze_line(line, iteration):
             success = False
     
+    if not analyzer.check_blocks_closed():
+        success = False
+    
     return success, analyzer
 
 
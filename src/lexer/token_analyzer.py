@@ -69,6 +69,71 @@ class Token(NamedTuple):
     column: int
 
 
+# Token patterns (order matters for precedence)
+TOKEN_PATTERNS = [
+    # Keywords (must come before IDENTIFIER)
+    (TokenType.MAIN, r'\bmain\b'),
+    (TokenType.INT, r'\bint\b'),
+    (TokenType.BOOLEAN, r'\bboolean\b'),
+    (TokenType.STRING, r'\bstr\b'),
+    (TokenType.IF, r'\bif\b'),
+    (TokenType.ELSE, r'\belse\b'),
+    (TokenType.WHILE, r'\bwhile\b'),
+    (TokenType.READ, r'\bread\b'),
+    (TokenType.PRINT, r'\bprint\b'),
+    (TokenType.TRUE, r'\bTrue\b'),
+    (TokenType.FALSE, r'\bFalse\b'),
+
+    # Multi-character operators (must come before single-character)
+    (TokenType.EQUAL, r'=='),
+    (TokenType.NOT_EQUAL, r'!='),
+    (TokenType.LESS_EQUAL, r'<='),
+    (TokenType.GREATER_EQUAL, r'>='),
+    (TokenType.LOGICAL_AND, r'&&'),
+    (TokenType.LOGICAL_OR, r'\|\|'),
+
+    # Single-character operators
+    (TokenType.ASSIGN, r'='),
+    (TokenType.LESS_THAN, r'<'),
+    (TokenType.GREATER_THAN, r'>'),
+    (TokenType.LOGICAL_NOT, r'!'),
+    (TokenType.PLUS, r'\+'),
+    (TokenType.MINUS, r'-'),
+    (TokenType.MULTIPLY, r'\*'),
+    (TokenType.DIVIDE, r'/'),
+
+    # Delimiters
+    (TokenType.LEFT_PAREN, r'\('),
+    (TokenType.RIGHT_PAREN, r'\)'),
+    (TokenType.LEFT_BRACE, r'\{'),
+    (TokenType.RIGHT_BRACE, r'\}'),
+    (TokenType.SEMICOLON, r';'),
+    (TokenType.COMMA, r','),
+
+    # Literals
+    (TokenType.STRING_LITERAL, r'"[^"]*"'),
+    (TokenType.INTEGER_LITERAL, r'\b\d+\b'),
+    (TokenType.IDENTIFIER, r'\b[a-zA-Z][a-zA-Z0-9]*\b'),
+
+    # Whitespace and newlines
+    (TokenType.NEWLINE, r'\n'),
+    (TokenType.WHITESPACE, r'[ \t]+'),
+]
+
+
+def _compile_patterns(patterns: List[Tuple[TokenType, str]]) -> re.Pattern:
+    """Compile all token patterns into a single regex."""
+    pattern_groups = []
+    for token_type, pattern in patterns:
+        pattern_groups.append(f'(?P<{token_type.value}>{pattern})')
+    
+    combined_pattern = '|'.join(pattern_groups)
+    return re.compile(combined_pattern)
+
+
+COMPILED_TOKEN_PATTERN = _compile_patterns(TOKEN_PATTERNS)
+
+
 class TokenAnalyzer:
     """
     Lexical analyzer that converts source code into tokens.
@@ -79,68 +144,10 @@ class TokenAnalyzer:
         self.line_number = 1
         self.column_offset = 0
         
-        # Token patterns (order matters for precedence)
-        self.token_patterns = [
-            # Keywords (must come before IDENTIFIER)
-            (TokenType.MAIN, r'\bmain\b'),
-            (TokenType.INT, r'\bint\b'),
-            (TokenType.BOOLEAN, r'\bboolean\b'),
-            (TokenType.STRING, r'\bstr\b'),
-            (TokenType.IF, r'\bif\b'),
-            (TokenType.ELSE, r'\belse\b'),
-            (TokenType.WHILE, r'\bwhile\b'),
-            (TokenType.READ, r'\bread\b'),
-            (TokenType.PRINT, r'\bprint\b'),
-            (TokenType.TRUE, r'\bTrue\b'),
-            (TokenType.FALSE, r'\bFalse\b'),
-            
-            # Multi-character operators (must come before single-character)
-            (TokenType.EQUAL, r'=='),
-            (TokenType.NOT_EQUAL, r'!='),
-            (TokenType.LESS_EQUAL, r'<='),
-            (TokenType.GREATER_EQUAL, r'>='),
-            (TokenType.LOGICAL_AND, r'&&'),
-            (TokenType.LOGICAL_OR, r'\|\|'),
-            
-            # Single-character operators
-            (TokenType.ASSIGN, r'='),
-            (TokenType.LESS_THAN, r'<'),
-            (TokenType.GREATER_THAN, r'>'),
-            (TokenType.LOGICAL_NOT, r'!'),
-            (TokenType.PLUS, r'\+'),
-            (TokenType.MINUS, r'-'),
-            (TokenType.MULTIPLY, r'\*'),
-            (TokenType.DIVIDE, r'/'),
-            
-            # Delimiters
-            (TokenType.LEFT_PAREN, r'\('),
-            (TokenType.RIGHT_PAREN, r'\)'),
-            (TokenType.LEFT_BRACE, r'\{'),
-            (TokenType.RIGHT_BRACE, r'\}'),
-            (TokenType.SEMICOLON, r';'),
-            (TokenType.COMMA, r','),
-            
-            # Literals
-            (TokenType.STRING_LITERAL, r'"[^"]*"'),
-            (TokenType.INTEGER_LITERAL, r'\b\d+\b'),
-            (TokenType.IDENTIFIER, r'\b[a-zA-Z][a-zA-Z0-9]*\b'),
-            
-            # Whitespace and newlines
-            (TokenType.NEWLINE, r'\n'),
-            (TokenType.WHITESPACE, r'[ \t]+'),
-        ]
-        
-        # Compile all patterns into a single regex
-        self.compiled_pattern = self._compile_patterns()
-    
-    def _compile_patterns(self) -> re.Pattern:
-        """Compile all token patterns into a single regex."""
-        pattern_groups = []
-        for token_type, pattern in self.token_patterns:
-            pattern_groups.append(f'(?P<{token_type.value}>{pattern})')
-        
-        combined_pattern = '|'.join(pattern_groups)
-        return re.compile(combined_pattern)
+        # Token patterns (order matters for precedence) and their combined regex,
+        # compiled once at import and shared by every analyzer
+        self.token_patterns = TOKEN_PATTERNS
+        self.compiled_pattern = COMPILED_TOKEN_PATTERN
     
     def tokenize(self, source_code: str) -> List[Token]:
         """
@@ -0,0 +1,35 @@
+"""
+Optimizer Module
+
+Contains the machine-independent passes over the quadruple intermediate code:
+- ControlFlowGraph: Basic blocks and their successor/predecessor links
+- eliminate_dead_code: Constant branch folding, unreachable block removal
+  and dead temporary elimination
+- optimize_loops: Loop rotation and loop-invariant code motion
+- analyze_usage: Def-use tracking of declared variables, warnings and
+  dead store removal
+- coalesce_prints: Compile-time merging of adjacent constant prints
+- fold_program: Compile-time execution of programs that read no input
+- PassManager: Timed pipelines of the passes above, with -O level presets
+"""
+
+from .cfg import (
+    BasicBlock, ControlFlowGraph, fold_constant_branches, remove_unreachable_code,
+    remove_redundant_jumps, remove_dead_temporaries, eliminate_dead_code
+)
+from .loops import rotate_loops, hoist_loop_invariants, find_loops, optimize_loops
+from .variables import VariableUsage, analyze_usage, usage_warnings, remove_dead_stores, unused_variables
+from .prints import constant_print_values, coalesce_prints, count_prints
+from .evaluation import DEFAULT_STEP_BUDGET, evaluate_program, fold_program
+from .pass_manager import (
+    DEFAULT_OPTIMIZATION_LEVEL, OPTIMIZATION_LEVELS, PASSES, Pass, PassContext, PassRecord, PassManager, optimize
+)
+
+__all__ = ['BasicBlock', 'ControlFlowGraph', 'fold_constant_branches', 'remove_unreachable_code',
+           'remove_redundant_jumps', 'remove_dead_temporaries', 'eliminate_dead_code',
+           'rotate_loops', 'hoist_loop_invariants', 'find_loops', 'optimize_loops',
+           'VariableUsage', 'analyze_usage', 'usage_warnings', 'remove_dead_stores', 'unused_variables',
+           'constant_print_values', 'coalesce_prints', 'count_prints',
+           'DEFAULT_STEP_BUDGET', 'evaluate_program', 'fold_program',
+           'DEFAULT_OPTIMIZATION_LEVEL', 'OPTIMIZATION_LEVELS', 'PASSES', 'Pass', 'PassContext', 'PassRecord',
+           'PassManager', 'optimize']
@@ -0,0 +1,306 @@
+"""
+Control-Flow Graph
+
+This module splits the quadruple intermediate code into basic blocks,
+links them into a control-flow graph and removes code that can never run:
+blocks that are unreachable from the entry (bodies behind constant-false
+conditions, code after an infinite loop) and temporaries that are computed
+but never used.
+
+Control-flow quadruples:
+- ('label', '', '', L):  jump target
+- ('goto', '', '', L):   unconditional jump
+- ('j<op>', a, b, L):    jump to L if a <op> b, for <op> in < <= > >= == !=
+"""
+
+import re
+from typing import List, Dict, Any, Optional, Set, Tuple
+from dataclasses import dataclass, field, is_dataclass, replace
+
+
+CONDITIONAL_JUMPS = {
+    'j<': lambda a, b: a < b, 'j<=': lambda a, b: a <= b,
+    'j>': lambda a, b: a > b, 'j>=': lambda a, b: a >= b,
+    'j==': lambda a, b: a == b, 'j!=': lambda a, b: a != b,
+}
+JUMP_OPERATORS = set(CONDITIONAL_JUMPS) | {'goto'}
+ARITHMETIC_OPERATORS = {'+', '-', '*', '/'}
+
+WORD_MASK = 0xFFFF
+
+# Compiler-generated temporaries (_t1, _t2, ...); identifiers cannot start with '_'
+TEMP_PATTERN = re.compile(r'_t\d+$')
+
+
+@dataclass
+class BasicBlock:
+    """A maximal straight-line run of quadruples with one entry and one exit."""
+    index: int
+    quadruples: List[Any]
+    label: Optional[str] = None
+    successors: List[int] = field(default_factory=list)
+    predecessors: List[int] = field(default_factory=list)
+
+
+def unpack_quadruple(quad: Any) -> Tuple[str, str, str, str]:
+    """Return (operator, operand1, operand2, result) for either quadruple format."""
+    if hasattr(quad, 'operator'):
+        return quad.operator, quad.operand1, quad.operand2, quad.result
+    padded = list(quad) + [""] * (4 - len(quad))
+    return padded[0], padded[1], padded[2], padded[3]
+
+
+def replace_quadruple(quad: Any, operator: str, operand1: str, operand2: str, result: str) -> Any:
+    """Build a quadruple in the same format as quad, keeping its source line."""
+    if is_dataclass(quad):
+        return replace(quad, operator=operator, operand1=operand1, operand2=operand2, result=result)
+    return [operator, operand1, operand2, result]
+
+
+def is_temp(name: str) -> bool:
+    """Check whether an operand names a compiler-generated temporary."""
+    return bool(name) and TEMP_PATTERN.match(name) is not None
+
+
+class ControlFlowGraph:
+    """
+    Basic-block control-flow graph over a quadruple list.
+    """
+
+    def __init__(self, quadruples: List[Any]):
+        """
+        Build the graph.
+
+        Args:
+            quadruples: Quadruple intermediate code (dataclass or list format)
+        """
+        self.blocks: List[BasicBlock] = []
+        self.label_blocks: Dict[str, int] = {}
+        self._build(quadruples)
+
+    def _build(self, quadruples: List[Any]):
+        """Split at labels and after jumps, then link successors."""
+        current: List[Any] = []
+        for quad in quadruples:
+            operator, _, _, result = unpack_quadruple(quad)
+            if operator == 'label' and current:
+                self._add_block(current)
+                current = []
+            current.append(quad)
+            if operator in JUMP_OPERATORS:
+                self._add_block(current)
+                current = []
+        if current or not self.blocks:
+            self._add_block(current)
+
+        for block in self.blocks:
+            last = unpack_quadruple(block.quadruples[-1]) if block.quadruples else ('', '', '', '')
+            operator, target = last[0], last[3]
+            if operator in JUMP_OPERATORS:
+                if target not in self.label_blocks:
+                    raise ValueError(f"Jump to undefined label '{target}'")
+                block.successors.append(self.label_blocks[target])
+            if operator != 'goto' and block.index + 1 < len(self.blocks):
+                if block.index + 1 not in block.successors:
+                    block.successors.append(block.index + 1)
+            for successor in block.successors:
+                self.blocks[successor].predecessors.append(block.index)
+
+    def _add_block(self, quadruples: List[Any]):
+        """Append a block and register its label."""
+        block = BasicBlock(len(self.blocks), quadruples)
+        if quadruples:
+            operator, _, _, result = unpack_quadruple(quadruples[0])
+            if operator == 'label':
+                block.label = result
+                self.label_blocks[result] = block.index
+        self.blocks.append(block)
+
+    def reachable(self) -> Set[int]:
+        """Indices of the blocks reachable from the entry block."""
+        seen: Set[int] = set()
+        pending = [0] if self.blocks else []
+        while pending:
+            index = pending.pop()
+            if index in seen:
+                continue
+            seen.add(index)
+            pending.extend(self.blocks[index].successors)
+        return seen
+
+    def to_quadruples(self, blocks: Optional[Set[int]] = None) -> List[Any]:
+        """Flatten the (selected) blocks back into a quadruple list in program order."""
+        quadruples = []
+        for block in self.blocks:
+            if blocks is None or block.index in blocks:
+                quadruples.extend(block.quadruples)
+        return quadruples
+
+
+def fold_constant_branches(quadruples: List[Any]) -> List[Any]:
+    """
+    Resolve conditional jumps whose operands are known constants.
+
+    Temporaries computed from literals are tracked within each basic block;
+    a jump that always fires becomes a goto and one that never fires is dropped.
+
+    Args:
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        Quadruples with constant branches resolved
+    """
+    folded = []
+    known: Dict[str, int] = {}
+
+    def value(operand: str) -> Optional[int]:
+        if operand.isdigit():
+            return int(operand) & WORD_MASK
+        return known.get(operand)
+
+    for quad in quadruples:
+        operator, operand1, operand2, result = unpack_quadruple(quad)
+        if operator == 'label':
+            known.clear()
+        elif operator in ARITHMETIC_OPERATORS and is_temp(result):
+            a, b = value(operand1), value(operand2)
+            known.pop(result, None)
+            if a is not None and b is not None and not (operator == '/' and b == 0):
+                known[result] = _evaluate(operator, a, b)
+        elif operator == '=' and is_temp(result):
+            known.pop(result, None)
+            if value(operand1) is not None:
+                known[result] = value(operand1)
+        elif operator in CONDITIONAL_JUMPS:
+            a, b = value(operand1), value(operand2)
+            if a is not None and b is not None:
+                if CONDITIONAL_JUMPS[operator](a, b):
+                    folded.append(replace_quadruple(quad, 'goto', '', '', result))
+                continue
+        folded.append(quad)
+    return folded
+
+
+def remove_unreachable_code(quadruples: List[Any]) -> List[Any]:
+    """
+    Delete blocks that cannot be reached from the program entry.
+
+    Args:
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        Quadruples of the reachable blocks, in program order
+    """
+    graph = ControlFlowGraph(quadruples)
+    return graph.to_quadruples(graph.reachable())
+
+
+def remove_redundant_jumps(quadruples: List[Any]) -> List[Any]:
+    """
+    Drop jumps to the immediately following label and labels nobody jumps to.
+
+    Args:
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        Simplified quadruples
+    """
+    changed = True
+    while changed:
+        changed = False
+        kept = []
+        for index, quad in enumerate(quadruples):
+            operator, _, _, result = unpack_quadruple(quad)
+            if operator in JUMP_OPERATORS and index + 1 < len(quadruples):
+                next_operator, _, _, next_result = unpack_quadruple(quadruples[index + 1])
+                if next_operator == 'label' and next_result == result:
+                    changed = True
+                    continue
+            kept.append(quad)
+
+        targets = {unpack_quadruple(quad)[3] for quad in kept if unpack_quadruple(quad)[0] in JUMP_OPERATORS}
+        quadruples = [quad for quad in kept
+                      if unpack_quadruple(quad)[0] != 'label' or unpack_quadruple(quad)[3] in targets]
+        changed = changed or len(quadruples) != len(kept)
+    return quadruples
+
+
+def remove_dead_temporaries(quadruples: List[Any]) -> List[Any]:
+    """
+    Delete arithmetic and copies into temporaries whose value is never read.
+
+    Args:
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        Quadruples without dead temporary definitions
+    """
+    while True:
+        used = set()
+        for quad in quadruples:
+            _, operand1, operand2, _ = unpack_quadruple(quad)
+            used.update((operand1, operand2))
+
+        kept = []
+        for quad in quadruples:
+            operator, _, _, result = unpack_quadruple(quad)
+            if (operator in ARITHMETIC_OPERATORS or operator == '=') and is_temp(result) and result not in used:
+                continue
+            kept.append(quad)
+
+        if len(kept) == len(quadruples):
+            return kept
+        quadruples = kept
+
+
+def eliminate_dead_code(quadruples: List[Any]) -> List[Any]:
+    """
+    Convenience function running the whole dead/unreachable code elimination.
+
+    Constant branches are folded first so that bodies behind constant-false
+    conditions become unreachable; unreachable blocks, unused temporaries
+    and the jumps and labels left without purpose are then removed.
+
+    Args:
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        Optimized quadruples
+    """
+    quadruples = fold_constant_branches(quadruples)
+    quadruples = remove_unreachable_code(quadruples)
+    quadruples = remove_dead_temporaries(quadruples)
+    return remove_redundant_jumps(quadruples)
+
+
+def _evaluate(operator: str, a: int, b: int) -> int:
+    """Evaluate an arithmetic operator with unsigned 16-bit semantics."""
+    if operator == '+':
+        return (a + b) & WORD_MASK
+    if operator == '-':
+        return (a - b) & WORD_MASK
+    if operator == '*':
+        return (a * b) & WORD_MASK
+    return a // b
+
+
+if __name__ == "__main__":
+    # Example usage
+    sample = [
+        ['=', '5', '', 'x'],
+        ['+', '1', '1', '_t1'],
+        ['j>=', '_t1', '2', 'L1'],
+        ['print', '"never printed"', '', ''],
+        ['label', '', '', 'L1'],
+        ['label', '', '', 'L2'],
+        ['print', 'x', '', ''],
+        ['goto', '', '', 'L2'],
+        ['print', '"after an infinite loop"', '', ''],
+    ]
+
+    graph = ControlFlowGraph(sample)
+    for block in graph.blocks:
+        print(f"B{block.index} label={block.label} -> {block.successors}")
+
+    for quad in eliminate_dead_code(sample):
+        print(quad)
@@ -0,0 +1,103 @@
+"""
+Whole-Program Partial Evaluation
+
+A program that never reads input produces the same output on every run,
+so it can be executed once at compile time. This module runs such programs
+on the bytecode VM within a step budget and replaces the whole quadruple
+list with a single print of the precomputed output.
+
+Programs are left unchanged when they read input, exhaust the step
+budget (they may not terminate), fault at run time (division by zero is
+kept for the target to report), or print text that cannot be written as
+one '$'-terminated string literal.
+"""
+
+from typing import List, Any, Optional
+
+from vm.bytecode_vm import VMError, BufferIO, run_program
+from .cfg import unpack_quadruple, replace_quadruple
+
+
+# Instructions the VM may execute at compile time before giving up
+DEFAULT_STEP_BUDGET = 100_000
+
+# Characters that cannot appear in a DOS print literal
+UNPRINTABLE_CHARACTERS = ('$', '"')
+
+
+def evaluate_program(symbol_table: List[Any], quadruples: List[Any],
+                     number_table: Optional[List[Any]] = None,
+                     max_steps: int = DEFAULT_STEP_BUDGET) -> Optional[str]:
+    """
+    Run a program without input at compile time.
+
+    Args:
+        symbol_table: Symbol table from lexical analyzer
+        quadruples: Quadruple intermediate code
+        number_table: Number constants table
+        max_steps: VM instruction budget
+
+    Returns:
+        The program output, or None if it cannot be computed at compile time
+    """
+    if any(unpack_quadruple(quad)[0] == 'read' for quad in quadruples):
+        return None
+
+    io = BufferIO()
+    try:
+        run_program(symbol_table, quadruples, number_table, io, max_steps)
+    except VMError:
+        return None
+
+    output = io.getvalue()
+    if any(character in output for character in UNPRINTABLE_CHARACTERS):
+        return None
+    return output
+
+
+def fold_program(quadruples: List[Any], symbol_table: List[Any],
+                 number_table: Optional[List[Any]] = None,
+                 max_steps: int = DEFAULT_STEP_BUDGET) -> List[Any]:
+    """
+    Replace a program without input by a print of its output.
+
+    The print keeps the source line of the program's first print, and a
+    program with no output folds to no quadruples at all.
+
+    Args:
+        quadruples: Quadruple intermediate code
+        symbol_table: Symbol table from lexical analyzer
+        number_table: Number constants table
+        max_steps: VM instruction budget
+
+    Returns:
+        The folded quadruples, or the original ones if the program cannot be folded
+    """
+    output = evaluate_program(symbol_table, quadruples, number_table, max_steps)
+    if output is None:
+        return quadruples
+    if not output:
+        return []
+
+    first_print = next(quad for quad in quadruples if unpack_quadruple(quad)[0] == 'print')
+    return [replace_quadruple(first_print, 'print', f'"{output}"', '', '')]
+
+
+if __name__ == "__main__":
+    # Example usage: sum of 1..10
+    symbols = [['i', 'int', 1, 'id0', 'NoRead'], ['total', 'int', 0, 'id1', 'NoRead']]
+    sample = [
+        ['label', '', '', 'L1'],
+        ['j>', 'i', '10', 'L2'],
+        ['+', 'total', 'i', '_t1'],
+        ['=', '_t1', '', 'total'],
+        ['+', 'i', '1', '_t2'],
+        ['=', '_t2', '', 'i'],
+        ['goto', '', '', 'L1'],
+        ['label', '', '', 'L2'],
+        ['print', '"total = "', '', ''],
+        ['print', 'total', '', ''],
+    ]
+
+    print(fold_program(sample, symbols))
+    print(fold_program(sample, symbols, max_steps=10))
@@ -0,0 +1,329 @@
+"""
+Loop Optimization
+
+This module rewrites the while loops of the quadruple intermediate code:
+- Loop rotation: the condition is tested once in front of the loop and
+  again at the bottom, so an iteration ends with a single conditional
+  branch back to the body instead of a goto to a header that tests and
+  branches again.
+- Loop-invariant code motion: temporaries computed only from values the
+  loop never changes are hoisted into a preheader in front of the loop.
+
+Loop shape produced by the lexical analyzer:
+    label H; <condition, jumping to E when false>; <body>; goto H; label E
+Rotated:
+    <condition, jumping to E when false>; label B; <body>;
+    <condition, jumping to B when true>; label E
+"""
+
+import re
+from typing import List, Dict, Any, Optional, Set, Tuple
+from collections import Counter
+
+from .cfg import (
+    CONDITIONAL_JUMPS, JUMP_OPERATORS, ARITHMETIC_OPERATORS,
+    unpack_quadruple, is_temp, replace_quadruple
+)
+
+
+NEGATED_JUMPS = {'j<': 'j>=', 'j<=': 'j>', 'j>': 'j<=', 'j>=': 'j<', 'j==': 'j!=', 'j!=': 'j=='}
+
+# Quadruples that only compute a temporary and may appear in a loop condition
+COMPUTE_OPERATORS = ARITHMETIC_OPERATORS | {'='}
+
+LABEL_PATTERN = re.compile(r'L(\d+)$')
+TEMP_NUMBER_PATTERN = re.compile(r'_t(\d+)$')
+
+
+class _NameFactory:
+    """Hands out names of the form <prefix><n> that do not occur in the program yet."""
+
+    def __init__(self, prefix: str, pattern: re.Pattern, quadruples: List[Any]):
+        self.prefix = prefix
+        self.counter = 0
+        for quad in quadruples:
+            for name in unpack_quadruple(quad)[1:]:
+                match = pattern.match(name or '')
+                if match:
+                    self.counter = max(self.counter, int(match.group(1)))
+
+    def new(self) -> str:
+        self.counter += 1
+        return f"{self.prefix}{self.counter}"
+
+
+def rotate_loops(quadruples: List[Any]) -> List[Any]:
+    """
+    Move the condition of every while loop to the bottom of its body.
+
+    The condition is duplicated in front of the loop as a guard, with
+    fresh labels and temporaries, and the bottom copy is inverted to jump
+    back to the body while the condition holds.
+
+    Args:
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        Quadruples with rotated loops
+    """
+    labels = _NameFactory('L', LABEL_PATTERN, quadruples)
+    temps = _NameFactory('_t', TEMP_NUMBER_PATTERN, quadruples)
+    while True:
+        loop = _find_rotatable_loop(quadruples)
+        if loop is None:
+            return quadruples
+        header, condition_end, back_edge, exit_label = loop
+
+        condition = quadruples[header + 1:condition_end]
+        body_label = labels.new()
+        quadruples = (quadruples[:header]
+                      + _copy_condition(condition, labels, temps)
+                      + [replace_quadruple(quadruples[header], 'label', '', '', body_label)]
+                      + quadruples[condition_end:back_edge]
+                      + _invert_condition(condition, body_label)
+                      + quadruples[back_edge + 1:])
+
+
+def hoist_loop_invariants(quadruples: List[Any]) -> List[Any]:
+    """
+    Hoist loop-invariant temporary computations into a preheader.
+
+    A quadruple is invariant when it defines a temporary assigned nowhere
+    else in the loop and every operand is a literal, a value the loop does
+    not assign, or an invariant temporary. Division is only hoisted by a
+    non-zero literal, so a hoisted quadruple can never fault when the loop
+    body would not have run it.
+
+    Args:
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        Quadruples with invariant code moved in front of its loop
+    """
+    while True:
+        for header, back_edge in find_loops(quadruples):
+            hoisted = _invariant_quadruples(quadruples, header, back_edge)
+            if hoisted:
+                moved = set(hoisted)
+                quadruples = (quadruples[:header]
+                              + [quadruples[index] for index in hoisted]
+                              + [quad for index, quad in enumerate(quadruples[header:], header)
+                                 if index not in moved])
+                break
+        else:
+            return quadruples
+
+
+def find_loops(quadruples: List[Any]) -> List[Tuple[int, int]]:
+    """
+    Find the single-entry loops of a quadruple list, innermost first.
+
+    A loop is a label whose jumps all come from later quadruples, up to
+    the last of them (the back edge), with no jumps into its body from
+    outside.
+
+    Args:
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        (header label index, back edge index) per loop
+    """
+    sources = _jump_sources(quadruples)
+    label_index = {unpack_quadruple(quad)[3]: index for index, quad in enumerate(quadruples)
+                   if unpack_quadruple(quad)[0] == 'label'}
+
+    loops = []
+    for label, header in label_index.items():
+        jumps = sources.get(label, [])
+        if not jumps or min(jumps) <= header:
+            continue
+        back_edge = max(jumps)
+        entered_from_outside = any(
+            not header <= source <= back_edge
+            for inner, index in label_index.items() if header < index <= back_edge
+            for source in sources.get(inner, [])
+        )
+        if not entered_from_outside:
+            loops.append((header, back_edge))
+    return sorted(loops, key=lambda loop: loop[1] - loop[0])
+
+
+def optimize_loops(quadruples: List[Any]) -> List[Any]:
+    """
+    Convenience function applying loop rotation and invariant code motion.
+
+    Args:
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        Optimized quadruples
+    """
+    return hoist_loop_invariants(rotate_loops(quadruples))
+
+
+def _jump_sources(quadruples: List[Any]) -> Dict[str, List[int]]:
+    """Map each label to the indices of the jumps targeting it."""
+    sources: Dict[str, List[int]] = {}
+    for index, quad in enumerate(quadruples):
+        operator, _, _, result = unpack_quadruple(quad)
+        if operator in JUMP_OPERATORS:
+            sources.setdefault(result, []).append(index)
+    return sources
+
+
+def _find_rotatable_loop(quadruples: List[Any]) -> Optional[Tuple[int, int, int, str]]:
+    """Return (header, condition end, back edge, exit label) of the first loop in lexer shape."""
+    sources = _jump_sources(quadruples)
+    for header, quad in enumerate(quadruples):
+        operator, _, _, label = unpack_quadruple(quad)
+        jumps = sources.get(label, [])
+        if operator != 'label' or len(jumps) != 1 or jumps[0] <= header:
+            continue
+
+        back_edge = jumps[0]
+        if unpack_quadruple(quadruples[back_edge])[0] != 'goto' or back_edge + 1 >= len(quadruples):
+            continue
+        exit_operator, _, _, exit_label = unpack_quadruple(quadruples[back_edge + 1])
+        if exit_operator != 'label':
+            continue
+
+        condition_end = _condition_end(quadruples, header + 1, back_edge, exit_label, sources)
+        if condition_end is not None:
+            return header, condition_end, back_edge, exit_label
+    return None
+
+
+def _condition_end(quadruples: List[Any], start: int, stop: int, exit_label: str,
+                   sources: Dict[str, List[int]]) -> Optional[int]:
+    """
+    Delimit the loop condition that starts at quadruples[start].
+
+    The condition reaches up to the last jump to the exit label, followed by
+    the labels its short-circuit jumps skip to. It may only compute
+    temporaries for its own use and jump to the exit or its own labels.
+
+    Returns:
+        Index just past the condition, or None if the loop cannot be rotated
+    """
+    exits = sources.get(exit_label, [])
+    if not exits or not all(start <= source < stop for source in exits):
+        return None
+    if any(unpack_quadruple(quadruples[source])[0] not in CONDITIONAL_JUMPS for source in exits):
+        return None
+
+    end = max(exits) + 1
+    while end < stop and unpack_quadruple(quadruples[end])[0] == 'label' and \
+            all(start <= source < end for source in sources.get(unpack_quadruple(quadruples[end])[3], [])):
+        end += 1
+
+    condition = quadruples[start:end]
+    inner_labels: Dict[str, int] = {}
+    defined: Set[str] = set()
+    for index, quad in enumerate(condition, start):
+        operator, _, _, result = unpack_quadruple(quad)
+        if operator == 'label':
+            inner_labels[result] = index
+        elif operator in COMPUTE_OPERATORS and is_temp(result):
+            defined.add(result)
+        elif operator not in CONDITIONAL_JUMPS:
+            return None
+
+    for label, index in inner_labels.items():
+        if not all(start <= source < index for source in sources.get(label, [])):
+            return None
+    for quad in condition:
+        operator, _, _, result = unpack_quadruple(quad)
+        if operator in CONDITIONAL_JUMPS and result != exit_label and result not in inner_labels:
+            return None
+
+    # Temporaries of the condition must not be read by the rest of the program
+    for quad in quadruples[:start] + quadruples[end:]:
+        _, operand1, operand2, _ = unpack_quadruple(quad)
+        if operand1 in defined or operand2 in defined:
+            return None
+    return end
+
+
+def _copy_condition(condition: List[Any], labels: _NameFactory, temps: _NameFactory) -> List[Any]:
+    """Duplicate a condition with fresh labels and temporaries."""
+    renamed: Dict[str, str] = {}
+    for quad in condition:
+        operator, _, _, result = unpack_quadruple(quad)
+        if operator == 'label':
+            renamed[result] = labels.new()
+        elif is_temp(result):
+            renamed[result] = temps.new()
+
+    copy = []
+    for quad in condition:
+        operator, operand1, operand2, result = unpack_quadruple(quad)
+        copy.append(replace_quadruple(quad, operator, renamed.get(operand1, operand1),
+                             renamed.get(operand2, operand2), renamed.get(result, result)))
+    return copy
+
+
+def _invert_condition(condition: List[Any], body_label: str) -> List[Any]:
+    """
+    Turn a condition that jumps to the exit when false into one that jumps to body_label when true.
+
+    The last jump is negated and retargeted; jumps to the labels after it,
+    which are reached when the condition holds, go to body_label as well.
+    Other jumps to the exit are kept since the exit label follows the
+    condition.
+    """
+    last = max(index for index, quad in enumerate(condition) if unpack_quadruple(quad)[0] != 'label')
+    holds = {unpack_quadruple(quad)[3] for quad in condition[last + 1:]}
+
+    inverted = []
+    for index, quad in enumerate(condition[:last + 1]):
+        operator, operand1, operand2, result = unpack_quadruple(quad)
+        if index == last:
+            quad = replace_quadruple(quad, NEGATED_JUMPS[operator], operand1, operand2, body_label)
+        elif operator in CONDITIONAL_JUMPS and result in holds:
+            quad = replace_quadruple(quad, operator, operand1, operand2, body_label)
+        inverted.append(quad)
+    return inverted
+
+
+def _invariant_quadruples(quadruples: List[Any], header: int, back_edge: int) -> List[int]:
+    """Indices of the loop-invariant temporary computations in quadruples[header:back_edge]."""
+    assigned = Counter()
+    for quad in quadruples[header:back_edge + 1]:
+        operator, _, _, result = unpack_quadruple(quad)
+        if operator in COMPUTE_OPERATORS or operator == 'read':
+            assigned[result] += 1
+
+    invariant: Set[str] = set()
+    used: Set[str] = set()
+    hoisted = []
+    for index in range(header + 1, back_edge):
+        operator, operand1, operand2, result = unpack_quadruple(quadruples[index])
+        operands = [operand for operand in (operand1, operand2) if operand]
+        if (operator in COMPUTE_OPERATORS and is_temp(result) and assigned[result] == 1
+                and result not in used
+                and not (operator == '/' and not (operand2.isdigit() and int(operand2) != 0))
+                and all(operand.isdigit() or operand in invariant or assigned[operand] == 0
+                        for operand in operands)):
+            invariant.add(result)
+            hoisted.append(index)
+        used.update(operands)
+    return hoisted
+
+
+if __name__ == "__main__":
+    # Example usage: while (i < n) { x = x + n * 2; i = i + 1; }
+    sample = [
+        ['label', '', '', 'L1'],
+        ['j>=', 'i', 'n', 'L2'],
+        ['*', 'n', '2', '_t1'],
+        ['+', 'x', '_t1', '_t2'],
+        ['=', '_t2', '', 'x'],
+        ['+', 'i', '1', '_t3'],
+        ['=', '_t3', '', 'i'],
+        ['goto', '', '', 'L1'],
+        ['label', '', '', 'L2'],
+        ['print', 'x', '', ''],
+    ]
+
+    for quad in optimize_loops(sample):
+        print(quad)
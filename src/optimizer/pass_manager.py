@@ -0,0 +1,235 @@
+"""
+Pass Manager
+
+This module runs the optimization passes over the quadruple intermediate
+code as a configurable pipeline, between semantic analysis and code
+generation. Each optimization level is a preset pipeline:
+
+    -O0  no passes
+    -O1  dead code, loops, dead stores, print coalescing (linear-time passes)
+    -O2  -O1 plus partial evaluation of programs that read no input
+
+Every pass run is timed and its effect on the IR size (quadruple count)
+recorded, so the compile time a pass costs can be weighed against what it
+removes.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Callable, Optional
+
+from .cfg import eliminate_dead_code
+from .loops import optimize_loops, find_loops
+from .variables import usage_warnings, remove_dead_stores
+from .prints import coalesce_prints, count_prints
+from .evaluation import DEFAULT_STEP_BUDGET, fold_program
+
+
+DEFAULT_OPTIMIZATION_LEVEL = 2
+
+
+@dataclass
+class PassContext:
+    """Program tables and settings shared by the passes of one run."""
+    symbol_table: List[Any]
+    number_table: List[Any] = field(default_factory=list)
+    evaluation_steps: int = DEFAULT_STEP_BUDGET
+    warnings: Optional[List[str]] = None
+
+
+@dataclass(frozen=True)
+class Pass:
+    """A named transformation of the quadruple list."""
+    name: str
+    description: str
+    run: Callable[[List[Any], PassContext], List[Any]]
+    summary: Optional[Callable[[List[Any], List[Any]], Optional[str]]] = None
+
+
+@dataclass
+class PassRecord:
+    """Wall time and IR size change of one pass run."""
+    name: str
+    seconds: float
+    size_before: int
+    size_after: int
+    message: Optional[str] = None
+
+    @property
+    def size_delta(self) -> int:
+        """Change in the number of quadruples (negative when the pass shrank the IR)."""
+        return self.size_after - self.size_before
+
+
+def _remove_dead_stores(quadruples: List[Any], context: PassContext) -> List[Any]:
+    """Report the variables whose value is never used, then drop their stores."""
+    context.warnings = usage_warnings(context.symbol_table, quadruples)
+    return remove_dead_stores(quadruples, context.symbol_table)
+
+
+def _fold_program(quadruples: List[Any], context: PassContext) -> List[Any]:
+    """Run a program without input at compile time, unless the step budget is 0."""
+    if not context.evaluation_steps:
+        return quadruples
+    return fold_program(quadruples, context.symbol_table, context.number_table, context.evaluation_steps)
+
+
+def _evaluation_summary(before: List[Any], after: List[Any]) -> Optional[str]:
+    """Report partial evaluation only when the program was folded."""
+    if after is before:
+        return None
+    return f"Partial evaluation: output computed at compile time ({len(before)} -> {len(after)} quadruples)"
+
+
+PASSES: Dict[str, Pass] = {p.name: p for p in (
+    Pass('dead-code', 'Constant branch folding, unreachable blocks and dead temporaries',
+         lambda quadruples, context: eliminate_dead_code(quadruples),
+         lambda before, after: f"Dead code elimination: {len(before)} -> {len(after)} quadruples"),
+    Pass('loops', 'Loop rotation and loop-invariant code motion',
+         lambda quadruples, context: optimize_loops(quadruples),
+         lambda before, after: f"Loop optimization: {len(find_loops(after))} loops"),
+    Pass('dead-stores', 'Unused variable warnings and dead store removal',
+         _remove_dead_stores,
+         lambda before, after: f"Dead store removal: {len(before)} -> {len(after)} quadruples"),
+    Pass('prints', 'Compile-time merging of adjacent constant prints',
+         lambda quadruples, context: coalesce_prints(quadruples, context.symbol_table),
+         lambda before, after: f"Print coalescing: {count_prints(before)} -> {count_prints(after)} prints"),
+    Pass('evaluation', 'Compile-time execution of programs that read no input',
+         _fold_program, _evaluation_summary),
+)}
+
+OPTIMIZATION_LEVELS: Dict[int, List[str]] = {
+    0: [],
+    1: ['dead-code', 'loops', 'dead-stores', 'prints'],
+    2: ['dead-code', 'loops', 'dead-stores', 'prints', 'evaluation'],
+}
+
+
+class PassManager:
+    """
+    Runs a pipeline of optimization passes and records what each one cost and did.
+    """
+
+    def __init__(self, passes: List[Pass]):
+        """
+        Initialize the pass manager.
+
+        Args:
+            passes: Passes in the order they run
+        """
+        self.passes = list(passes)
+        self.records: List[PassRecord] = []
+        self.warnings: Optional[List[str]] = None
+
+    @classmethod
+    def from_names(cls, names: List[str]) -> 'PassManager':
+        """
+        Build a pipeline from registered pass names.
+
+        Raises:
+            ValueError: If a name is not a registered pass
+        """
+        unknown = [name for name in names if name not in PASSES]
+        if unknown:
+            raise ValueError(f"Unknown optimization pass '{unknown[0]}' (known: {', '.join(PASSES)})")
+        return cls([PASSES[name] for name in names])
+
+    @classmethod
+    def for_level(cls, level: int) -> 'PassManager':
+        """
+        Build the preset pipeline of an optimization level.
+
+        Raises:
+            ValueError: If the level has no preset
+        """
+        if level not in OPTIMIZATION_LEVELS:
+            raise ValueError(f"Unknown optimization level {level} (known: "
+                             f"{', '.join(f'-O{known}' for known in OPTIMIZATION_LEVELS)})")
+        return cls.from_names(OPTIMIZATION_LEVELS[level])
+
+    @property
+    def names(self) -> List[str]:
+        """Names of the passes in pipeline order."""
+        return [p.name for p in self.passes]
+
+    @property
+    def total_seconds(self) -> float:
+        """Wall time of the last run over all passes."""
+        return sum(record.seconds for record in self.records)
+
+    def run(self, quadruples: List[Any], symbol_table: List[Any],
+            number_table: Optional[List[Any]] = None,
+            evaluation_steps: int = DEFAULT_STEP_BUDGET) -> List[Any]:
+        """
+        Run every pass in order, timing each one.
+
+        Passes that report diagnostics leave them in `warnings`; it stays
+        None when no such pass is in the pipeline.
+
+        Args:
+            quadruples: Quadruple intermediate code
+            symbol_table: Symbol table from lexical analyzer
+            number_table: Number constants table
+            evaluation_steps: VM step budget for partial evaluation, 0 to disable
+
+        Returns:
+            The optimized quadruples
+        """
+        context = PassContext(symbol_table, number_table or [], evaluation_steps)
+        self.records = []
+        for optimization in self.passes:
+            start = time.perf_counter()
+            optimized = optimization.run(quadruples, context)
+            seconds = time.perf_counter() - start
+            message = optimization.summary(quadruples, optimized) if optimization.summary else None
+            self.records.append(PassRecord(optimization.name, seconds, len(quadruples), len(optimized), message))
+            quadruples = optimized
+        self.warnings = context.warnings
+        return quadruples
+
+    def format(self) -> str:
+        """Render the per-pass timing and IR size table of the last run."""
+        out = [f"{'pass':<12} {'time (ms)':>10} {'quadruples':>16} {'delta':>6}"]
+        for record in self.records:
+            sizes = f"{record.size_before} -> {record.size_after}"
+            out.append(f"{record.name:<12} {record.seconds * 1000:>10.2f} {sizes:>16} {record.size_delta:>+6}")
+        out.append(f"{'total':<12} {self.total_seconds * 1000:>10.2f}")
+        return '\n'.join(out)
+
+
+def optimize(quadruples: List[Any], symbol_table: List[Any], number_table: Optional[List[Any]] = None,
+             level: int = DEFAULT_OPTIMIZATION_LEVEL) -> List[Any]:
+    """
+    Convenience function to run the preset pipeline of an optimization level.
+
+    Args:
+        quadruples: Quadruple intermediate code
+        symbol_table: Symbol table from lexical analyzer
+        number_table: Number constants table
+        level: Optimization level (0, 1 or 2)
+
+    Returns:
+        The optimized quadruples
+    """
+    return PassManager.for_level(level).run(quadruples, symbol_table, number_table)
+
+
+if __name__ == "__main__":
+    # Example usage
+    symbols = [['x', 'int', 0, 'id0', 'NoRead'], ['unused', 'int', 0, 'id1', 'NoRead']]
+    sample = [
+        ['goto', '', '', 'L1'],
+        ['+', 'x', '1', '_t1'],
+        ['label', '', '', 'L1'],
+        ['*', 'x', '2', '_t2'],
+        ['=', '_t2', '', 'x'],
+        ['print', '"x = "', '', ''],
+        ['print', 'x', '', ''],
+    ]
+
+    for level in OPTIMIZATION_LEVELS:
+        manager = PassManager.for_level(level)
+        result = manager.run(sample, symbols)
+        print(f"-O{level}: {len(sample)} -> {len(result)} quadruples")
+        print(manager.format())
+        print()
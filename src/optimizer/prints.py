@@ -0,0 +1,114 @@
+"""
+Print Coalescing
+
+This module merges adjacent print quadruples at compile time. Variables
+whose value is known when compiling (never assigned or read after their
+declaration) are replaced by their printed text, and runs of literal
+prints are concatenated into one literal, so the generated program makes
+one DOS output call where it made several.
+"""
+
+from typing import List, Dict, Any
+
+from .cfg import unpack_quadruple, replace_quadruple
+from .variables import analyze_usage
+
+
+WORD_MASK = 0xFFFF
+
+
+def constant_print_values(symbol_table: List[Any], quadruples: List[Any]) -> Dict[str, str]:
+    """
+    Printed text of the variables whose value is fixed at compile time.
+
+    Integers and booleans qualify when no quadruple assigns or reads them;
+    strings when they have a value and are never read (string assignments
+    are already resolved into the symbol table).
+
+    Args:
+        symbol_table: Symbol table from lexical analyzer
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        Variable name to the text print would output for it
+    """
+    usage = analyze_usage(symbol_table, quadruples)
+    values = {}
+    for symbol in symbol_table:
+        if hasattr(symbol, 'name'):
+            name, value = symbol.name, symbol.value
+        else:
+            name, value = symbol[0], symbol[2]
+        variable = usage[name]
+        if variable.definitions or variable.reads:
+            continue
+
+        if variable.data_type == 'int':
+            values[name] = str(int(value) & WORD_MASK)
+        elif variable.data_type == 'boolean':
+            values[name] = '1' if value else '0'
+        elif variable.data_type == 'str' and value:
+            values[name] = str(value).strip('"')
+    return values
+
+
+def coalesce_prints(quadruples: List[Any], symbol_table: List[Any]) -> List[Any]:
+    """
+    Fold constant variables into print literals and merge adjacent literal prints.
+
+    Only directly consecutive print quadruples are merged, so a label or
+    jump between two prints keeps them apart.
+
+    Args:
+        quadruples: Quadruple intermediate code
+        symbol_table: Symbol table from lexical analyzer
+
+    Returns:
+        Quadruples with coalesced prints
+    """
+    constants = constant_print_values(symbol_table, quadruples)
+    coalesced = []
+    for quad in quadruples:
+        operator, operand1, _, _ = unpack_quadruple(quad)
+        if operator != 'print':
+            coalesced.append(quad)
+            continue
+
+        if operand1 in constants:
+            operand1 = f'"{constants[operand1]}"'
+        if _is_literal(operand1) and coalesced:
+            previous_operator, previous_operand, _, _ = unpack_quadruple(coalesced[-1])
+            if previous_operator == 'print' and _is_literal(previous_operand):
+                merged = f'"{previous_operand[1:-1]}{operand1[1:-1]}"'
+                coalesced[-1] = replace_quadruple(coalesced[-1], 'print', merged, '', '')
+                continue
+        coalesced.append(replace_quadruple(quad, 'print', operand1, '', ''))
+    return coalesced
+
+
+def count_prints(quadruples: List[Any]) -> int:
+    """Number of print quadruples (one output call each)."""
+    return sum(1 for quad in quadruples if unpack_quadruple(quad)[0] == 'print')
+
+
+def _is_literal(operand: str) -> bool:
+    """Check whether a print operand is a quoted string literal."""
+    return len(operand) >= 2 and operand.startswith('"') and operand.endswith('"')
+
+
+if __name__ == "__main__":
+    # Example usage
+    symbols = [['width', 'int', 80], ['title', 'str', '"Report"'], ['total', 'int', 0]]
+    sample = [
+        ['print', 'title', '', ''],
+        ['print', '": width "', '', ''],
+        ['print', 'width', '', ''],
+        ['print', '", total "', '', ''],
+        ['read', '', '', 'total'],
+        ['print', 'total', '', ''],
+    ]
+
+    result = coalesce_prints(sample, symbols)
+    for quad in result:
+        print(quad)
+    print(f"{count_prints(sample)} -> {count_prints(result)} prints")
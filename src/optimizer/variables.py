@@ -0,0 +1,166 @@
+"""
+Variable Usage Analysis
+
+This module tracks where each declared variable is defined (assigned or
+read from input) and used (operand of a computation, jump or print) in the
+quadruple intermediate code. It reports variables that are never used and
+removes stores to them, so they need no storage in the generated program.
+"""
+
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
+
+from .cfg import ARITHMETIC_OPERATORS, unpack_quadruple, is_temp, remove_dead_temporaries
+
+
+@dataclass
+class VariableUsage:
+    """Definitions and uses of one declared variable, by source line."""
+    name: str
+    data_type: str
+    definitions: List[Optional[int]] = field(default_factory=list)
+    uses: List[Optional[int]] = field(default_factory=list)
+    reads: List[Optional[int]] = field(default_factory=list)
+
+    @property
+    def referenced(self) -> bool:
+        """Whether any quadruple mentions the variable."""
+        return bool(self.definitions or self.uses or self.reads)
+
+    @property
+    def dead(self) -> bool:
+        """Whether the variable's value is never used (reads from input still count as needed)."""
+        return not self.uses and not self.reads
+
+
+def analyze_usage(symbol_table: List[Any], quadruples: List[Any]) -> Dict[str, VariableUsage]:
+    """
+    Collect the definitions and uses of every declared variable.
+
+    Args:
+        symbol_table: Symbol table from lexical analyzer
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        VariableUsage per variable, in declaration order
+    """
+    usage = {}
+    for symbol in symbol_table:
+        name, data_type = _unpack_symbol(symbol)
+        usage[name] = VariableUsage(name, data_type)
+
+    for quad in quadruples:
+        operator, operand1, operand2, result = unpack_quadruple(quad)
+        line = getattr(quad, 'line', None) or None
+        for operand in (operand1, operand2):
+            if operand in usage:
+                usage[operand].uses.append(line)
+        if result in usage:
+            if operator == 'read':
+                usage[result].reads.append(line)
+            elif operator in ARITHMETIC_OPERATORS or operator == '=':
+                usage[result].definitions.append(line)
+    return usage
+
+
+def usage_warnings(symbol_table: List[Any], quadruples: List[Any]) -> List[str]:
+    """
+    Describe the declared variables whose value is never used.
+
+    Args:
+        symbol_table: Symbol table from lexical analyzer
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        One warning message per unused variable
+    """
+    warnings = []
+    for variable in analyze_usage(symbol_table, quadruples).values():
+        if variable.reads and not variable.uses:
+            warnings.append(_warning(variable.reads, f"value read into {variable.name} is never used"))
+        elif variable.definitions and not variable.uses:
+            warnings.append(_warning(variable.definitions, f"variable {variable.name} is assigned but never used"))
+        elif not variable.referenced:
+            kind = "input buffer" if _is_input_buffer(symbol_table, variable.name) else "variable"
+            warnings.append(f"Warning: {kind} {variable.name} is declared but never used")
+    return warnings
+
+
+def remove_dead_stores(quadruples: List[Any], symbol_table: List[Any]) -> List[Any]:
+    """
+    Delete assignments to variables whose value is never used.
+
+    Temporaries that only fed those assignments are removed as well, which
+    leaves the variables unreferenced so no storage is emitted for them.
+
+    Args:
+        quadruples: Quadruple intermediate code
+        symbol_table: Symbol table from lexical analyzer
+
+    Returns:
+        Quadruples without dead stores
+    """
+    dead = {name for name, variable in analyze_usage(symbol_table, quadruples).items() if variable.dead}
+    kept = []
+    for quad in quadruples:
+        operator, _, _, result = unpack_quadruple(quad)
+        if (operator in ARITHMETIC_OPERATORS or operator == '=') and result in dead and not is_temp(result):
+            continue
+        kept.append(quad)
+    return remove_dead_temporaries(kept)
+
+
+def unused_variables(symbol_table: List[Any], quadruples: List[Any]) -> List[str]:
+    """
+    Convenience function listing the declared variables no quadruple references.
+
+    Args:
+        symbol_table: Symbol table from lexical analyzer
+        quadruples: Quadruple intermediate code
+
+    Returns:
+        Names of variables that need no storage
+    """
+    return [name for name, variable in analyze_usage(symbol_table, quadruples).items()
+            if not variable.referenced]
+
+
+def _unpack_symbol(symbol: Any) -> Tuple[str, str]:
+    """Return (name, data type) for either symbol format."""
+    if hasattr(symbol, 'name'):
+        data_type = symbol.data_type.value if hasattr(symbol.data_type, 'value') else symbol.data_type
+        return symbol.name, data_type
+    return symbol[0], symbol[1]
+
+
+def _is_input_buffer(symbol_table: List[Any], name: str) -> bool:
+    """Strings without an initial value are laid out as input buffers."""
+    for symbol in symbol_table:
+        if _unpack_symbol(symbol)[0] == name:
+            value = symbol.value if hasattr(symbol, 'value') else (symbol[2] if len(symbol) > 2 else None)
+            return _unpack_symbol(symbol)[1] == 'str' and not value
+    return False
+
+
+def _warning(lines: List[Optional[int]], message: str) -> str:
+    """Format a warning at the first known source line."""
+    known = [line for line in lines if line is not None]
+    if known:
+        return f"Warning on line {min(known)}, {message}"
+    return f"Warning: {message}"
+
+
+if __name__ == "__main__":
+    # Example usage
+    symbols = [['x', 'int', 5], ['unused', 'int', 0], ['total', 'int', 0], ['buffer', 'str', '']]
+    sample = [
+        ['+', 'x', '1', '_t1'],
+        ['=', '_t1', '', 'total'],
+        ['print', 'x', '', ''],
+    ]
+
+    for warning in usage_warnings(symbols, sample):
+        print(warning)
+    for quad in remove_dead_stores(sample, symbols):
+        print(quad)
+    print(unused_variables(symbols, remove_dead_stores(sample, symbols)))
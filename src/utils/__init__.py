@@ -4,9 +4,17 @@ Utilities Module
 Contains utility classes for the Simple Language Compiler:
 - SourcePreprocessor: Source code preprocessing and cleanup
 - FileBuffer: Efficient file reading with buffering
+- CompileCache: Content-addressed on-disk cache of compilation results
+- CompilationStats: Per-phase wall time, CPU time, peak memory and size counters
+- PhaseProfiler: cProfile per compiler phase, written as .pstats and collapsed stacks
 """
 
 from .preprocessor import SourcePreprocessor, preprocess_source
 from .file_buffer import FileBuffer, create_file_buffer
+from .compile_cache import CacheStats, CompileCache, cache_key, compiler_fingerprint, default_cache_dir
+from .compile_stats import PhaseStats, CompilationStats, memory_tracing
+from .profiling import PhaseProfiler
 
-__all__ = ['SourcePreprocessor', 'preprocess_source', 'FileBuffer', 'create_file_buffer'] 
\ No newline at end of file
+__all__ = ['SourcePreprocessor', 'preprocess_source', 'FileBuffer', 'create_file_buffer',
+           'CacheStats', 'CompileCache', 'cache_key', 'compiler_fingerprint', 'default_cache_dir',
+           'PhaseStats', 'CompilationStats', 'memory_tracing', 'PhaseProfiler'] 
\ No newline at end of file
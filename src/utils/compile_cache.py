@@ -0,0 +1,280 @@
+"""
+Compilation Cache
+
+This module provides a persistent, content-addressed cache of compilation
+results. An entry is keyed on a hash of the source text, a fingerprint of
+the compiler itself (the hash of its own source files, so any change to the
+compiler invalidates old results) and the compilation options, and holds
+everything a compilation produces: preprocessed output, tokens, symbols,
+quadruples, assembly and reports. A hit lets the compiler skip every phase.
+
+Entries are JSON files written to a temporary file and renamed into place,
+so readers never see a partial entry. The cache is kept under a size cap by
+evicting the least recently used entries (a hit refreshes an entry's
+modification time). Hit, miss, store and eviction counts are kept in the
+cache directory; concurrent compilers may lose an occasional count, never an
+entry.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Any, Optional, List
+
+
+# Bump when the layout of cached entries changes
+CACHE_FORMAT = 1
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Environment variable overriding the default cache location
+CACHE_DIR_VARIABLE = 'AUTOMATA_CACHE_DIR'
+
+ENTRY_SUFFIX = '.json'
+STATS_FILE = 'stats.json'
+
+# Compiler sources that make up the fingerprint, relative to the src package
+FINGERPRINT_PATTERNS = ('**/*.py', 'codegen/templates/*.asm')
+
+
+@dataclass
+class CacheStats:
+    """Lifetime counters and current size of a cache directory."""
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups that were hits."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def format(self) -> str:
+        """Render a one-line summary."""
+        return (f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.0%} hit rate), "
+                f"{self.entries} entries, {self.size_bytes / 1024:.1f} KB, {self.evictions} evicted")
+
+
+def default_cache_dir() -> Path:
+    """Cache location: $AUTOMATA_CACHE_DIR, else ~/.cache/automata-compiler."""
+    configured = os.environ.get(CACHE_DIR_VARIABLE)
+    if configured:
+        return Path(configured)
+    return Path.home() / '.cache' / 'automata-compiler'
+
+
+@lru_cache(maxsize=None)
+def compiler_fingerprint(root: Optional[str] = None) -> str:
+    """
+    Hash the compiler's source files and templates.
+
+    Args:
+        root: Compiler source directory (defaults to the src package)
+
+    Returns:
+        Hex digest that changes whenever any compiler file changes
+    """
+    base = Path(root) if root else Path(__file__).resolve().parent.parent
+    digest = hashlib.sha256(f"format {CACHE_FORMAT}".encode())
+    files = sorted(path for pattern in FINGERPRINT_PATTERNS for path in base.glob(pattern)
+                   if '__pycache__' not in path.parts)
+    for path in files:
+        digest.update(path.relative_to(base).as_posix().encode())
+        digest.update(hashlib.sha256(path.read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def cache_key(source_text: str, options: Dict[str, Any], fingerprint: Optional[str] = None) -> str:
+    """
+    Content address of one compilation.
+
+    Args:
+        source_text: Source program text
+        options: Options that affect the output (JSON-serializable)
+        fingerprint: Compiler fingerprint (defaults to compiler_fingerprint())
+
+    Returns:
+        Hex digest identifying the compilation
+    """
+    material = json.dumps({
+        'source': hashlib.sha256(source_text.encode('utf-8')).hexdigest(),
+        'compiler': fingerprint or compiler_fingerprint(),
+        'options': options,
+    }, sort_keys=True)
+    return hashlib.sha256(material.encode()).hexdigest()
+
+
+class CompileCache:
+    """
+    On-disk cache of compilation results with LRU eviction.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache, creating its directory if needed.
+
+        Args:
+            directory: Cache directory (defaults to default_cache_dir())
+            max_bytes: Total size of entries above which the least recently used are evicted
+        """
+        self.directory = Path(directory) if directory else default_cache_dir()
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an entry, counting a hit or a miss.
+
+        Unreadable entries are removed and count as misses.
+
+        Args:
+            key: Cache key from cache_key()
+
+        Returns:
+            The stored entry, or None
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            entry = None
+        except (OSError, ValueError):
+            self._remove(path)
+            entry = None
+
+        if entry is None or entry.get('format') != CACHE_FORMAT:
+            self._count('misses')
+            return None
+
+        # Recently used entries are the last to be evicted
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self._count('hits')
+        return entry['data']
+
+    def put(self, key: str, data: Dict[str, Any]):
+        """
+        Store an entry atomically, then evict old entries above the size cap.
+
+        Args:
+            key: Cache key from cache_key()
+            data: JSON-serializable compilation results
+        """
+        self._write_atomic(self._entry_path(key), {'format': CACHE_FORMAT, 'created': time.time(), 'data': data})
+        self._count('stores')
+        self._evict()
+
+    def clear(self):
+        """Remove every entry and reset the statistics."""
+        for path in self._entries():
+            self._remove(path)
+        self._remove(self.directory / STATS_FILE)
+
+    def stats(self) -> CacheStats:
+        """Return the lifetime counters and current size of the cache."""
+        counters = self._read_counters()
+        sizes = [self._size(path) for path in self._entries()]
+        return CacheStats(entries=len(sizes), size_bytes=sum(sizes), **counters)
+
+    def _entry_path(self, key: str) -> Path:
+        """File holding the entry for a key."""
+        return self.directory / f"{key}{ENTRY_SUFFIX}"
+
+    def _entries(self) -> List[Path]:
+        """Files of all stored entries."""
+        return [path for path in self.directory.glob(f"*{ENTRY_SUFFIX}") if path.name != STATS_FILE]
+
+    def _evict(self):
+        """Remove least recently used entries until the total size fits the cap."""
+        entries = []
+        for path in self._entries():
+            try:
+                status = path.stat()
+            except OSError:
+                continue
+            entries.append((status.st_mtime, status.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            evicted += 1
+        if evicted:
+            self._count('evictions', evicted)
+
+    def _read_counters(self) -> Dict[str, int]:
+        """Load the lifetime counters, all zero if none are stored yet."""
+        counters = {'hits': 0, 'misses': 0, 'stores': 0, 'evictions': 0}
+        try:
+            with open(self.directory / STATS_FILE, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return counters
+        for name in counters:
+            if isinstance(stored.get(name), int):
+                counters[name] = stored[name]
+        return counters
+
+    def _count(self, counter: str, amount: int = 1):
+        """Add to a lifetime counter; a failed update only loses the count."""
+        counters = self._read_counters()
+        counters[counter] += amount
+        try:
+            self._write_atomic(self.directory / STATS_FILE, counters)
+        except OSError:
+            pass
+
+    def _write_atomic(self, path: Path, content: Any):
+        """Write JSON to a temporary file in the same directory and rename it over the target."""
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, prefix='.tmp-')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+                json.dump(content, f)
+            os.replace(temporary, path)
+        except BaseException:
+            self._remove(Path(temporary))
+            raise
+
+    @staticmethod
+    def _size(path: Path) -> int:
+        """Size of a file, 0 if it vanished."""
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _remove(path: Path):
+        """Delete a file if it still exists."""
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+if __name__ == "__main__":
+    # Example usage
+    with tempfile.TemporaryDirectory() as directory:
+        cache = CompileCache(directory, max_bytes=300)
+        options = {'optimization_level': 2}
+        key = cache_key("main() { print(\"hi\"); }", options)
+        print("first lookup:", cache.get(key))
+        cache.put(key, {'assembly': '; program'})
+        print("second lookup:", cache.get(key))
+        for number in range(5):
+            cache.put(cache_key(f"program {number}", options), {'assembly': 'x' * 50})
+        print(cache.stats().format())
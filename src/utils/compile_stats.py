@@ -0,0 +1,136 @@
+"""
+Compilation Statistics
+
+This module records what each phase of a compilation cost: wall time,
+CPU time and, when tracemalloc is tracing, the peak memory allocated
+during the phase. It also keeps counters of the program's size at each
+stage (preprocessed lines, tokens, symbols, quadruples, assembly lines).
+
+Timing a phase costs two clock reads at each end, so statistics are
+always collected; memory tracing slows compilation noticeably and is
+only used when asked for.
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Iterator, Optional
+
+
+@dataclass
+class PhaseStats:
+    """Cost of one compilation phase."""
+    name: str
+    wall_seconds: float
+    cpu_seconds: float
+    peak_bytes: Optional[int] = None
+
+
+@dataclass
+class CompilationStats:
+    """Per-phase costs and size counters of one compilation."""
+    phases: List[PhaseStats] = field(default_factory=list)
+    counters: Dict[str, int] = field(default_factory=dict)
+    memory_traced: bool = False
+
+    @property
+    def wall_seconds(self) -> float:
+        """Wall time over all recorded phases."""
+        return sum(phase.wall_seconds for phase in self.phases)
+
+    @property
+    def cpu_seconds(self) -> float:
+        """CPU time over all recorded phases."""
+        return sum(phase.cpu_seconds for phase in self.phases)
+
+    @property
+    def peak_bytes(self) -> Optional[int]:
+        """Largest peak allocation of any phase, None when memory was not traced."""
+        peaks = [phase.peak_bytes for phase in self.phases if phase.peak_bytes is not None]
+        return max(peaks) if peaks else None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Record the cost of the enclosed block as a phase, even if it raises.
+
+        Args:
+            name: Phase name
+        """
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            baseline = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            peak = tracemalloc.get_traced_memory()[1] - baseline if tracing else None
+            self.phases.append(PhaseStats(name, time.perf_counter() - wall, time.process_time() - cpu, peak))
+            self.memory_traced = self.memory_traced or tracing
+
+    def count(self, name: str, value: int):
+        """Set a size counter."""
+        self.counters[name] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable form, with totals and times in milliseconds."""
+        return {
+            'phases': [{'name': phase.name,
+                        'wall_ms': round(phase.wall_seconds * 1000, 3),
+                        'cpu_ms': round(phase.cpu_seconds * 1000, 3),
+                        'peak_bytes': phase.peak_bytes} for phase in self.phases],
+            'total': {'wall_ms': round(self.wall_seconds * 1000, 3),
+                      'cpu_ms': round(self.cpu_seconds * 1000, 3),
+                      'peak_bytes': self.peak_bytes},
+            'counters': dict(self.counters),
+            'memory_traced': self.memory_traced,
+        }
+
+    def to_json(self) -> str:
+        """Render to_dict() as indented JSON."""
+        return json.dumps(self.to_dict(), indent=2)
+
+    def format(self) -> str:
+        """Render the phase table and counters."""
+        out = [f"{'phase':<16} {'wall (ms)':>10} {'cpu (ms)':>10} {'peak (KB)':>10}"]
+        for phase in self.phases + [PhaseStats('total', self.wall_seconds, self.cpu_seconds, self.peak_bytes)]:
+            peak = f"{phase.peak_bytes / 1024:.1f}" if phase.peak_bytes is not None else '-'
+            out.append(f"{phase.name:<16} {phase.wall_seconds * 1000:>10.2f} "
+                       f"{phase.cpu_seconds * 1000:>10.2f} {peak:>10}")
+        if self.counters:
+            out.append(', '.join(f"{name.replace('_', ' ')}: {value}" for name, value in self.counters.items()))
+        return '\n'.join(out)
+
+
+@contextmanager
+def memory_tracing(enabled: bool = True) -> Iterator[None]:
+    """
+    Trace allocations for the enclosed block, leaving tracing as it was afterwards.
+
+    Args:
+        enabled: Whether to trace at all
+    """
+    started = enabled and not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    try:
+        yield
+    finally:
+        if started:
+            tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    # Example usage
+    stats = CompilationStats()
+    with memory_tracing():
+        with stats.phase('build'):
+            words = [str(number) for number in range(100000)]
+        with stats.phase('join'):
+            text = ' '.join(words)
+    stats.count('words', len(words))
+    print(stats.format())
+    print(stats.to_json())
@@ -2,7 +2,7 @@
 Source Code Preprocessor
 
 This module handles preprocessing of source code files, including:
-- Comment removal (single-line # and multi-line /* */)
+- Comment removal (single-line // and #, multi-line /* */)
 - Whitespace normalization
 - Line numbering
 - Bracket balance validation
@@ -31,7 +31,7 @@ class SourcePreprocessor:
             Source code with comments removed
         """
         # Pattern captures strings in quotes (group 1) or comments (group 2)
-        pattern = r'(\".*?\"|\'.*?\')|(/\*.*?\*/|#[^\r\n]*$)'
+        pattern = r'(\".*?\"|\'.*?\')|(/\*.*?\*/|//[^\r\n]*$|#[^\r\n]*$)'
         regex = re.compile(pattern, re.MULTILINE | re.DOTALL)
         
         def comment_replacer(match):
@@ -0,0 +1,212 @@
+"""
+Compiler Profiling
+
+This module runs compiler phases under cProfile and writes the results in
+two forms: a .pstats file for pstats, snakeviz and similar tools, and
+collapsed stacks ("frame;frame;frame microseconds" per line) for
+flamegraph.pl, speedscope and other flamegraph tools.
+
+Each phase is profiled separately, so every collapsed stack starts with
+the phase it ran in. cProfile records caller/callee pairs rather than
+whole stacks; stacks are rebuilt by walking the call graph from each
+phase's entry points and splitting a function's time among its callees in
+proportion to the time each call edge took, as pstats-to-flamegraph
+converters do. A function's self time is split among the stacks it
+appears on in the same proportion, and recursive calls are folded into
+the first occurrence of the function on the stack: time below a
+recursive call counts as the outer frame's own. Edge times of recursive
+functions count nested calls again, so a frame's callees are scaled down
+whenever they would add up to more than the frame's cumulative time.
+Every frame's time is thus split exactly between itself and its callees,
+and the stacks of a phase add up to its profiled time.
+"""
+
+import cProfile
+import marshal
+import os
+import pstats
+from contextlib import contextmanager
+from typing import List, Dict, Tuple, Iterator, Any
+
+
+PSTATS_SUFFIX = '.pstats'
+COLLAPSED_SUFFIX = '.collapsed'
+
+# Stacks deeper than this are cut off, and stack samples below this many microseconds dropped
+MAX_STACK_DEPTH = 64
+MIN_MICROSECONDS = 1
+
+# pstats function key: (file name, line number, function name)
+FunctionKey = Tuple[str, int, str]
+
+
+class PhaseProfiler:
+    """
+    Profiles compiler phases with one cProfile profile per phase.
+    """
+
+    def __init__(self):
+        """Initialize the profiler with no phases recorded."""
+        self.profiles: Dict[str, cProfile.Profile] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Profile the enclosed block as part of a phase.
+
+        Args:
+            name: Phase name, the root frame of the phase's stacks
+        """
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+
+    def stats(self) -> pstats.Stats:
+        """
+        Merge the phase profiles into one pstats.Stats.
+
+        Raises:
+            ValueError: If no phase was profiled
+        """
+        profiles = list(self.profiles.values())
+        if not profiles:
+            raise ValueError("No phase was profiled")
+        merged = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            merged.add(profile)
+        return merged
+
+    def pstats_bytes(self) -> bytes:
+        """Contents of the .pstats file (the format pstats.Stats.dump_stats writes)."""
+        return marshal.dumps(self.stats().stats)
+
+    def collapsed_stacks(self) -> List[str]:
+        """
+        Rebuild the call stacks of every phase in collapsed format.
+
+        Returns:
+            Lines of "phase;frame;...;frame microseconds", sorted
+        """
+        samples: Dict[str, int] = {}
+        for name, profile in self.profiles.items():
+            profile.create_stats()
+            for stack, seconds in _phase_stacks(profile.stats):
+                key = ';'.join([name] + stack)
+                samples[key] = samples.get(key, 0) + round(seconds * 1_000_000)
+        return sorted(f"{stack} {micros}" for stack, micros in samples.items() if micros >= MIN_MICROSECONDS)
+
+    def top_functions(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        The functions with the most cumulative time over all phases.
+
+        Args:
+            limit: Number of functions to return
+
+        Returns:
+            Dicts with 'function', 'calls', 'self_ms' and 'cumulative_ms'
+        """
+        entries = sorted(self.stats().stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [{'function': _frame_name(function), 'calls': calls,
+                 'self_ms': round(self_time * 1000, 3), 'cumulative_ms': round(cumulative * 1000, 3)}
+                for function, (_, calls, self_time, cumulative, _) in entries]
+
+    def write(self, output: str) -> Tuple[str, str]:
+        """
+        Write <output>.pstats and <output>.collapsed.
+
+        Args:
+            output: Path without suffix (a .pstats or .collapsed suffix is dropped)
+
+        Returns:
+            (pstats path, collapsed stacks path)
+        """
+        base, suffix = os.path.splitext(output)
+        if suffix not in (PSTATS_SUFFIX, COLLAPSED_SUFFIX):
+            base = output
+        directory = os.path.dirname(base)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        pstats_path, collapsed_path = base + PSTATS_SUFFIX, base + COLLAPSED_SUFFIX
+        self.stats().dump_stats(pstats_path)
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.collapsed_stacks()) + '\n')
+        return pstats_path, collapsed_path
+
+
+def _phase_stacks(raw: Dict[FunctionKey, Tuple]) -> List[Tuple[List[str], float]]:
+    """
+    Rebuild (stack, self seconds) samples from one profile's caller/callee statistics.
+
+    Args:
+        raw: cProfile statistics, function to (primitive calls, calls, self time,
+            cumulative time, callers)
+
+    Returns:
+        Stacks of frame names with the self time spent at their top
+    """
+    callees: Dict[FunctionKey, List[Tuple[FunctionKey, float]]] = {}
+    roots = []
+    for function, (_, calls, _, total, callers) in raw.items():
+        known_callers = [caller for caller in callers if caller in raw]
+        # Calls from frames entered before profiling started are not recorded as edges, so a
+        # function is an entry point whenever its known callers do not account for all its calls
+        # (a recursive function called from outside has only itself as a known caller)
+        if calls > sum(callers[caller][1] for caller in known_callers):
+            # Recursive calls run inside the outer ones, so only other callers' time is subtracted
+            called = sum(callers[caller][3] for caller in known_callers if caller != function)
+            roots.append((function, max(total - called, 0.0)))
+        for caller in known_callers:
+            callees.setdefault(caller, []).append((function, callers[caller][3]))
+
+    samples = []
+
+    def walk(function: FunctionKey, path: List[FunctionKey], cumulative: float):
+        _, _, self_time, total, _ = raw[function]
+        share = cumulative / total if total else 1.0
+        own = min(self_time * share, cumulative)
+        children = []
+        if len(path) < MAX_STACK_DEPTH:
+            children = [(callee, edge_cumulative * share) for callee, edge_cumulative in callees.get(function, [])
+                        if callee not in path]
+        allotted = sum(time for _, time in children)
+        scale = min(1.0, (cumulative - own) / allotted) if allotted else 0.0
+        children = [(callee, time * scale) for callee, time in children if time * scale * 1_000_000 >= MIN_MICROSECONDS]
+
+        # Whatever the callees do not account for stays with this frame
+        samples.append(([_frame_name(frame) for frame in path], cumulative - sum(time for _, time in children)))
+        for callee, time in children:
+            walk(callee, path + [callee], time)
+
+    for root, cumulative in roots:
+        walk(root, [root], cumulative)
+    return samples
+
+
+def _frame_name(function: FunctionKey) -> str:
+    """Collapsed-stack frame for a pstats function key: 'name (file.py:line)', or the built-in's name."""
+    filename, line, name = function
+    if filename == '~':
+        frame = name
+    else:
+        frame = f"{name} ({os.path.basename(filename)}:{line})"
+    return frame.replace(';', ',')
+
+
+if __name__ == "__main__":
+    # Example usage
+    def fibonacci(n):
+        return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+    profiler = PhaseProfiler()
+    with profiler.phase('parse'):
+        words = ' '.join(str(number) for number in range(20000)).split()
+    with profiler.phase('compute'):
+        fibonacci(18)
+    for line in profiler.collapsed_stacks():
+        print(line)
+    for entry in profiler.top_functions(5):
+        print(entry)
@@ -0,0 +1,15 @@
+"""
+Virtual Machine Module
+
+Contains the in-process execution backend for the Simple Language Compiler:
+- BytecodeCompiler: Compiles quadruples into compact bytecode
+- VirtualMachine: Dispatch-loop interpreter with pluggable I/O
+"""
+
+from .bytecode_vm import (
+    Opcode, VMError, BytecodeProgram, VMResult, ConsoleIO, BufferIO,
+    BytecodeCompiler, VirtualMachine, run_program
+)
+
+__all__ = ['Opcode', 'VMError', 'BytecodeProgram', 'VMResult', 'ConsoleIO', 'BufferIO',
+           'BytecodeCompiler', 'VirtualMachine', 'run_program']
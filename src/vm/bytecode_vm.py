@@ -0,0 +1,438 @@
+"""
+Bytecode Virtual Machine
+
+This module compiles the quadruple intermediate code into a compact bytecode
+and executes it in-process, so Automata programs can be run (and
+benchmarked) without an assembler or a DOS emulator.
+
+Bytecode format:
+- Every instruction is four integers: opcode and three operands
+- Variables, temporaries and constants share one flat memory of slots;
+  constants are preloaded, so arithmetic never decodes an immediate
+- String literals live in a separate pool referenced by index
+- Jump targets are code offsets, resolved from IR labels at compile time
+
+Semantics follow the generated 8086 code: integers are unsigned 16-bit
+words, division is unsigned, booleans are 0/1 and print as numbers, and
+every read echoes a newline.
+"""
+
+import sys
+from enum import IntEnum
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+
+
+# Unsigned 16-bit word arithmetic
+WORD_MASK = 0xFFFF
+
+# Input limits of the DOS buffers used by _readint/_readstr
+INT_INPUT_LIMIT = 5
+STR_INPUT_LIMIT = 19
+
+
+class Opcode(IntEnum):
+    """Bytecode instruction set."""
+    HALT = 0
+    MOV = 1          # mem[a] = mem[b]
+    ADD = 2          # mem[a] = mem[b] + mem[c]
+    SUB = 3          # mem[a] = mem[b] - mem[c]
+    MUL = 4          # mem[a] = mem[b] * mem[c]
+    DIV = 5          # mem[a] = mem[b] / mem[c]
+    PRINT_INT = 6    # write mem[a] as decimal
+    PRINT_STR = 7    # write mem[a] as text
+    PRINT_LIT = 8    # write strings[a]
+    READ_INT = 9     # mem[a] = parsed input (unchanged on bad input)
+    READ_STR = 10    # mem[a] = input line
+    JUMP = 11        # pc = a
+    JLT = 12         # if mem[b] < mem[c]: pc = a
+    JLE = 13         # if mem[b] <= mem[c]: pc = a
+    JGT = 14         # if mem[b] > mem[c]: pc = a
+    JGE = 15         # if mem[b] >= mem[c]: pc = a
+    JEQ = 16         # if mem[b] == mem[c]: pc = a
+    JNE = 17         # if mem[b] != mem[c]: pc = a
+
+
+class VMError(Exception):
+    """Runtime error raised while executing bytecode."""
+    pass
+
+
+@dataclass
+class BytecodeProgram:
+    """A compiled program ready to run on the VirtualMachine."""
+    code: List[int]
+    memory: List[Any]
+    strings: List[str]
+    slot_names: List[str] = field(default_factory=list)
+
+    def instruction_count(self) -> int:
+        """Number of instructions in the program."""
+        return len(self.code) // 4
+
+    def disassemble(self) -> List[str]:
+        """Render the bytecode as human-readable lines."""
+        lines = []
+        for pc in range(0, len(self.code), 4):
+            opcode, a, b, c = self.code[pc:pc + 4]
+            if Opcode.JUMP <= opcode <= Opcode.JNE:
+                a //= 4  # Show jump targets as instruction numbers
+            lines.append(f"{pc // 4:4}: {Opcode(opcode).name:10} {a:4} {b:4} {c:4}")
+        return lines
+
+
+@dataclass
+class VMResult:
+    """Outcome of a VM run."""
+    steps: int
+    memory: List[Any]
+    slot_names: List[str]
+
+    def variables(self) -> Dict[str, Any]:
+        """Final value of every named slot."""
+        return dict(zip(self.slot_names, self.memory))
+
+
+class ConsoleIO:
+    """I/O backend that reads from stdin and writes to stdout."""
+
+    def read_line(self) -> str:
+        """Read one line of input."""
+        line = sys.stdin.readline()
+        return line.rstrip('\r\n')
+
+    def write(self, text: str):
+        """Write program output."""
+        sys.stdout.write(text)
+
+
+class BufferIO:
+    """I/O backend that takes scripted input and captures output."""
+
+    def __init__(self, inputs: Optional[List[str]] = None):
+        """
+        Initialize the buffer.
+
+        Args:
+            inputs: Lines returned by successive reads
+        """
+        self.inputs = list(inputs or [])
+        self.position = 0
+        self.chunks: List[str] = []
+
+    def read_line(self) -> str:
+        """Return the next scripted line, or an empty line once exhausted."""
+        if self.position >= len(self.inputs):
+            return ""
+        line = self.inputs[self.position]
+        self.position += 1
+        return line
+
+    def write(self, text: str):
+        """Capture program output."""
+        self.chunks.append(text)
+
+    def getvalue(self) -> str:
+        """Return everything written so far."""
+        return ''.join(self.chunks)
+
+
+class BytecodeCompiler:
+    """
+    Compiles quadruples and the symbol table into a BytecodeProgram.
+    """
+
+    ARITHMETIC_OPCODES = {'+': Opcode.ADD, '-': Opcode.SUB, '*': Opcode.MUL, '/': Opcode.DIV}
+    JUMP_OPCODES = {'j<': Opcode.JLT, 'j<=': Opcode.JLE, 'j>': Opcode.JGT,
+                    'j>=': Opcode.JGE, 'j==': Opcode.JEQ, 'j!=': Opcode.JNE}
+
+    def __init__(self):
+        """Initialize the bytecode compiler."""
+        self.reset()
+
+    def reset(self):
+        """Reset the per-program state."""
+        self.slots: Dict[str, int] = {}
+        self.slot_names: List[str] = []
+        self.memory: List[Any] = []
+        self.types: Dict[str, str] = {}
+        self.temporaries = set()
+        self.strings: List[str] = []
+        self.string_index: Dict[str, int] = {}
+        self.code: List[int] = []
+        self.labels: Dict[str, int] = {}
+        self.fixups: List[Tuple[int, str]] = []
+
+    def compile(self, symbol_table: List[Any], quadruples: List[Any],
+                number_table: List[Any] = None) -> BytecodeProgram:
+        """
+        Compile a program to bytecode.
+
+        Args:
+            symbol_table: Symbol table from the lexical analyzer
+            quadruples: Quadruple intermediate code
+            number_table: Number table for constants
+
+        Returns:
+            Compiled BytecodeProgram
+
+        Raises:
+            VMError: If an operand, operator or jump target is unknown
+        """
+        self.reset()
+
+        for symbol in symbol_table:
+            name, data_type, value = self._unpack_symbol(symbol)
+            self.types[name] = data_type
+            if data_type == "str":
+                initial = str(value).strip('"') if value else ""
+            elif data_type == "boolean":
+                initial = 1 if value in (True, 1, "True") else 0
+            else:
+                initial = int(value or 0) & WORD_MASK
+            self._slot(name, initial)
+
+        # Temporaries are the undeclared names that quadruples compute into
+        for quad in quadruples:
+            operator, _, _, result = self._unpack_quadruple(quad)
+            if (operator in self.ARITHMETIC_OPCODES or operator == '=') and result not in self.types:
+                self.temporaries.add(result)
+
+        for quad in quadruples:
+            self._compile_quadruple(*self._unpack_quadruple(quad))
+
+        self._emit(Opcode.HALT)
+
+        # Patch jump targets now that every label has an offset
+        for position, label in self.fixups:
+            if label not in self.labels:
+                raise VMError(f"Jump to undefined label '{label}'")
+            self.code[position] = self.labels[label]
+
+        return BytecodeProgram(self.code, self.memory, self.strings, self.slot_names)
+
+    def _compile_quadruple(self, operator: str, operand1: str, operand2: str, result: str):
+        """Translate one quadruple into bytecode."""
+        if operator in self.ARITHMETIC_OPCODES:
+            self._emit(self.ARITHMETIC_OPCODES[operator], self._operand(result),
+                       self._operand(operand1), self._operand(operand2))
+        elif operator == '=':
+            self._emit(Opcode.MOV, self._operand(result), self._operand(operand1))
+        elif operator == 'print':
+            if len(operand1) >= 2 and operand1[0] == '"' and operand1[-1] == '"':
+                self._emit(Opcode.PRINT_LIT, self._string(operand1[1:-1]))
+            elif self.types.get(operand1) == "str":
+                self._emit(Opcode.PRINT_STR, self._operand(operand1))
+            else:
+                self._emit(Opcode.PRINT_INT, self._operand(operand1))
+        elif operator == 'read':
+            if self.types.get(result) == "str":
+                self._emit(Opcode.READ_STR, self._operand(result))
+            elif self.types.get(result) == "int":
+                self._emit(Opcode.READ_INT, self._operand(result))
+        elif operator == 'label':
+            self.labels[result] = len(self.code)
+        elif operator == 'goto':
+            self._emit_jump(Opcode.JUMP, result)
+        elif operator in self.JUMP_OPCODES:
+            self._emit_jump(self.JUMP_OPCODES[operator], result,
+                            self._operand(operand1), self._operand(operand2))
+        else:
+            raise VMError(f"Unsupported quadruple operator '{operator}'")
+
+    def _emit(self, opcode: Opcode, a: int = 0, b: int = 0, c: int = 0):
+        """Append one fixed-width instruction."""
+        self.code.extend((int(opcode), a, b, c))
+
+    def _emit_jump(self, opcode: Opcode, label: str, b: int = 0, c: int = 0):
+        """Append a jump whose target offset is patched once labels are known."""
+        self.fixups.append((len(self.code) + 1, label))
+        self._emit(opcode, 0, b, c)
+
+    def _operand(self, name: str) -> int:
+        """
+        Resolve a variable, temporary or numeric literal to its memory slot.
+
+        Raises:
+            VMError: If the operand is none of those
+        """
+        if name in self.slots:
+            return self.slots[name]
+        if name.isdigit():
+            return self._slot(name, int(name) & WORD_MASK)
+        if name in self.temporaries:
+            return self._slot(name, 0)
+        raise VMError(f"Unknown operand '{name}'")
+
+    def _slot(self, name: str, initial: Any) -> int:
+        """Allocate a memory slot with an initial value."""
+        self.slots[name] = len(self.memory)
+        self.slot_names.append(name)
+        self.memory.append(initial)
+        return self.slots[name]
+
+    def _string(self, literal: str) -> int:
+        """Intern a string literal in the string pool."""
+        if literal not in self.string_index:
+            self.string_index[literal] = len(self.strings)
+            self.strings.append(literal)
+        return self.string_index[literal]
+
+    def _unpack_symbol(self, symbol: Any) -> Tuple[str, str, Any]:
+        """Return (name, type, value) for either symbol table format."""
+        if hasattr(symbol, 'name'):
+            data_type = symbol.data_type.value if hasattr(symbol.data_type, 'value') else symbol.data_type
+            return symbol.name, data_type, symbol.value
+        return symbol[0], symbol[1], symbol[2]
+
+    def _unpack_quadruple(self, quad: Any) -> Tuple[str, str, str, str]:
+        """Return (operator, operand1, operand2, result) for either quadruple format."""
+        if hasattr(quad, 'operator'):
+            return quad.operator, quad.operand1, quad.operand2, quad.result
+        padded = list(quad) + [""] * (4 - len(quad))
+        return padded[0], padded[1], padded[2], padded[3]
+
+
+class VirtualMachine:
+    """
+    Dispatch-loop interpreter for BytecodeProgram.
+    """
+
+    def __init__(self, io: Any = None, max_steps: Optional[int] = None):
+        """
+        Initialize the virtual machine.
+
+        Args:
+            io: Object with read_line() and write(str); defaults to ConsoleIO
+            max_steps: Optional instruction budget, None for unlimited
+        """
+        self.io = io or ConsoleIO()
+        self.max_steps = max_steps
+
+    def run(self, program: BytecodeProgram) -> VMResult:
+        """
+        Execute a program.
+
+        Args:
+            program: Compiled bytecode program
+
+        Returns:
+            VMResult with the step count and final memory
+
+        Raises:
+            VMError: On division by zero or when the step budget is exhausted
+        """
+        code = program.code
+        memory = list(program.memory)
+        strings = program.strings
+        write = self.io.write
+        read_line = self.io.read_line
+        # Raise when instruction max_steps + 1 is about to run; -1 never matches
+        budget = self.max_steps + 1 if self.max_steps is not None else -1
+
+        pc = 0
+        steps = 0
+        while True:
+            opcode = code[pc]
+            a = code[pc + 1]
+            pc += 4
+            steps += 1
+            if steps == budget:
+                raise VMError(f"Step budget of {self.max_steps} instructions exhausted")
+
+            if opcode == 1:    # MOV
+                memory[a] = memory[code[pc - 2]]
+            elif opcode == 2:  # ADD
+                memory[a] = (memory[code[pc - 2]] + memory[code[pc - 1]]) & 0xFFFF
+            elif opcode == 3:  # SUB
+                memory[a] = (memory[code[pc - 2]] - memory[code[pc - 1]]) & 0xFFFF
+            elif opcode == 4:  # MUL
+                memory[a] = (memory[code[pc - 2]] * memory[code[pc - 1]]) & 0xFFFF
+            elif opcode == 5:  # DIV
+                divisor = memory[code[pc - 1]]
+                if divisor == 0:
+                    raise VMError("Division by zero")
+                memory[a] = memory[code[pc - 2]] // divisor
+            elif opcode == 11:  # JUMP
+                pc = a
+            elif opcode == 12:  # JLT
+                if memory[code[pc - 2]] < memory[code[pc - 1]]:
+                    pc = a
+            elif opcode == 13:  # JLE
+                if memory[code[pc - 2]] <= memory[code[pc - 1]]:
+                    pc = a
+            elif opcode == 14:  # JGT
+                if memory[code[pc - 2]] > memory[code[pc - 1]]:
+                    pc = a
+            elif opcode == 15:  # JGE
+                if memory[code[pc - 2]] >= memory[code[pc - 1]]:
+                    pc = a
+            elif opcode == 16:  # JEQ
+                if memory[code[pc - 2]] == memory[code[pc - 1]]:
+                    pc = a
+            elif opcode == 17:  # JNE
+                if memory[code[pc - 2]] != memory[code[pc - 1]]:
+                    pc = a
+            elif opcode == 8:  # PRINT_LIT
+                write(strings[a])
+            elif opcode == 6:  # PRINT_INT
+                write(str(memory[a]))
+            elif opcode == 7:  # PRINT_STR
+                write(memory[a])
+            elif opcode == 9:  # READ_INT
+                text = read_line()[:INT_INPUT_LIMIT]
+                if text.isdigit() and int(text) <= WORD_MASK:
+                    memory[a] = int(text)
+                write('\n')
+            elif opcode == 10:  # READ_STR
+                memory[a] = read_line()[:STR_INPUT_LIMIT]
+                write('\n')
+            elif opcode == 0:  # HALT
+                break
+            else:
+                raise VMError(f"Invalid opcode {opcode} at {pc // 4 - 1}")
+
+        return VMResult(steps, memory, program.slot_names)
+
+
+def run_program(symbol_table: List[Any], quadruples: List[Any],
+                number_table: List[Any] = None, io: Any = None,
+                max_steps: Optional[int] = None) -> VMResult:
+    """
+    Convenience function to compile and run a program on the VM.
+
+    Args:
+        symbol_table: Symbol table from analyzer
+        quadruples: Intermediate code quadruples
+        number_table: Number constants table
+        io: I/O backend (ConsoleIO by default)
+        max_steps: Optional instruction budget
+
+    Returns:
+        VMResult of the run
+    """
+    program = BytecodeCompiler().compile(symbol_table, quadruples, number_table)
+    return VirtualMachine(io, max_steps).run(program)
+
+
+if __name__ == "__main__":
+    # Example usage
+    mock_symbol_table = [
+        ['x', 'int', 42, 'id0', 'NoRead'],
+        ['result', 'int', 0, 'id1', 'NoRead']
+    ]
+
+    mock_quadruples = [
+        ['+', 'x', '10', '_t1'],
+        ['=', '_t1', '', 'result'],
+        ['print', '"result = "', '', ''],
+        ['print', 'result', '', '']
+    ]
+
+    program = BytecodeCompiler().compile(mock_symbol_table, mock_quadruples)
+    for line in program.disassemble():
+        print(line)
+
+    io = BufferIO()
+    result = VirtualMachine(io).run(program)
+    print(f"Output: {io.getvalue()!r} in {result.steps} steps")
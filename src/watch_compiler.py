@@ -0,0 +1,148 @@
+"""
+Automata Language Compiler - Watch Mode
+
+This module recompiles sources as they are saved. It polls the
+modification time and size of every .af file under the watched paths and
+compiles only the files whose signature changed, in this process, which
+has the compiler imported and its regexes compiled from the first
+compilation on. Each recompile prints how long it took.
+
+Every compilation goes through the compilation cache, so a save that
+restores earlier contents, a touch without an edit, or restarting the
+watcher reuses the stored results of every phase instead of running them
+again. Outputs go to <root>/<name>/ as in batch compilation, and a file
+keeps its output directory for as long as it is watched.
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Dict, Optional, Tuple
+
+# Add src directory to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__)))
+
+from batch_compiler import DEFAULT_OUTPUT_ROOT, BatchResult, compile_job, expand_sources
+
+
+# Seconds between scans of the watched paths
+POLL_INTERVAL = 0.1
+
+
+class SourceWatcher:
+    """
+    Tracks the .af files under a set of paths and reports which ones changed.
+    """
+
+    def __init__(self, patterns: List[str], output_root: str = DEFAULT_OUTPUT_ROOT):
+        """
+        Initialize the watcher; the first poll reports every source as changed.
+
+        Args:
+            patterns: Files, directories or glob patterns to watch
+            output_root: Directory holding one output directory per source
+        """
+        self.patterns = list(patterns)
+        self.output_root = output_root
+        self.signatures: Dict[str, Tuple[int, int]] = {}
+        self.output_dirs: Dict[str, str] = {}
+
+    def poll(self) -> Tuple[List[str], List[str]]:
+        """
+        Scan the watched paths.
+
+        Returns:
+            (sources that are new or whose modification time or size changed,
+             sources that disappeared) since the previous poll
+        """
+        sources, _ = expand_sources(self.patterns)
+        current = {}
+        for source in sources:
+            try:
+                status = os.stat(source)
+            except OSError:
+                continue
+            current[source] = (status.st_mtime_ns, status.st_size)
+
+        changed = [source for source, signature in current.items() if self.signatures.get(source) != signature]
+        removed = [source for source in self.signatures if source not in current]
+        self.signatures = current
+        for source in changed:
+            self._assign_output_dir(source)
+        for source in removed:
+            del self.output_dirs[source]
+        return changed, removed
+
+    def _assign_output_dir(self, source: str):
+        """Give a newly seen source <root>/<name>, numbered when the name is taken."""
+        if source in self.output_dirs:
+            return
+        taken = {os.path.basename(directory) for directory in self.output_dirs.values()}
+        name = Path(source).stem
+        candidate, number = name, 1
+        while candidate in taken:
+            number += 1
+            candidate = f"{name}-{number}"
+        self.output_dirs[source] = os.path.join(self.output_root, candidate)
+
+
+def watch(patterns: List[str], output_root: str = DEFAULT_OUTPUT_ROOT, optimization_level: int = 2,
+          interval: float = POLL_INTERVAL, polls: Optional[int] = None) -> List[BatchResult]:
+    """
+    Compile the watched sources, then recompile each one whenever it changes.
+
+    Runs until interrupted with Ctrl-C, or for a fixed number of polls.
+
+    Args:
+        patterns: Files, directories or glob patterns to watch
+        output_root: Directory holding one output directory per source
+        optimization_level: Preset optimization pipeline (0, 1 or 2)
+        interval: Seconds between polls
+        polls: Stop after this many polls (None: until interrupted)
+
+    Returns:
+        Results of every compilation, in the order they ran
+    """
+    watcher = SourceWatcher(patterns, output_root)
+    options = {'optimization_level': optimization_level, 'cache': True}
+    results = []
+
+    _, missing = expand_sources(patterns)
+    for pattern in missing:
+        print(f"⚠️  Nothing matches {pattern} yet")
+    print(f"👀 Watching {', '.join(patterns)} (Ctrl-C to stop)")
+
+    count = 0
+    try:
+        while polls is None or count < polls:
+            changed, removed = watcher.poll()
+            for source in removed:
+                print(f"   - {source} removed")
+            for source in changed:
+                result = compile_job(source, watcher.output_dirs[source], options)
+                results.append(result)
+                _report(result)
+            count += 1
+            if polls is None or count < polls:
+                time.sleep(interval)
+    except KeyboardInterrupt:
+        print()
+    print(f"Stopped watching after {len(results)} compilations")
+    return results
+
+
+def _report(result: BatchResult):
+    """Print the outcome and latency of one recompile."""
+    stamp = time.strftime('%H:%M:%S')
+    latency = f"{result.seconds * 1000:.1f} ms{', cached' if result.cache_hit else ''}"
+    if result.success:
+        print(f"   [{stamp}] ✓ {result.source} -> {result.output_dir} ({latency})")
+    else:
+        print(f"   [{stamp}] ✗ {result.source}: {result.error or 'compilation failed'} ({latency})")
+
+
+if __name__ == "__main__":
+    # Example usage: compile the examples once, then watch them for a second
+    examples = os.path.join(os.path.dirname(__file__), '..', 'examples')
+    watch([examples], output_root=os.path.join('build', 'examples'), polls=10)
@@ -0,0 +1,54 @@
+"""
+Shared fixtures for the compiler test suite.
+
+The compiler modules import each other as top-level packages (codegen,
+optimizer, ...), so the src directory is put on the path here, as
+compiler.py does for itself.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+EXAMPLES = ROOT / "examples"
+
+sys.path.insert(0, str(SRC))
+
+from compiler import SimpleCompiler  # noqa: E402
+
+
+@pytest.fixture
+def write_source(tmp_path):
+    """Write a program into the test's directory and return its path."""
+    def write(name: str, text: str) -> str:
+        path = tmp_path / name
+        path.write_text(text, encoding='utf-8')
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def copy_example(tmp_path):
+    """Copy an example program into the test's directory, since compiling writes next to the source."""
+    def copy(name: str) -> str:
+        return str(shutil.copy(EXAMPLES / name, tmp_path / name))
+    return copy
+
+
+@pytest.fixture
+def compile_source(tmp_path):
+    """Compile a source file quietly into the test's directory and return the compiler."""
+    def compile_file(source_file: str, **options) -> SimpleCompiler:
+        options.setdefault('output_dir', str(tmp_path / "out"))
+        compiler = SimpleCompiler(source_file, **options)
+        with contextlib.redirect_stdout(io.StringIO()):
+            assert compiler.compile(), f"compiling {os.path.basename(source_file)} failed"
+        return compiler
+    return compile_file
@@ -0,0 +1,224 @@
+"""
+Differential tests of the execution backends.
+
+Every program is compiled at -O0, -O1 and -O2 and run on the 8086
+emulator (generated assembly), the bytecode VM and the Python backend
+(quadruples); all three must print the same thing.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from codegen.cost_model import estimate_size
+from codegen.python_generator import run_python
+from emulator.cpu8086 import emulate_file
+from vm.bytecode_vm import BufferIO, VMError, run_program
+
+LEVELS = (0, 1, 2)
+
+EXAMPLES = {
+    "basic_program.af": ["5"],
+    "arithmetic.af": [],
+    "control_flow.af": ["1"],
+    "boolean_literals.af": ["1"],
+}
+
+# name -> (source, input lines, expected output or None)
+PROGRAMS = {
+    # User variables shaped like compiler temporaries
+    "temp_names": ("""
+int t1 = 5;
+int x = 0;
+x = t1 + 2;
+int y = x * 3 + t1;
+print(x + " " + y + " " + t1);
+""", [], "7 26 5"),
+    # User variables shaped like number table identifiers
+    "number_names": ("""
+int n0 = 5;
+int n1 = 6;
+int x = 0;
+x = n1 * 3;
+print(x + " ");
+x = n0 + 7;
+print(x);
+""", [], "18 12"),
+    # Boolean literals in comparisons, alone and under && / || / !
+    "boolean_literals": ("""
+boolean f = True;
+boolean g = False;
+int a = 3;
+read(a);
+if(f == True) {
+    print("f");
+}
+if(g != False) {
+    print("g");
+}
+if(a > 1 && f == True) {
+    print("and");
+}
+if(g == True || a == 3) {
+    print("or");
+}
+if(!(f == False) && g == False) {
+    print("not");
+}
+""", ["3"], "\nfandornot"),
+    # Loop rotation, invariant hoisting and strength reduction
+    "loop": ("""
+int n;
+int i = 0;
+int k = 3;
+int total = 0;
+read(n);
+while(i < n) {
+    total = total + i * 8 + k * 10 + (k + 1) / 4;
+    i = i + 1;
+}
+print("total " + total);
+""", ["6"], None),
+    # Nested loops and else branches
+    "nested": ("""
+int n;
+int i = 0;
+int hits = 0;
+read(n);
+while(i < n) {
+    int j = 0;
+    while(j < i) {
+        if(j == 2 || i == 4) {
+            hits = hits + 1;
+        } else {
+            hits = hits + 2;
+        }
+        j = j + 1;
+    }
+    i = i + 1;
+}
+print(hits);
+""", ["5"], None),
+    # Repeated literals share one data label
+    "repeated_literals": ("""
+int i = 0;
+while(i < 3) {
+    print("tick ");
+    i = i + 1;
+}
+print("tick ");
+""", [], "tick tick tick tick "),
+    # User variables named like pooled literal labels
+    "literal_names": ("""
+int str1 = 5;
+int y = 0;
+read(y);
+print("hi " + str1 + y);
+""", ["3"], "\nhi 53"),
+    # User variables named after registers and mnemonics
+    "register_names": ("""
+int ax = 5;
+int bx = 0;
+int mov = 4;
+read(bx);
+ax = ax + bx * mov;
+print(ax);
+""", ["2"], "\n13"),
+    # User variables named like the runtime routines and their data
+    "runtime_names": ("""
+int todec = 5;
+int readint = 0;
+str printstr = "p";
+int numeroLectura = 1;
+read(readint);
+todec = todec + readint + numeroLectura;
+print(printstr + todec);
+""", ["4"], "\np10"),
+    # String assignments resolved at compile time
+    "string_assignments": ("""
+str s = "a";
+str t = "b";
+int x = 0;
+s = "c";
+t = s;
+read(x);
+print(s + t + x);
+""", ["1"], "\ncc1"),
+    # An if body too long for a short conditional jump
+    "far_branches": ("""
+int x = 0;
+int y = 1;
+int n = 0;
+read(n);
+while(n > 0) {
+    if(n > 3) {
+""" + "".join(f"        x = x + y * {i};\n" for i in range(2, 40)) + """    }
+    n = n - 1;
+}
+print(x);
+""", ["5"], "\n1558"),
+}
+
+
+def run_backends(compiler, inputs):
+    """Run a compiled program on every backend and return their outputs."""
+    outputs = {}
+
+    io = BufferIO(inputs)
+    run_program(compiler.symbol_table, compiler.quadruples, compiler.number_table, io)
+    outputs['vm'] = io.getvalue()
+
+    io = BufferIO(inputs)
+    run_python(compiler.symbol_table, compiler.quadruples, compiler.number_table, io)
+    outputs['python'] = io.getvalue()
+
+    outputs['emulator'] = emulate_file(compiler.assembly_output, BufferIO(inputs)).output
+    return outputs
+
+
+def assert_agree(outputs, expected=None):
+    assert outputs['vm'] == outputs['python'] == outputs['emulator'], outputs
+    if expected is not None:
+        assert outputs['vm'] == expected
+
+
+@pytest.mark.parametrize("level", LEVELS)
+@pytest.mark.parametrize("name", sorted(EXAMPLES))
+def test_examples_agree(name, level, copy_example, compile_source):
+    compiler = compile_source(copy_example(name), optimization_level=level)
+    assert_agree(run_backends(compiler, EXAMPLES[name]))
+
+
+@pytest.mark.parametrize("level", LEVELS)
+@pytest.mark.parametrize("name", sorted(PROGRAMS))
+def test_programs_agree(name, level, write_source, compile_source):
+    source, inputs, expected = PROGRAMS[name]
+    compiler = compile_source(write_source(f"{name}.af", source), optimization_level=level)
+    assert_agree(run_backends(compiler, inputs), expected)
+
+
+@pytest.mark.parametrize("name", ["loop", "nested"])
+def test_outlined_assembly_agrees(name, write_source, compile_source):
+    source, inputs, _ = PROGRAMS[name]
+    compiler = compile_source(write_source(f"{name}.af", source), outline=True)
+    assert_agree(run_backends(compiler, inputs))
+
+
+def test_outlining_shrinks_the_code_and_keeps_the_output(write_source, compile_source, tmp_path):
+    source, inputs, _ = PROGRAMS["far_branches"]
+    path = write_source("far_branches.af", source)
+    plain = compile_source(path)
+    outlined = compile_source(path, outline=True, output_dir=str(tmp_path / "outlined"))
+
+    sizes = [estimate_size(Path(compiler.assembly_output).read_text(encoding='utf-8').splitlines())
+             for compiler in (plain, outlined)]
+    assert sizes[1] < sizes[0]
+    outputs = [emulate_file(compiler.assembly_output, BufferIO(inputs)).output for compiler in (plain, outlined)]
+    assert outputs[0] == outputs[1] == PROGRAMS["far_branches"][2]
+
+
+def test_vm_rejects_unknown_operands():
+    symbols = [['f', 'boolean', True, 'id0', 'NoRead']]
+    quadruples = [['j!=', 'f', 'True', 'L1'], ['label', '', '', 'L1']]
+    with pytest.raises(VMError, match="Unknown operand 'True'"):
+        run_program(symbols, quadruples, io=BufferIO())
@@ -0,0 +1,90 @@
+"""
+Tests of the parallel batch compiler.
+"""
+
+import multiprocessing
+import os
+import shutil
+
+import pytest
+
+import batch_compiler
+from batch_compiler import assign_output_dirs, compile_batch, expand_sources
+from conftest import EXAMPLES
+
+COMPILE_JOB = batch_compiler.compile_job
+
+
+@pytest.fixture
+def source_tree(tmp_path):
+    """Two directories holding sources, one name repeated across them."""
+    for directory in ("one", "two"):
+        (tmp_path / directory).mkdir()
+        shutil.copy(EXAMPLES / "arithmetic.af", tmp_path / directory / "arithmetic.af")
+    shutil.copy(EXAMPLES / "basic_program.af", tmp_path / "one" / "basic_program.af")
+    return tmp_path
+
+
+def test_sources_expand_from_files_directories_and_globs(source_tree):
+    one = str(source_tree / "one")
+    sources, missing = expand_sources([one, str(source_tree / "*" / "arithmetic.af"), str(source_tree / "none")])
+    assert sources == [
+        os.path.join(one, "arithmetic.af"),
+        os.path.join(one, "basic_program.af"),
+        os.path.join(str(source_tree), "two", "arithmetic.af"),
+    ]
+    assert missing == [str(source_tree / "none")]
+
+
+def test_repeated_names_get_separate_output_directories():
+    directories = assign_output_dirs(["a/x.af", "b/x.af", "c/y.af"], "build")
+    assert directories == {
+        "a/x.af": os.path.join("build", "x"),
+        "b/x.af": os.path.join("build", "x-2"),
+        "c/y.af": os.path.join("build", "y"),
+    }
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_batch_compiles_every_source(source_tree, jobs):
+    output_root = str(source_tree / "build")
+    summary = compile_batch([str(source_tree)], output_root=output_root, jobs=jobs, verbose=False)
+
+    assert summary.success
+    assert [os.path.basename(result.output_dir) for result in summary.results] == \
+        ["arithmetic", "basic_program", "arithmetic-2"]
+    for result in summary.results:
+        name = os.path.splitext(os.path.basename(result.source))[0]
+        assert os.path.isfile(os.path.join(result.output_dir, f"{name}.asm"))
+        assert result.stats is not None
+    assert "3/3 files compiled" in summary.format()
+
+
+def test_batch_reports_failures_and_missing_sources(tmp_path):
+    (tmp_path / "broken.af").write_text("int x = ;\n", encoding='utf-8')
+    summary = compile_batch([str(tmp_path / "broken.af"), str(tmp_path / "absent.af")],
+                            output_root=str(tmp_path / "build"), jobs=1, verbose=False)
+
+    assert not summary.success
+    assert len(summary.failures) == 1
+    assert summary.missing == [str(tmp_path / "absent.af")]
+    assert "Not found" in summary.format()
+
+
+def crash_on_crash_af(source, output_dir, options):
+    """compile_job that kills its worker for sources named crash.af."""
+    if os.path.basename(source) == "crash.af":
+        os._exit(1)
+    return COMPILE_JOB(source, output_dir, options)
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="workers must inherit the patched compile_job")
+def test_a_crashing_worker_fails_only_its_source(source_tree, monkeypatch):
+    shutil.copy(EXAMPLES / "arithmetic.af", source_tree / "one" / "crash.af")
+    monkeypatch.setattr(batch_compiler, "compile_job", crash_on_crash_af)
+    summary = compile_batch([str(source_tree)], output_root=str(source_tree / "build"), jobs=2, verbose=False)
+
+    assert len(summary.results) == 4
+    assert [os.path.basename(result.source) for result in summary.failures] == ["crash.af"]
+    assert "terminated abruptly" in summary.failures[0].error
@@ -0,0 +1,137 @@
+"""
+Tests of the assembly generator and its instruction selection, layout and reports.
+"""
+
+import io
+
+import pytest
+
+from codegen.assembly_generator import AssemblyGenerator
+from codegen.cost_model import estimate_cycles
+
+
+def emit(symbols, quadruples, **options):
+    """Generate a program into a string and return (assembly, generator)."""
+    generator = AssemblyGenerator(**options)
+    stream = io.StringIO()
+    assert generator.emit_program(stream, symbols, quadruples, report_name="test.asm")
+    return stream.getvalue(), generator
+
+
+def instructions(assembly):
+    """Instruction lines of an assembly listing, stripped."""
+    return [line.strip() for line in assembly.splitlines() if line.strip()]
+
+
+def test_out_of_range_branches_are_relaxed():
+    symbols = [['x', 'int', 0, 'id0', 'NoRead'], ['y', 'int', 1, 'id1', 'NoRead']]
+    body = [['+', 'x', 'y', '_t1'], ['=', '_t1', '', 'x']] * 40
+    quadruples = [['j>', 'y', '5', 'L1'], ['j<', 'x', '3', 'L2'], *body, ['label', '', '', 'L2'],
+                  ['label', '', '', 'L1']]
+    assembly, generator = emit(symbols, quadruples)
+    lines = instructions(assembly)
+
+    # Both branches are lengthened into an inverted branch over a near jump
+    start = lines.index('jbe _B1')
+    assert lines[start:start + 3] == ['jbe _B1', 'jmp _L1', '_B1:']
+    start = lines.index('jae _B2')
+    assert lines[start:start + 3] == ['jae _B2', 'jmp _L2', '_B2:']
+    # The sizing pass does not record the tile selections twice
+    assert len(generator.tile_selections) == len(body)
+
+
+def test_branches_in_range_stay_short():
+    symbols = [['x', 'int', 0, 'id0', 'NoRead']]
+    quadruples = [['j<', 'x', '3', 'L1'], ['+', 'x', '1', '_t1'], ['=', '_t1', '', 'x'], ['label', '', '', 'L1']]
+    lines = instructions(emit(symbols, quadruples)[0])
+    assert 'jb _L1' in lines and '_B1:' not in lines
+
+
+def test_cost_report_is_collected_from_the_emitted_code():
+    symbols = [['x', 'int', 0, 'id0', 'NoRead'], ['s', 'str', '', 'id1', 'NoRead']]
+    quadruples = [['read', '', '', 's'], ['*', 'x', '8', '_t1'], ['=', '_t1', '', 'x'],
+                  ['j==', 'x', '0', 'L1'], ['print', '"big"', '', ''], ['label', '', '', 'L1'],
+                  ['print', 'x', '', '']]
+    _, generator = emit(symbols, quadruples)
+    standalone = AssemblyGenerator().generate_cost_report(symbols, quadruples, name="test.asm")
+    assert generator.cost_report.format() == standalone.format()
+
+
+def test_programs_with_jumps_are_streamed():
+    symbols = [['x', 'int', 0, 'id0', 'NoRead']]
+    body = [['+', 'x', '3', '_t1'], ['=', '_t1', '', 'x']] * 20
+    quadruples = [['label', '', '', 'L1'], *body, ['j<', 'x', '100', 'L1']]
+    generator = AssemblyGenerator()
+
+    class Recorder(io.StringIO):
+        """Remembers how many statements had been selected when the first code line arrived."""
+        selected_at_first_code = None
+
+        def write(self, text):
+            if text.strip() == '_L1:' and self.selected_at_first_code is None:
+                self.selected_at_first_code = len(generator.tile_selections)
+            return super().write(text)
+
+    stream = Recorder()
+    assert generator.emit_program(stream, symbols, quadruples)
+    assert stream.selected_at_first_code == 0
+    assert len(generator.tile_selections) == len(body)
+
+
+def test_power_of_two_constants_multiply_and_divide_by_shifting():
+    symbols = [['x', 'int', 7, 'id0', 'NoRead'], ['y', 'int', 0, 'id1', 'NoRead']]
+    quadruples = [['*', 'x', '8', '_t1'], ['=', '_t1', '', 'y'], ['print', 'y', '', ''],
+                  ['/', 'x', '4', '_t2'], ['=', '_t2', '', 'y'], ['print', 'y', '', '']]
+    _, generator = emit(symbols, quadruples)
+    multiply, divide = (selection.code for selection in generator.tile_selections)
+
+    assert multiply.count('        shl ax, 1') == 3
+    assert divide.count('        shr ax, 1') == 2
+    for code in (multiply, divide):
+        assert not any(line.split()[0] in ('mul', 'div', 'imul', 'idiv') for line in code if line.strip())
+
+
+@pytest.mark.parametrize("name", ["basic_program.af", "control_flow.af"])
+def test_cost_report_totals_match_the_per_line_rows(name, copy_example, compile_source):
+    compiler = compile_source(copy_example(name))
+    report = AssemblyGenerator().generate_cost_report(compiler.symbol_table, compiler.quadruples)
+    rows = report.by_line()
+    kinds = report.by_kind().values()
+
+    assert report.statement_size == sum(size for _, _, _, size, _ in rows) > 0
+    assert [sum(column) for column in zip(*kinds)] == \
+        [len(rows), *(sum(row[column] for row in rows) for column in (2, 3, 4))]
+    program_size = sum(instruction.size for instruction in report.program)
+    assert report.code_size == report.statement_size + report.runtime_size + program_size
+    assert f"Code bytes: {report.code_size} (statements {report.statement_size}," in report.format()
+
+
+def test_booleans_are_bytes_declared_after_the_words():
+    symbols = [['f', 'boolean', True, 'id0', 'NoRead'], ['s', 'str', '"hi"', 'id1', 'NoRead'],
+               ['x', 'int', 3, 'id2', 'NoRead'], ['g', 'boolean', False, 'id3', 'NoRead'],
+               ['y', 'int', 4, 'id4', 'NoRead']]
+    quadruples = [['print', 'x', '', ''], ['print', 'y', '', ''], ['print', 's', '', ''],
+                  ['j==', 'f', 'g', 'L1'], ['label', '', '', 'L1']]
+    lines = instructions(emit(symbols, quadruples)[0])
+    declarations = [line.split() for line in lines if len(line.split()) > 2 and line.split()[1] in ('DW', 'DB')]
+    names = [parts[0] for parts in declarations]
+
+    assert ['f', 'DB', '1'] in declarations and ['g', 'DB', '0'] in declarations
+    assert names.index('x') < names.index('y') < names.index('f')
+    # No byte declaration comes before a word, so every word is at an even offset
+    kinds = [parts[1] for parts in declarations]
+    assert kinds == sorted(kinds, key=lambda kind: kind != 'DW')
+
+
+def test_tile_selection_picks_the_cheaper_form():
+    symbols = [['x', 'int', 0, 'id0', 'NoRead'], ['y', 'int', 2, 'id1', 'NoRead']]
+    statements = [('x', '1', '+'), ('x', '5', '+'), ('x', 'y', '+'), ('y', '1', '+'), ('x', '1', '-')]
+    quadruples = [quad for number, (left, right, operator) in enumerate(statements, 1)
+                  for quad in ([operator, left, right, f'_t{number}'], ['=', f'_t{number}', '', 'x'])]
+    _, generator = emit(symbols, quadruples + [['print', 'x', '', '']])
+
+    assert [selection.tiles for selection in generator.tile_selections] == [
+        ['inc-mem'], ['add-mem-imm'], ['load-mem', 'add-mem-reg'], ['load-mem', 'inc', 'store'], ['dec-mem']]
+    # Operating on the destination in memory beats loading, adding and storing it
+    load_add_store = ['        mov ax, x', '        add ax, 5', '        mov x, ax']
+    assert estimate_cycles(generator.tile_selections[1].code) < estimate_cycles(load_add_store)
@@ -0,0 +1,84 @@
+"""
+Tests of the content-addressed compilation cache.
+"""
+
+from pathlib import Path
+
+from conftest import EXAMPLES
+from utils.compile_cache import CompileCache, cache_key
+
+OPTIONS = {'optimization_level': 2}
+
+
+def test_keys_depend_on_source_options_and_compiler():
+    key = cache_key("print(1);", OPTIONS, fingerprint="a")
+    assert key == cache_key("print(1);", OPTIONS, fingerprint="a")
+    assert key != cache_key("print(2);", OPTIONS, fingerprint="a")
+    assert key != cache_key("print(1);", {'optimization_level': 1}, fingerprint="a")
+    assert key != cache_key("print(1);", OPTIONS, fingerprint="b")
+
+
+def test_entries_round_trip_and_are_counted(tmp_path):
+    cache = CompileCache(str(tmp_path))
+    key = cache_key("print(1);", OPTIONS, fingerprint="a")
+    assert cache.get(key) is None
+    cache.put(key, {'assembly': '; program'})
+    assert cache.get(key) == {'assembly': '; program'}
+
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.stores, stats.entries) == (1, 1, 1, 1)
+    cache.clear()
+    assert cache.stats().entries == 0
+
+
+def test_corrupt_entries_are_dropped(tmp_path):
+    cache = CompileCache(str(tmp_path))
+    key = cache_key("print(1);", OPTIONS, fingerprint="a")
+    cache.put(key, {'assembly': '; program'})
+    entry = next(path for path in Path(tmp_path).iterdir() if path.name.startswith(key))
+    entry.write_text("{not json", encoding='utf-8')
+
+    assert cache.get(key) is None
+    assert not entry.exists()
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = CompileCache(str(tmp_path), max_bytes=400)
+    keys = [cache_key(f"program {number}", OPTIONS, fingerprint="a") for number in range(6)]
+    for key in keys:
+        cache.put(key, {'assembly': 'x' * 50})
+
+    stats = cache.stats()
+    assert stats.size_bytes <= 400
+    assert stats.evictions > 0
+    assert cache.get(keys[-1]) is not None
+    assert cache.get(keys[0]) is None
+
+
+def test_compiler_restores_unchanged_sources(tmp_path, copy_example, compile_source):
+    cache = CompileCache(str(tmp_path / "cache"))
+    source = copy_example("arithmetic.af")
+
+    first = compile_source(source, cache=cache)
+    assembly = Path(first.assembly_output).read_text(encoding='utf-8')
+    assert not first.cache_hit
+
+    Path(first.assembly_output).unlink()
+    second = compile_source(source, cache=cache)
+    assert second.cache_hit
+    assert Path(second.assembly_output).read_text(encoding='utf-8') == assembly
+    assert [symbol.name for symbol in second.symbol_table] == [symbol.name for symbol in first.symbol_table]
+
+
+def test_identical_sources_keep_their_own_names(tmp_path, write_source, compile_source):
+    cache = CompileCache(str(tmp_path / "cache"))
+    text = (EXAMPLES / "basic_program.af").read_text(encoding='utf-8')
+    one = compile_source(write_source("one.af", text), cache=cache)
+    two = compile_source(write_source("two.af", text), cache=cache)
+    assert not one.cache_hit and not two.cache_hit
+    assert Path(two.cost_report).read_text(encoding='utf-8').startswith("Cost report: two.asm\n")
+
+    # The same name compiled into another directory shares the entry
+    again = compile_source(str(tmp_path / "two.af"), cache=cache, output_dir=str(tmp_path / "elsewhere"))
+    assert again.cache_hit
+    assert Path(again.cost_report).read_text(encoding='utf-8').startswith("Cost report: two.asm\n")
@@ -0,0 +1,122 @@
+"""
+Tests of the compile daemon and its client protocol.
+"""
+
+import os
+import socket
+import stat
+import subprocess
+import sys
+import time
+
+import pytest
+
+from compile_daemon import (SOCKET_VARIABLE, TIMEOUT_EXIT_CODE, TIMEOUT_VARIABLE, daemon_running, run_job,
+                            stop_daemon, submit_job)
+from conftest import ROOT
+
+needs_unix = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX') or not hasattr(os, 'fork'),
+                                reason="the daemon needs Unix domain sockets and fork")
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "daemon.sock")
+
+
+@pytest.fixture
+def daemon(socket_path):
+    """A daemon serving on socket_path, stopped after the test."""
+    environment = dict(os.environ, **{SOCKET_VARIABLE: socket_path})
+    process = subprocess.Popen([sys.executable, str(ROOT / "compile.py"), "--daemon"], env=environment,
+                               stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    deadline = time.monotonic() + 30
+    while not daemon_running(socket_path):
+        if process.poll() is not None or time.monotonic() > deadline:
+            process.kill()
+            pytest.fail(f"daemon did not start: {process.communicate()[0]!r}")
+        time.sleep(0.05)
+    yield process
+    if process.poll() is None:
+        stop_daemon(socket_path)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+    process.stdout.close()
+
+
+def test_jobs_capture_output_and_exit_codes(tmp_path):
+    def runner(arguments):
+        print("compiled", *arguments)
+        print("careful", file=sys.stderr)
+        return 3
+
+    reply = run_job(runner, ["a.af"], str(tmp_path), {})
+    assert reply == {'exit_code': 3, 'output': "compiled a.af\n", 'errors': "careful\n"}
+
+    def exiting(arguments):
+        sys.exit(2)
+
+    assert run_job(exiting, [], str(tmp_path), {})['exit_code'] == 2
+
+
+def test_jobs_replace_the_environment(tmp_path):
+    def runner(arguments):
+        print(sorted(os.environ.items()))
+        return 0
+
+    saved = dict(os.environ)
+    try:
+        os.environ['AUTOMATA_STALE'] = "daemon"
+        reply = run_job(runner, [], str(tmp_path), {'AUTOMATA_CACHE': "client"})
+    finally:
+        os.environ.clear()
+        os.environ.update(saved)
+    assert reply['output'] == "[('AUTOMATA_CACHE', 'client')]\n"
+
+
+@needs_unix
+def test_unanswered_jobs_time_out(socket_path, tmp_path):
+    # Accepts connections into its backlog and never replies
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(socket_path)
+        listener.listen(4)
+        exit_code, output, errors = submit_job(["a.af"], socket_path=socket_path, timeout=0.2)
+        assert (exit_code, output) == (TIMEOUT_EXIT_CODE, "")
+        assert "did not reply within 0.2 s" in errors
+        assert not daemon_running(socket_path)
+
+        environment = dict(os.environ, **{SOCKET_VARIABLE: socket_path, TIMEOUT_VARIABLE: "0.2"})
+        client = subprocess.run([sys.executable, str(ROOT / "compile_client.py"), "a.af"], cwd=str(tmp_path),
+                                env=environment, capture_output=True, text=True, timeout=30)
+    assert client.returncode == TIMEOUT_EXIT_CODE
+    assert "did not reply" in client.stderr
+    assert not (tmp_path / "a.asm").exists()
+
+
+@needs_unix
+def test_no_daemon_means_in_process_compilation(socket_path):
+    assert not daemon_running(socket_path)
+    assert submit_job(["examples/arithmetic.af"], socket_path=socket_path) is None
+
+
+@needs_unix
+def test_daemon_compiles_in_the_client_directory(daemon, socket_path, tmp_path, copy_example):
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+    copy_example("arithmetic.af")
+    exit_code, output, _ = submit_job(["arithmetic.af"], cwd=str(tmp_path), socket_path=socket_path)
+    assert exit_code == 0
+    assert "Compilation completed successfully" in output
+    assert (tmp_path / "arithmetic.asm").is_file()
+
+    exit_code, _, _ = submit_job(["missing.af"], cwd=str(tmp_path), socket_path=socket_path)
+    assert exit_code != 0
+
+
+@needs_unix
+def test_daemon_stops_on_request(daemon, socket_path):
+    assert stop_daemon(socket_path)
+    assert daemon.wait(timeout=10) == 0
+    assert not os.path.exists(socket_path)
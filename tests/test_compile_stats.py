@@ -0,0 +1,63 @@
+"""
+Tests of the per-phase compilation statistics.
+"""
+
+import json
+import tracemalloc
+
+import pytest
+
+from compiler import run
+from utils.compile_stats import CompilationStats, memory_tracing
+
+
+def test_phases_are_recorded_even_when_they_raise():
+    stats = CompilationStats()
+    with stats.phase('first'):
+        pass
+    with pytest.raises(RuntimeError):
+        with stats.phase('second'):
+            raise RuntimeError("phase failed")
+    stats.count('tokens', 12)
+
+    assert [phase.name for phase in stats.phases] == ['first', 'second']
+    assert stats.peak_bytes is None and not stats.memory_traced
+    report = stats.to_dict()
+    assert report['counters'] == {'tokens': 12}
+    assert report['total']['wall_ms'] == pytest.approx(sum(phase['wall_ms'] for phase in report['phases']), abs=0.01)
+    assert stats.format().splitlines()[-1] == "tokens: 12"
+
+
+def test_memory_tracing_measures_phase_peaks_and_restores_tracing():
+    stats = CompilationStats()
+    with memory_tracing():
+        with stats.phase('allocate'):
+            block = bytearray(1 << 20)
+        del block
+    assert not tracemalloc.is_tracing()
+    assert stats.memory_traced
+    assert stats.peak_bytes >= 1 << 20
+
+    with memory_tracing(enabled=False):
+        assert not tracemalloc.is_tracing()
+
+
+def test_compiler_records_every_phase_and_size_counter(copy_example, compile_source):
+    compiler = compile_source(copy_example("control_flow.af"), trace_memory=True)
+    stats = compiler.stats
+    assert stats.phases and all(phase.wall_seconds >= 0 for phase in stats.phases)
+    assert stats.memory_traced and stats.peak_bytes > 0
+    assert set(stats.counters) == {'preprocessed_lines', 'tokens', 'symbols', 'quadruples', 'asm_lines'}
+    assert stats.counters['tokens'] > 0 and stats.counters['asm_lines'] > 0
+
+
+def test_stats_option_prints_json_on_stdout_and_the_log_on_stderr(copy_example, tmp_path, monkeypatch, capsys):
+    # The command line writes its outputs to the working directory
+    monkeypatch.chdir(tmp_path)
+    source = copy_example("arithmetic.af")
+    assert run(['--stats', source]) == 0
+    captured = capsys.readouterr()
+    report = json.loads(captured.out)
+    assert report['source'] == source and report['success']
+    assert report['counters']['quadruples'] > 0
+    assert "Compilation completed successfully" in captured.err
@@ -0,0 +1,56 @@
+"""
+Tests of the 8086 emulator's loader and execution.
+"""
+
+import pytest
+
+from emulator.cpu8086 import EmulatorError, emulate
+from vm.bytecode_vm import BufferIO
+
+PROGRAM = """datos segment para public 'data'
+{data}
+datos ends
+
+codigo segment para public 'code'
+        assume cs:codigo, ds:datos
+p0      proc far
+        push ds
+        mov ax, 0
+        push ax
+        mov ax, datos
+        mov ds, ax
+{code}
+        ret
+p0      endp
+{procedures}
+codigo ends
+        end p0
+"""
+
+PRINT_VALUE = """        mov dl, byte ptr value
+        add dl, '0'
+        mov ah, 2
+        int 21h"""
+
+
+def program(data="        value DW 7", code=PRINT_VALUE, procedures=""):
+    return PROGRAM.format(data=data, code=code, procedures=procedures)
+
+
+def test_program_runs_and_counts_cycles():
+    result = emulate(program(), BufferIO())
+    assert result.output == "7"
+    assert result.instructions > 0 and result.cycles > 0
+
+
+@pytest.mark.parametrize("source, message", [
+    (program(data="        value DW 7\n        value DB \"hi\", \"$\""), "symbol 'value' redefined"),
+    (program(code=PRINT_VALUE + "\nvalue:\n        nop"), "symbol 'value' redefined"),
+    (program(procedures="value proc near\n        ret\nvalue endp"), "symbol 'value' redefined"),
+    (program(code=PRINT_VALUE + "\nagain:\n        nop\nagain:\n        nop"), "symbol 'again' redefined"),
+    (program(data="        value DW 7\n        datos DW 1"), "symbol 'datos' redefined"),
+    (program(data="        value DW 7\n        ax DW 5"), "'ax' is a register name"),
+])
+def test_redefinitions_are_rejected(source, message):
+    with pytest.raises(EmulatorError, match=message):
+        emulate(source, BufferIO())
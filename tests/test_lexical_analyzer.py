@@ -0,0 +1,61 @@
+"""
+Tests of the statements the lexical analyzer rejects.
+"""
+
+import contextlib
+import io
+
+import pytest
+
+from compiler import SimpleCompiler
+
+REJECTED = {
+    # A string assigned inside a branch would be assigned whether or not it runs
+    "string_in_if": ("""
+int x = 0;
+str s = "a";
+read(x);
+if(x > 1) {
+    s = "b";
+}
+print(s);
+""", "string s cannot be assigned inside if/while, on line 6"),
+    "string_in_while": ("""
+str s = "a";
+str t = "b";
+int x = 0;
+while(x < 2) {
+    s = t;
+    x = x + 1;
+}
+print(s);
+""", "string s cannot be assigned inside if/while, on line 6"),
+    # Earlier prints would show the later value
+    "string_after_print": ("""
+str s = "a";
+print(s);
+s = "b";
+""", "string s cannot be assigned after it is printed or read, on line 4"),
+    "string_after_read": ("""
+str s = "a";
+read(s);
+s = "b";
+""", "string s cannot be assigned after it is printed or read, on line 4"),
+    # The copy would take the initial value, not the input
+    "string_from_read": ("""
+str s = "a";
+str t = "b";
+read(t);
+s = t;
+""", "string s cannot be assigned from t, which is read at run time, on line 5"),
+}
+
+
+@pytest.mark.parametrize("name", sorted(REJECTED))
+def test_rejected_programs(name, write_source, tmp_path):
+    source, message = REJECTED[name]
+    compiler = SimpleCompiler(write_source(f"{name}.af", source), output_dir=str(tmp_path / "out"))
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        assert not compiler.compile()
+    assert message in output.getvalue()
@@ -0,0 +1,122 @@
+"""
+Tests of the optimization passes and the pass manager.
+
+Passes are checked on small quadruple programs, both for the shape of
+their output and, by running it on the VM, for preserving behaviour.
+"""
+
+import pytest
+
+from optimizer import (
+    OPTIMIZATION_LEVELS, PASSES, PassManager, coalesce_prints, eliminate_dead_code,
+    evaluate_program, find_loops, fold_program, optimize_loops, remove_dead_stores, usage_warnings
+)
+from vm.bytecode_vm import BufferIO, run_program
+
+SYMBOLS = [
+    ['x', 'int', 1, 'id0', 'NoRead'],
+    ['i', 'int', 0, 'id1', 'NoRead'],
+    ['unused', 'int', 0, 'id2', 'NoRead'],
+]
+
+# while(i < 3) { i = i + x * 2; print(i); }
+LOOP = [
+    ['label', '', '', 'L1'],
+    ['j>=', 'i', '3', 'L2'],
+    ['*', 'x', '2', '_t1'],
+    ['+', 'i', '_t1', '_t2'],
+    ['=', '_t2', '', 'i'],
+    ['print', 'i', '', ''],
+    ['goto', '', '', 'L1'],
+    ['label', '', '', 'L2'],
+]
+
+
+def output(quadruples, symbols=SYMBOLS, inputs=None):
+    io = BufferIO(inputs)
+    run_program(symbols, quadruples, io=io)
+    return io.getvalue()
+
+
+def test_dead_code_folds_constant_branches_and_drops_dead_temporaries():
+    quadruples = [
+        ['=', '5', '', 'x'],
+        ['j>=', '3', '2', 'L1'],
+        ['print', '"dead"', '', ''],
+        ['label', '', '', 'L1'],
+        ['+', 'x', '1', '_t1'],
+        ['print', 'x', '', ''],
+    ]
+    assert eliminate_dead_code(quadruples) == [['=', '5', '', 'x'], ['print', 'x', '', '']]
+
+
+def test_loop_optimization_rotates_and_hoists_invariants():
+    optimized = optimize_loops(LOOP)
+    loops = find_loops(optimized)
+    assert len(loops) == 1
+
+    # The invariant x * 2 is computed once, before the loop body
+    header, back_edge = loops[0]
+    assert ['*', 'x', '2', '_t1'] in optimized[:header]
+    assert optimized[back_edge][0] == 'j<'
+    assert output(optimized) == output(LOOP) == "24"
+
+
+def test_dead_stores_are_warned_about_and_removed():
+    quadruples = [['=', '3', '', 'unused'], ['print', 'x', '', '']]
+    assert remove_dead_stores(quadruples, SYMBOLS) == [['print', 'x', '', '']]
+    assert usage_warnings(SYMBOLS, quadruples) == [
+        'Warning: variable i is declared but never used',
+        'Warning: variable unused is assigned but never used',
+    ]
+
+
+def test_adjacent_constant_prints_are_coalesced():
+    # i is never assigned, so it prints its initial value; x changes and stays a runtime print
+    quadruples = [['print', '"a"', '', ''], ['print', 'i', '', ''], ['print', '"b"', '', ''],
+                  ['print', 'x', '', ''], ['=', '7', '', 'x'], ['print', 'x', '', '']]
+    coalesced = coalesce_prints(quadruples, SYMBOLS)
+    assert coalesced[0] == ['print', '"a0b"', '', '']
+    assert len(coalesced) == 4
+    assert output(coalesced) == output(quadruples) == "a0b17"
+
+
+def test_programs_without_input_are_evaluated_at_compile_time():
+    assert evaluate_program(SYMBOLS, LOOP) == "24"
+    assert fold_program(LOOP, SYMBOLS) == [['print', '"24"', '', '']]
+
+
+def test_evaluation_leaves_programs_with_input_or_no_result_alone():
+    reading = LOOP + [['read', '', '', 'x']]
+    assert fold_program(reading, SYMBOLS) is reading
+
+    # With x = 0 the loop never ends, so the step budget runs out
+    endless = [['x', 'int', 0, 'id0', 'NoRead']] + SYMBOLS[1:]
+    assert fold_program(LOOP, endless, max_steps=1000) is LOOP
+
+
+@pytest.mark.parametrize("level", sorted(OPTIMIZATION_LEVELS))
+def test_pass_manager_levels_preserve_behaviour(level):
+    manager = PassManager.for_level(level)
+    optimized = manager.run(LOOP, SYMBOLS)
+    assert manager.names == OPTIMIZATION_LEVELS[level]
+    assert [record.name for record in manager.records] == manager.names
+    assert all(record.seconds >= 0 for record in manager.records)
+    assert output(optimized) == "24"
+
+
+def test_pass_manager_records_size_changes():
+    manager = PassManager.from_names(['evaluation'])
+    manager.run(LOOP, SYMBOLS)
+    record = manager.records[0]
+    assert (record.size_before, record.size_after, record.size_delta) == (len(LOOP), 1, 1 - len(LOOP))
+    assert record.message.startswith("Partial evaluation")
+    assert 'evaluation' in manager.format()
+
+
+def test_pass_manager_rejects_unknown_passes_and_levels():
+    with pytest.raises(ValueError, match="Unknown optimization pass 'nope'"):
+        PassManager.from_names(['dead-code', 'nope'])
+    with pytest.raises(ValueError, match="Unknown optimization level 3"):
+        PassManager.for_level(3)
+    assert set(PASSES) >= set(OPTIMIZATION_LEVELS[2])
@@ -0,0 +1,85 @@
+"""
+Tests of the phase profiler and its collapsed-stack output.
+"""
+
+import os
+import pstats
+
+import pytest
+
+from compiler import run
+from utils.profiling import PhaseProfiler
+
+
+def fibonacci(n):
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+
+def parse_collapsed(lines):
+    """Split collapsed-stack lines into (frames, microseconds)."""
+    samples = []
+    for line in lines:
+        stack, micros = line.rsplit(' ', 1)
+        samples.append((stack.split(';'), int(micros)))
+    return samples
+
+
+@pytest.fixture
+def profiler():
+    profiler = PhaseProfiler()
+    with profiler.phase('parse'):
+        ' '.join(str(number) for number in range(5000)).split()
+    with profiler.phase('compute'):
+        fibonacci(15)
+    return profiler
+
+
+def test_stacks_start_with_their_phase_and_fold_recursion(profiler):
+    samples = parse_collapsed(profiler.collapsed_stacks())
+    assert {frames[0] for frames, _ in samples} == {'parse', 'compute'}
+    assert all(micros >= 1 for _, micros in samples)
+    for frames, _ in samples:
+        assert len(frames) == len(set(frames)), f"recursion was not folded: {frames}"
+    assert any(frame.startswith('fibonacci (test_profiling.py:')
+               for frames, _ in samples if frames[0] == 'compute' for frame in frames)
+
+
+def test_phase_stacks_add_up_to_the_profiled_time(profiler):
+    compute = profiler.profiles['compute']
+    compute.create_stats()
+    profiled = max(cumulative for _, _, _, cumulative, _ in compute.stats.values())
+    total = sum(micros for frames, micros in parse_collapsed(profiler.collapsed_stacks()) if frames[0] == 'compute')
+    assert total == pytest.approx(profiled * 1_000_000, rel=0.05, abs=50)
+
+
+def test_write_produces_pstats_and_collapsed_files(profiler, tmp_path):
+    pstats_path, collapsed_path = profiler.write(str(tmp_path / "reports" / "run.pstats"))
+    assert (pstats_path, collapsed_path) == (str(tmp_path / "reports" / "run.pstats"),
+                                             str(tmp_path / "reports" / "run.collapsed"))
+    assert pstats.Stats(pstats_path).total_calls > 0
+    with open(collapsed_path, encoding='utf-8') as f:
+        assert f.read().splitlines() == profiler.collapsed_stacks()
+
+    top = profiler.top_functions(3)
+    assert len(top) == 3
+    assert top[0]['cumulative_ms'] >= top[-1]['cumulative_ms']
+
+
+def test_nothing_profiled_is_an_error():
+    with pytest.raises(ValueError):
+        PhaseProfiler().stats()
+
+
+def test_profile_option_profiles_one_compilation(copy_example, tmp_path, monkeypatch, capsys):
+    # The command line writes its outputs to the working directory
+    monkeypatch.chdir(tmp_path)
+    source = copy_example("control_flow.af")
+    output = str(tmp_path / "profile")
+    assert run(['--profile', output, source]) == 0
+    assert os.path.isfile(output + ".pstats")
+    with open(output + ".collapsed", encoding='utf-8') as f:
+        phases = {line.split(';', 1)[0] for line in f.read().splitlines()}
+    assert len(phases) > 1
+
+    assert run(['--profile', output, '-j', '2', source]) == 1
+    assert "profiles the compilation of a single source file" in capsys.readouterr().out
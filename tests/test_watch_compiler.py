@@ -0,0 +1,75 @@
+"""
+Tests of watch mode.
+"""
+
+import contextlib
+import io
+import os
+
+import pytest
+
+from utils.compile_cache import CACHE_DIR_VARIABLE
+from watch_compiler import SourceWatcher, watch
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep watch mode's compilation cache inside the test's directory."""
+    monkeypatch.setenv(CACHE_DIR_VARIABLE, str(tmp_path / "cache"))
+
+
+def quiet_watch(*args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return watch(*args, **kwargs)
+
+
+def test_polls_report_new_changed_and_removed_sources(tmp_path, write_source):
+    first = write_source("first.af", "int x=1;\nprint(x);\n")
+    second = write_source("second.af", "int y=2;\nprint(y);\n")
+    watcher = SourceWatcher([str(tmp_path)], str(tmp_path / "build"))
+
+    assert watcher.poll() == ([first, second], [])
+    assert watcher.poll() == ([], [])
+
+    write_source("first.af", "int x=10;\nprint(x);\n")
+    assert watcher.poll() == ([first], [])
+
+    os.remove(second)
+    assert watcher.poll() == ([], [second])
+    assert list(watcher.output_dirs) == [first]
+
+
+def test_a_source_keeps_its_output_directory(tmp_path):
+    for directory in ("a", "b"):
+        (tmp_path / directory).mkdir()
+        (tmp_path / directory / "x.af").write_text("int x=1;\nprint(x);\n", encoding='utf-8')
+    watcher = SourceWatcher([str(tmp_path / "a"), str(tmp_path / "b")], "build")
+    watcher.poll()
+    directories = dict(watcher.output_dirs)
+    assert sorted(directories.values()) == [os.path.join("build", "x"), os.path.join("build", "x-2")]
+
+    (tmp_path / "a" / "x.af").write_text("int x=22;\nprint(x);\n", encoding='utf-8')
+    watcher.poll()
+    assert watcher.output_dirs == directories
+
+
+def test_watch_compiles_changes_and_restarts_from_the_cache(tmp_path, write_source):
+    source = write_source("prog.af", "int x=1;\nprint(x);\n")
+    build = str(tmp_path / "build")
+
+    results = quiet_watch([source], output_root=build, interval=0, polls=2)
+    assert [(result.success, result.cache_hit) for result in results] == [(True, False)]
+    assert os.path.isfile(os.path.join(build, "prog", "prog.asm"))
+
+    results = quiet_watch([source], output_root=build, interval=0, polls=1)
+    assert [(result.success, result.cache_hit) for result in results] == [(True, True)]
+
+
+def test_watch_reports_failures_and_missing_paths(tmp_path, write_source):
+    write_source("broken.af", "int x=;\n")
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        results = watch([str(tmp_path / "*.af"), str(tmp_path / "later")],
+                        output_root=str(tmp_path / "build"), interval=0, polls=1)
+    assert [result.success for result in results] == [False]
+    assert f"Nothing matches {tmp_path / 'later'} yet" in output.getvalue()